@@ -1,18 +1,17 @@
 #!/bin/python
 """Advent of Code: Day 09. All in a Single Night. Compute the cost of visiting all cities.."""
-import itertools
 import re
 
+from lib import subsets
 
-def solve(data: list[int], part: int) -> int:
+
+def solve(data: list[list[int]], part: int) -> int:
     """Return the shortest/longest route."""
-    if part == 1:
-        return min(data)
-    return max(data)
+    return subsets.best_route(data, pick=min if part == 1 else max)
 
 
-def input_parser(data: str) -> list[int]:
-    """Parse the input and generate the total cost for each route."""
+def input_parser(data: str) -> list[list[int]]:
+    """Parse the input into a matrix of distances between locations."""
     distances = {}
     line_re = re.compile(r"^(.+) to (.+) = (\d+)$")
     locations: set[str] = set()
@@ -27,13 +26,7 @@ def input_parser(data: str) -> list[int]:
         locations.add(src)
         locations.add(dst)
 
-    return [
-        sum(
-            distances[src, dst]
-            for src, dst in zip(order, order[1:])
-        )
-        for order in itertools.permutations(locations, len(locations))
-    ]
+    return [[distances.get((src, dst), 0) for dst in sorted(locations)] for src in sorted(locations)]
 
 
 SAMPLE = """\
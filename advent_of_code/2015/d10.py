@@ -1,12 +1,11 @@
 #!/bin/python
 """Advent of Code: Day 10, Day 10: Elves Look, Elves Say. Run a look-say algorithm."""
 
-import functools
-
 from lib import aoc
+from lib import memo
 
 
-@functools.cache
+@memo.memoize
 def look_say(string: str) -> str:
     """Return a look-say version of a string."""
     str_len = len(string)
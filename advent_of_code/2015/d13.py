@@ -1,19 +1,22 @@
 #!/bin/python
 """Advent of Code, Day 13: Knights of the Dinner Table.  Compute happiness of guests sitting around a table."""
 
-import itertools
 import re
 
+from lib import subsets
+
 
 def max_happiness(data: dict[tuple[str, str], int], people: set[str]) -> int:
-    """Return the max happiness which can be achieved through any seating arrangement."""
-    return max(
-        sum(
-            data.get((person, neighbor), 0) + data.get((neighbor, person), 0)
-            for person, neighbor in zip(order, order[1:] + order[:1])
-        )
-        for order in itertools.permutations(people, len(people))
-    )
+    """Return the max happiness which can be achieved through any seating arrangement.
+
+    The table is a cycle and a pair's happiness is the sum of both directions.
+    """
+    order = sorted(people)
+    weights = [
+        [data.get((person, neighbor), 0) + data.get((neighbor, person), 0) for neighbor in order]
+        for person in order
+    ]
+    return subsets.best_route(weights, closed=True, pick=max)
 
 
 def solve(data: tuple[dict[tuple[str, str], int], set[str]], part: int) -> int:
@@ -1,38 +1,19 @@
 #!/bin/python
 """Advent of Code, Day 18: Like a GIF For Your Yard. Conway's Game of Life."""
 from lib import aoc
+from lib import automaton
 
 
 def simulate(bitmap: aoc.Map, cycles: int, corners: bool) -> int:
     """Run Conway's Game of Life and return number of lights on at end."""
-    # The number of neighbors which will turn a light on.
-    want = {True: (2, 3), False: (3,)}
-    # Track just the lights which are on.
-    on = bitmap.coords["#"]
-    corner_points = bitmap.corners
-
-    for _ in range(cycles):
-        if corners:
-            on.update(corner_points)
-        # Consider cells which are on or adjacent to an on.
-        candidates = {
-            (x + dx, y + dy)
-            for x, y in on
-            for dx, dy in aoc.ALL_NEIGHBORS_T
-            if (x + dx, y + dy) in bitmap.all_coords
-        } | on
-
-        new = set()
-        for point in candidates:
-            x, y = point
-            count = sum((x + dx, y + dy) in on for dx, dy in aoc.ALL_NEIGHBORS_T)
-            if count in want[point in on]:
-                new.add(point)
-        on = new
-
-    if corners:
-        on.update(corner_points)
-    return len(on)
+    space = automaton.Space((bitmap.width, bitmap.height))
+    life = automaton.Automaton(space, automaton.moore(2), born={3}, survive={2, 3})
+    on = space.pack(bitmap.coords.get("#", set()))
+    if not corners:
+        return life.run(on, cycles).bit_count()
+    # Corner lights are stuck on.
+    corner_points = space.pack(bitmap.corners)
+    return life.run(on | corner_points, cycles, on_step=lambda board: board | corner_points).bit_count()
 
 
 def solve(data: aoc.Map, part: int, testing: bool) -> int:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from lib import aoc
+from lib import vm
 
 SAMPLE = """\
 inc b
@@ -19,31 +20,48 @@ def line_parser(line: str):
 PARSER = aoc.ParseOneWordPerLine(line_parser)
 
 
+def hlf(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] //= 2
+
+
+def tpl(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] *= 3
+
+
+def inc(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] += 1
+
+
+def jmp(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int:
+    return ptr + a
+
+
+def jie(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    return ptr + b if r[a] % 2 == 0 else None
+
+
+def jio(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    return ptr + b if r[a] == 1 else None
+
+
+CPU = vm.Dialect(
+    "ab",
+    {
+        "hlf": vm.Op("w", hlf),
+        "tpl": vm.Op("w", tpl),
+        "inc": vm.Op("w", inc),
+        "jmp": vm.Op("n", jmp),
+        "jie": vm.Op("rn", jie),
+        "jio": vm.Op("rn", jio),
+    },
+)
+
+
 def solve(data: list[list[int | str]], part: int) -> int:
     """Emulate a program and return register "b"."""
-    ptr = 0
-    max_inst = len(data) - 1
-    registers = {"a": 0 if part == 1 else 1, "b": 0}
-
-    while 0 <= ptr <= max_inst:
-        jump_offset = 1
-        match data[ptr]:
-            case ["hlf", reg]:
-                registers[str(reg)] //= 2
-            case ["tpl", reg]:
-                registers[str(reg)] *= 3
-            case ["inc", reg]:
-                registers[str(reg)] += 1
-            case ["jmp", offset]:
-                jump_offset = int(offset)
-            case ["jie", reg, offset]:
-                if registers[str(reg)] % 2 == 0:
-                    jump_offset = int(offset)
-            case ["jio", reg, offset]:
-                if registers[str(reg)] == 1:
-                    jump_offset = int(offset)
-        ptr += jump_offset
-    return registers["b"]
+    machine = vm.Machine(CPU.decode(data), {"a": 0 if part == 1 else 1})
+    machine.run()
+    return machine["b"]
 
 
 TESTS = [(1, SAMPLE, 2)]
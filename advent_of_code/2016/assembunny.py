@@ -1,5 +1,6 @@
 """Assembunny Computer Simulator."""
 
+import collections.abc
 import enum
 from lib import aoc
 
@@ -25,27 +26,136 @@ OP_CPY = Operation.CPY.value
 # For one argument instruction, INC becomes DEC and all else becomes INC.
 TOGGLE = {1: (OP_INC, {OP_INC: OP_DEC}), 2: (OP_JNZ, {OP_JNZ: OP_CPY})}
 
+Instruction = list[str | int]
+Registers = dict[str, int]
+# A macro-op updates the registers and returns the next ptr, or None if it does not apply.
+MacroOp = collections.abc.Callable[[Registers], int | None]
+
+
+def is_register(arg: str | int) -> bool:
+    return isinstance(arg, str)
+
+
+def match_add(instructions: list[Instruction], ptr: int) -> tuple[str, str, int] | None:
+    """Match an addition/subtraction loop, returning (target, counter, sign).
+
+    0: ["inc", "a"]  (or "dec a" to subtract)
+    1: ["dec", "b"]
+    2: ["jnz", "b", -2]
+
+    Lines 0 and 1 may be swapped.
+    """
+    if ptr + 3 > len(instructions):
+        return None
+    first, second, jump = instructions[ptr:ptr + 3]
+    if len(first) != 2 or len(second) != 2 or jump[0] != OP_JNZ or jump[2] != -2:
+        return None
+    counter = jump[1]
+    if second == [OP_DEC, counter]:
+        other = first
+    elif first == [OP_DEC, counter]:
+        other = second
+    else:
+        return None
+    target = other[1]
+    if other[0] not in (OP_INC, OP_DEC) or not is_register(counter) or not is_register(target) or target == counter:
+        return None
+    return str(target), str(counter), 1 if other[0] == OP_INC else -1
+
+
+def optimize(instructions: list[Instruction]) -> dict[int, MacroOp]:
+    """Detect clear, add and multiply loops and return macro-ops which replace them, keyed by ptr.
+
+    Macro-ops only apply when the loop counter is positive, matching the loop
+    semantics; otherwise the instructions run as usual. Jumps into the middle of
+    a loop also run the instructions as usual.
+    """
+    macros: dict[int, MacroOp] = {}
+
+    for ptr, instruction in enumerate(instructions):
+        # Clear loop. y = 0.
+        # 0: ["dec", "y"]
+        # 1: ["jnz", "y", -1]
+        if (
+            instruction[0] == OP_DEC and ptr + 1 < len(instructions)
+            and instructions[ptr + 1] == [OP_JNZ, instruction[1], -1] and is_register(instruction[1])
+        ):
+            def clear(register: Registers, y: str = str(instruction[1]), nxt: int = ptr + 2) -> int | None:
+                if register[y] <= 0:
+                    return None
+                register[y] = 0
+                return nxt
+            macros[ptr] = clear
+            continue
+
+        # Multiply loop. x += src * d
+        # 0: ["cpy", src, "c"]    for (; d > 0; d--) {
+        # 1: ["inc", "x"]           for (c = src; c > 0; c--) {
+        # 2: ["dec", "c"]             x++
+        # 3: ["jnz", "c", -2]       }
+        # 4: ["dec", "d"]
+        # 5: ["jnz", "d", -5]     }
+        if instruction[0] == OP_CPY and is_register(instruction[2]) and ptr + 6 <= len(instructions):
+            src, c = instruction[1], str(instruction[2])
+            add = match_add(instructions, ptr + 1)
+            d = instructions[ptr + 4][1]
+            if (
+                add is not None and add[1] == c and is_register(d)
+                and instructions[ptr + 4] == [OP_DEC, d] and instructions[ptr + 5] == [OP_JNZ, d, -5]
+                and len({add[0], c, d, src}) == 4
+            ):
+                def multiply(
+                    register: Registers, src: str | int = src, x: str = add[0], c: str = c, d: str = str(d),
+                    sign: int = add[2], nxt: int = ptr + 6,
+                ) -> int | None:
+                    value = src if isinstance(src, int) else register[src]
+                    if value <= 0 or register[d] <= 0:
+                        return None
+                    register[x] += sign * value * register[d]
+                    register[c] = register[d] = 0
+                    return nxt
+                macros[ptr] = multiply
+                continue
+
+        # Addition loop. x += y
+        if (add := match_add(instructions, ptr)) is not None:
+            def addition(register: Registers, x: str = add[0], y: str = add[1], sign: int = add[2], nxt: int = ptr + 3) -> int | None:
+                if register[y] <= 0:
+                    return None
+                register[x] += sign * register[y]
+                register[y] = 0
+                return nxt
+            macros[ptr] = addition
+
+    return macros
+
 
 class Assembunny:
     """Assembunny computer emulator."""
 
     def __init__(self, instructions: list[list[str | int]]):
         """Initialize, parse the instructions."""
-        inst = list[list[str | int]]()
+        inst = list[Instruction]()
         for op, *rest in instructions:
-            inst.append([Operation[str(op).upper()].value, *rest])
+            args = [int(i) if isinstance(i, str) and aoc.RE_INT.fullmatch(i) else i for i in rest]
+            inst.append([Operation[str(op).upper()].value, *args])
         self.instructions = inst
         self.instruction_count = len(instructions)
+        # Number of steps taken by the last run; a macro-op counts as one step.
+        self.steps = 0
 
-    def run(self, register_a: int = 0, register_c: int = 0) -> tuple[int, bool]:
+    def run(self, register_a: int = 0, register_c: int = 0, optimized: bool = True) -> tuple[int, bool]:
         """Run the program, returning register "a" and if a Clock Signal is output."""
-        instructions = self.instructions.copy()
+        # Toggles modify instructions; copy them so runs are independent.
+        instructions = [instruction.copy() for instruction in self.instructions]
+        macros = optimize(instructions) if optimized else {}
         end = self.instruction_count
         register = {i: 0 for i in "bd"}
         register["a"] = register_a
         register["c"] = register_c
 
         ptr = 0
+        steps = 0
         prior_states: set[tuple[int, int, int, int, int]] = set()
 
         def state():
@@ -59,60 +169,6 @@ class Assembunny:
                 instruction_state = instruction_state * 8 + instruction[0]
             return (instruction_state,) + tuple(register.values())
 
-        def multiply():
-            """Handle a multiplication loop efficiently.
-
-            # a += b * d ==>
-                                  for(; d > 0; d--) {
-            4: ["cpy", "b", "c"]    for (c = b; c--; c > 0) {  # a += b
-            5: ["inc", "a"]           a++
-            6: ["dec", "c"]       
-            7: ["jnz", "c", "-2"]   }
-            8: ["dec", "d"]
-            9: ["jnz", "d", "-5"] }
-            """
-            nonlocal ptr
-            var_b, var_c = instructions[ptr][1:]
-            var_a = instructions[ptr + 1][1]
-            var_d = instructions[ptr + 4][1]
-            want = [
-                [OP_CPY, var_b, var_c],
-                [OP_INC, var_a],
-                [OP_DEC, var_c],
-                [OP_JNZ, var_c, "-2"],
-                [OP_DEC, var_d],
-                [OP_JNZ, var_d, "-5"],
-            ]
-            if instructions[ptr:ptr + 6] != want:
-                return False
-            register[var_a] += register[var_c] * register[var_d]
-            register[var_c] = register[var_d] = 0
-            ptr += 5
-            return True
-
-        def decrement_or_addition():
-            """Handle an addition loop efficiently.
-
-            5: ["dec", "b"]
-            6: ["inc", "a"]
-            7: ["jnz", "b", "-2"]
-
-            Note, lines 5, 6 could be swapped and are not handled.
-            """
-            nonlocal ptr
-            var_b, var_a = instructions[ptr][1], instructions[ptr + 1][1]
-            want = [
-                [OP_DEC, var_b],
-                [OP_INC, var_a],
-                [OP_JNZ, var_b, "-2"],
-            ]
-            if instructions[ptr:ptr + 3] != want:
-                register[var_b] -= 1
-                return
-            register[var_a] += register[var_b]
-            register[var_b] = 0
-            ptr += 2
-
         def value(arg: int | str) -> int:
             return arg if isinstance(arg, int) else register[arg]
 
@@ -120,16 +176,21 @@ class Assembunny:
         last_out = None
 
         while ptr < end:
+            steps += 1
+            if ptr in macros and (nxt := macros[ptr](register)) is not None:
+                ptr = nxt
+                continue
+
             args: list[str | int]
             operation, *args = instructions[ptr]
 
             if operation == OP_CPY:
-                register[str(args[1])] = value(args[0])
-                multiply()
+                if is_register(args[1]):
+                    register[str(args[1])] = value(args[0])
             elif operation == OP_INC:
                 register[str(args[0])] += 1
             elif operation == OP_DEC:
-                decrement_or_addition()
+                register[str(args[0])] -= 1
             elif operation == OP_JNZ:
                 if value(args[0]) != 0:
                     ptr += value(args[1]) - 1
@@ -139,6 +200,7 @@ class Assembunny:
                     last_out = out
                 elif 1 - out != last_out:
                     # If we generate the wrong signal, abort.
+                    self.steps = steps
                     return register["a"], False
                 else:
                     # Track the output signal.
@@ -146,6 +208,7 @@ class Assembunny:
                     # Check for a cycle.
                     new_state = state()
                     if new_state in prior_states:
+                        self.steps = steps
                         return register["a"], True
                     prior_states.add(new_state)
             elif operation == OP_TGL:
@@ -154,8 +217,12 @@ class Assembunny:
                     old = instructions[loc]
                     default, alts = TOGGLE[len(old) - 1]
                     old[0] = alts.get(int(old[0]), default)
+                    # The code changed. Drop stale macro-ops and find any new loops.
+                    if optimized:
+                        macros = optimize(instructions)
             # case _:
             #     raise RuntimeError(f"Could not parse {instructions[ptr]}")
             ptr += 1
 
+        self.steps = steps
         return register["a"], False
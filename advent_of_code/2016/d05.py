@@ -1,55 +1,13 @@
 #!/bin/python
 """Advent of Code, Day 5: How About a Nice Game of Chess?."""
 
-import functools
-import hashlib
-import itertools
-from collections import abc
-
-from lib import aoc
+from lib import hashmining
 TIMEOUT = 60
 
 
-def hash_gen(name: str) -> abc.Generator[str, None, None]:
-    """Generate MD5 digests which start with 00000."""
-    base = hashlib.md5(name.encode())
-    for i in itertools.count():
-        md5 = base.copy()
-        md5.update(str(i).encode())
-        digest = md5.hexdigest()
-        if digest.startswith("00000"):
-            yield digest
-
-
-@functools.cache
-def digest_gen(name: str) -> aoc.CachedIterable:
-    """Return a CachedIterable which generates digests."""
-    iterable = aoc.CachedIterable(hash_gen(name))
-    # Hard code the solution for faster reruns.
-    if name != "abc":
-        iterable.populate_cache([
-            '000008bfb72caf77542c32b53a73439b', '0000004ed0ede071d293b5f33de2dc2f',
-            '0000012be6057b2554c26bfddab18b08', '00000bf3f1ca8d1f229aa50b3093b2be',
-            '00000512874cc40b764728993dd71ffb', '0000069710beec5f9a1943a610be52d8',
-            '00000a8da36ee9b7e193f956cf701911', '00000776b6ff41a7e30ed2d4b6663351',
-            '00000d0bb64d9f96d906a8e467aae60d', '00000fc7f109eb2e3b65ade47516f79a',
-            '0000011160a3786384e87b02839f671b', '00000c43640e7e07ee047da006ba4869',
-            '0000024cc74f8456ee0a717f3d9446c3', '0000040cbee050fc9d43ebef7823c70e',
-            '00000b6fc88769b0782a8a4e29bb0b83', '00000a2ea6095803c1429952700abc6a',
-            '00000715846a8a6aba37bb0cec5b41d3', '0000092229b1fc192ff4ec09b29afeba',
-            '000007c68bce3bc2aaedafc2e3a40017', '000006c6ad012b376ddb4b3361c2d57f',
-            '000001411c9f652411fd21490d301364', '000009eaee1762f2503f74b7aa628c39',
-            '000005e993db7bc8037d6e7ba4cda51f', '00000f55327c9376384beb50ae890078',
-            '00000a34d1619057ed557b61bcfa307b', '0000087a3b445f95ed8c12d5dd526117',
-            '00000ee736759298ddb0838afbc0a63f', '0000015961e921bae37b8171b4e75d53',
-            '00000a70351866dd6d28968b83937e54', '000003af31f09c411f2d74a7c8f41831',
-        ])
-    return iterable
-
-
-def solve(data: str, part: int) -> str:
+def solve(data: str, part: int, testing: bool) -> str:
     """Return a door code using first 8/position-aware digests."""
-    gen = iter(digest_gen(data))
+    gen = (digest for _, digest in hashmining.mine(data, hashmining.HexPrefix(5), testing=testing))
     if part == 1:
         return "".join(next(gen)[5] for _ in range(8))
     out: dict[int, str] = {}
@@ -3,12 +3,13 @@
 
 Solve moving devices around the warehouse."""
 
-import functools
 import itertools
 import queue
 import re
 from collections.abc import Generator, Iterable
 
+from lib import memo
+
 SAMPLE = """\
 The first floor contains a hydrogen-compatible microchip and a lithium-compatible microchip.
 The second floor contains a hydrogen generator.
@@ -18,7 +19,7 @@ LineType = int
 Device = tuple[int, bool]
 
 
-@functools.cache
+@memo.memoize
 def valid_floor(floor: Iterable[Device]) -> bool:
     """Return if all chips on the floor have a generator."""
     generators = {material for material, device in floor if device}
@@ -27,7 +28,7 @@ def valid_floor(floor: Iterable[Device]) -> bool:
     return not (unpowered_chips and generators)
 
 
-@functools.cache
+@memo.memoize
 def valid(state: tuple[Iterable[Device], ...]) -> bool:
     """Return if all floors are valid."""
     return all(valid_floor(floor) for floor in state)
@@ -1,59 +1,54 @@
 #!/bin/python
 """Advent of Code, Day 14: One-Time Pad."""
 
-import collections
-import hashlib
 import itertools
 import re
 from collections import abc
 
-
-def hash_gen(name: str, stretch: bool) -> abc.Generator[tuple[int, str, str], None, None]:
-    """Generate MD5 digests which start with triplets.
-
-    >>> r = 'RE.match(s)'
-    >>> z = 'any(a == b == c for a, b, c in zip(s, s[1:], s[2:]))'
-    >>> timeit.timeit(
-            r,
-            setup='
-                s = "asdfd3fewafewewerrrsddasfdas";
-                import re; RE = re.compile(r"(?P<a>)(?P=a)(?P=a)")'
-        )
-    0.3939150311052799
-    >>> timeit.timeit(z, setup='s = "asdfd3fewafewewerrrsddasfdas"')
-    5.473389117047191
-    """
-    triplets = re.compile(r"(?P<a>.)(?P=a)(?P=a)")
-    base = hashlib.md5(name.encode())
-    for i in itertools.count():
-        md5 = base.copy()
-        md5.update(str(i).encode())
-        digest = md5.hexdigest()
-        if stretch:
-            for _ in range(2016):
-                digest = hashlib.md5(digest.encode()).hexdigest()
-        if found := triplets.search(digest):
-            yield i, found.group(1), digest
-
-
-def solve(data: str, part: int) -> int:
+from lib import aoc
+from lib import hashmining
+
+# Regex beats comparing chars in Python.
+# >>> r = 'RE.match(s)'
+# >>> z = 'any(a == b == c for a, b, c in zip(s, s[1:], s[2:]))'
+# >>> timeit.timeit(
+#         r,
+#         setup='
+#             s = "asdfd3fewafewewerrrsddasfdas";
+#             import re; RE = re.compile(r"(?P<a>)(?P=a)(?P=a)")'
+#     )
+# 0.3939150311052799
+# >>> timeit.timeit(z, setup='s = "asdfd3fewafewewerrrsddasfdas"')
+# 5.473389117047191
+TRIPLETS = re.compile(r"(?P<a>.)(?P=a)(?P=a)")
+
+
+def hash_gen(name: str, stretch: bool, testing: bool) -> abc.Generator[tuple[int, str, str], None, None]:
+    """Generate MD5 digests which contain triplets, along with the triplet char."""
+    hits = hashmining.mine(name, hashmining.HasRun(3), rounds=2016 if stretch else 0, testing=testing)
+    for i, digest in hits:
+        found = TRIPLETS.search(digest)
+        assert found
+        yield i, found.group(1), digest
+
+
+def solve(data: str, part: int, testing: bool) -> int:
     """Return the 64th key."""
-    gen = hash_gen(data, part == 2)
-    queue = collections.deque((next(gen) for _ in range(1001)), maxlen=1001)
+    # A hit only looks ahead 1000 indexes, which holds at most 1000 more hits.
+    hits = aoc.WindowedIterable(hash_gen(data, part == 2, testing), 1001)
 
     found = 0
-    idx = 0
-    while found < 64:
-        idx, char, _ = queue.popleft()
-        queue.append(next(gen))
+    for position in itertools.count():
+        idx, char, _ = hits[position]
         quints = char * 5
         if any(
             quints in digest
-            for _, _, digest in itertools.takewhile(lambda x: x[0] <= idx + 1000, queue)
+            for _, _, digest in itertools.takewhile(lambda x: x[0] <= idx + 1000, hits.items(position + 1))
         ):
             found += 1
-
-    return idx
+            if found == 64:
+                return idx
+    raise RuntimeError("No solution found.")
 
 
 TESTS = [(1, "abc", 22728), (2, "abc", 22551)]
@@ -4,10 +4,10 @@
 Return the shortest path through a maze which hits certain points.
 """
 import collections
-import itertools
 import string
 
 from lib import aoc
+from lib import subsets
 
 
 def solve(data: tuple[set[complex], dict[complex, int]], part: int) -> int:
@@ -41,21 +41,9 @@ def solve(data: tuple[set[complex], dict[complex, int]], part: int) -> int:
                 todo.append((next_steps, next_pos))
                 seen.add(next_pos)
 
-    # Optionally append the start position to the end of the route.
-    extra = (0,) if part == 2 else tuple()
-
-    other_wires = set(wires.values()) - {0}
-    # Find the shortest distrance that walks a specific wire path...
-    shortest = min(
-        sum(
-            distances[a][b]
-            for a, b in zip((0,) + path, path + extra)
-        )
-        # ... for all possible paths.
-        for path in itertools.permutations(other_wires, len(other_wires))
-    )
-
-    return shortest
+    # Find the shortest route through all the wires, starting at 0 and, for part 2, ending there.
+    weights = [[distances[a][b] for b in range(len(wires))] for a in range(len(wires))]
+    return subsets.best_route(weights, start=0, closed=part == 2)
 
 
 def input_parser(puzzle_input: str) -> tuple[set[complex], dict[complex, int]]:
@@ -4,6 +4,8 @@
 import collections
 import string
 
+from lib import cycles
+
 SPIN = 0
 EXCHANGE = 1
 PARTNER = 2
@@ -15,9 +17,9 @@ def solve(data: list[tuple[int, str | int, str | int]], part: int, testing: bool
     size = 5 if testing else 16
     dances = 1 if part == 1 else 1_000_000_000
     cmds = data
-    dance_line = collections.deque(string.ascii_lowercase[:size])
 
-    def dance():
+    def dance(lineup: tuple[str, ...]) -> tuple[str, ...]:
+        dance_line = collections.deque(lineup)
         for op, first, second in cmds:
             if op == SPIN:
                 dance_line.rotate(first)
@@ -26,23 +28,9 @@ def solve(data: list[tuple[int, str | int, str | int]], part: int, testing: bool
             else:
                 a, b = dance_line.index(first), dance_line.index(second)
                 dance_line[a], dance_line[b] = dance_line[b], dance_line[a]
+        return tuple(dance_line)
 
-    seen: dict[tuple[str, ...], int] = {}
-    for count in range(dances):
-        dance()
-        t = tuple(dance_line)
-        if t in seen:
-            remaining = (dances - 1 - count) % (count - seen[t])
-            want = seen[t] + remaining
-            dance_line = next(
-                collections.deque(line)
-                for line, seen_count in seen.items()
-                if seen_count == want
-            )
-            break
-        seen[t] = count
-
-    return "".join(dance_line)
+    return "".join(cycles.skip_ahead(tuple(string.ascii_lowercase[:size]), dance, dances))
 
 
 def input_parser(data: str) -> list[tuple[int, str | int, str | int]]:
@@ -1,85 +1,80 @@
 #!/bin/python
 """Advent of Code, Day 18: Duet.  Simulate parallel programs with bidirectional communication."""
 
-import collections
-import collections.abc
-import itertools
+import string
 
 from lib import aoc
+from lib import vm
 
 
-def program(
-    code: list[list[str | int]],
-    program_id: int,
-    part: int,
-) -> collections.abc.Generator[list[int], list[int], int]:
-    """Run a program with IO queues.
+def set_(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] = r[b]
 
-    Part 1 returns the last snd value on rcv non-zero.
-    Part 2 yields on a rcv and returns the total send count.
-    """
-    registers = collections.defaultdict(int)
-    registers["p"] = program_id
-    ptr = 0
-    sent = 0
-    outputs: list[int] = []
-    inputs = yield outputs
-    q_in = collections.deque(inputs)
 
-    def val(register: int | str) -> int:
-        """Return a value, either an immediate value or register lookup."""
-        if isinstance(register, int):
-            return register
-        return registers[register]
+def add(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] += r[b]
 
-    while True:
-        instructions = code[ptr]
-        ptr += 1
-        match instructions:
-            case ["set", str() as arg_x, arg_y]:
-                registers[arg_x] = val(arg_y)
-            case ["add", str() as arg_x, arg_y]:
-                registers[arg_x] += val(arg_y)
-            case ["mul", str() as arg_x, arg_y]:
-                registers[arg_x] *= val(arg_y)
-            case ["mod", str() as arg_x, arg_y]:
-                registers[arg_x] %= val(arg_y)
-            case ["jgz", arg_x, arg_y] if val(arg_x) > 0:
-                ptr += val(arg_y) - 1
-            case ["snd", arg_x]:
-                outputs.append(val(arg_x))
-                sent += 1
-            case ["rcv", arg_x] if part == 1 and val(arg_x):
-                # Part one. On the first non-zero rcv, return the last send value.
-                return outputs.pop()
-            case ["rcv", str() as arg_x] if part == 2:
-                # Yield if we are out of values.
-                # If we have recv values, read one.
-                # If we yielded and still do not have values, return the sent count.
-                if not q_in:
-                    inputs = yield outputs
-                    outputs = []
-                    q_in.extend(inputs)
-                    if not inputs:
-                        return sent
-                registers[arg_x] = q_in.popleft()
+
+def mul(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] *= r[b]
+
+
+def mod(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] %= r[b]
+
+
+def jgz(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    return ptr + r[b] if r[a] > 0 else None
+
+
+def snd(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    m.outputs.append(r[a])
+
+
+def recover(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    """Part one. On the first non-zero rcv, halt. The last send value is recovered."""
+    return vm.HALT if r[a] else None
+
+
+def receive(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    """Part two. Read a value, blocking until one is available."""
+    if not m.inputs:
+        raise vm.Blocked
+    r[a] = m.inputs.popleft()
+
+
+OPS = {
+    "set": vm.Op("wv", set_),
+    "add": vm.Op("wv", add),
+    "mul": vm.Op("wv", mul),
+    "mod": vm.Op("wv", mod),
+    "jgz": vm.Op("vv", jgz),
+    "snd": vm.Op("v", snd),
+}
+SOUND = vm.Dialect(string.ascii_lowercase, OPS | {"rcv": vm.Op("v", recover)})
+DUET = vm.Dialect(string.ascii_lowercase, OPS | {"rcv": vm.Op("w", receive)})
 
 
 def solve(data: list[list[str | int]], part: int) -> int:
     """Run two programs and get IO details."""
-    # Create two programs.
-    programs = {i: program(data, i, part) for i in range(2)}
-    # Initialize then run the programs.
-    next(programs[0])
-    vals = next(programs[1])
-    for i in itertools.cycle(programs):
-        try:
-            vals = programs[i].send(vals)
-        except StopIteration as e:
-            # On a StopIteration, handle the return value.
-            if part == 1 or i == 1:
-                return e.value
-    raise RuntimeError
+    if part == 1:
+        machine = vm.Machine(SOUND.decode(data))
+        machine.run()
+        return machine.outputs[-1]
+
+    # Run the programs in turn, passing the sent values along, until both are blocked.
+    program = DUET.decode(data)
+    machines = [vm.Machine(program, {"p": i}) for i in range(2)]
+    sent = 0
+    while True:
+        for i, machine in enumerate(machines):
+            machine.run()
+            machines[1 - i].inputs.extend(machine.outputs)
+            if i == 1:
+                sent += len(machine.outputs)
+            machine.outputs.clear()
+        if not any(machine.inputs for machine in machines):
+            return sent
 
 
 INPUT_PARSER = aoc.parse_multi_mixed_per_line
@@ -2,48 +2,60 @@
 """Advent of Code, Day 23: Coprocessor Conflagration."""
 
 import math
+import string
+
 from lib import aoc
+from lib import vm
+
 PARSER = aoc.parse_multi_mixed_per_line
 
 
+def set_(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] = r[b]
+
+
+def sub(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] -= r[b]
+
+
+def mul(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[a] *= r[b]
+
+
+def jnz(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    return ptr + r[b] if r[a] != 0 else None
+
+
+CPU = vm.Dialect(
+    string.ascii_lowercase[:8],
+    {
+        "set": vm.Op("wv", set_),
+        "sub": vm.Op("wv", sub),
+        "mul": vm.Op("wv", mul),
+        "jnz": vm.Op("vv", jnz),
+    },
+)
+
+
 def solve(data: list[list[str | int]], part: int) -> int:
     """Simulate a program and count multiplications."""
+    program = CPU.decode(data)
     if part == 2:
-        # Return the number of non-primes in a range. Derived by analysis."""
+        # Return the number of non-primes in a range. Derived by analysis.
+        # The program sets up the range in b and c then counts composites, stepping by the second last instruction.
+        # Run the setup to read the range bounds.
+        machine = vm.Machine(program, {"a": 1})
+        machine.run(breakpoints={data.index(["set", "f", 1])})
+        step = -int(data[-2][2])
         return sum(
             1
-            for b in range(105700, 122700 + 1, 17)
+            for b in range(machine["b"], machine["c"] + 1, step)
             if any(b % i == 0 for i in range(2, math.ceil(math.sqrt(b))))
         )
 
-    code = data
-    ptr = 0
-    mul_count = 0
-    registers = {i: 0 for i in "abcdefgh"}
-
-    def val(register: int | str) -> int:
-        """Return a value, either an immediate value or register lookup."""
-        if isinstance(register, int):
-            return register
-        return registers[register]
-
-    while True:
-        try:
-            instructions = code[ptr]
-        except IndexError:
-            return mul_count
-        ptr += 1
-        match instructions:
-            case ["set", str() as arg_x, arg_y]:
-                registers[arg_x] = val(arg_y)
-            case ["sub", str() as arg_x, arg_y]:
-                registers[arg_x] -= val(arg_y)
-            case ["mul", str() as arg_x, arg_y]:
-                mul_count += 1
-                registers[arg_x] *= val(arg_y)
-            case ["jnz", arg_x, arg_y] if val(arg_x) != 0:
-                ptr += val(arg_y) - 1
-    raise RuntimeError("No solution found.")
+    machine = vm.Machine(program, profile=True)
+    machine.run()
+    return machine.op_counts()["mul"]
 
 
 TESTS = list[tuple[int, int, int]]()
@@ -2,7 +2,10 @@
 """Advent of Code, Day 6: Chronal Coordinates."""
 from __future__ import annotations
 
+import bisect
+
 from lib import aoc
+from lib import areas
 
 
 def minmax(data: list[list[int]]) -> tuple[int, int, int, int]:
@@ -36,11 +39,11 @@ def solve(data: list[list[int]], part: int, testing: bool) -> int:
 
     """Return the number of safe locations."""
     distance = 32 if testing else 10000
-    return sum(
-        sum(abs(x - px) + abs(y - py) for px, py in data) < distance
-        for x in range(min_x, max_x + 1)
-        for y in range(min_y, max_y + 1)
-    )
+    # Manhattan distances split by axis: the total distance of (x, y) is the x sum plus the y sum.
+    # Sort the y sums then count, for each x, the rows which keep the total under the limit.
+    x_sums = areas.distance_sums((x for x, _ in data), min_x, max_x)
+    y_sums = sorted(areas.distance_sums((y for _, y in data), min_y, max_y))
+    return sum(bisect.bisect_left(y_sums, distance - x_sum) for x_sum in x_sums)
 
 
 SAMPLE = """\
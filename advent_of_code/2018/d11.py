@@ -1,6 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 11: Chronal Charge. Find the subgrid with the max sum value."""
 
+from lib import areas
+
 
 def solve(data: int, part: int) -> str:
     serial = data
@@ -10,49 +12,24 @@ def solve(data: int, part: int) -> str:
         power = rack_id * (rack_id * y + serial)
         return ((power // 100) % 10) - 5
 
-    grid = []
-    for y in range(300):
-        row = []
-        for x in range(300):
-            row.append(power_level(x + 1, y + 1))
-        grid.append(row)
+    grid = areas.SummedArea([[power_level(x + 1, y + 1) for x in range(300)] for y in range(300)])
 
     def max_grid(size: int) -> tuple[int, int, int]:
-        xgroups = []
-        for row in grid:
-            xrow = []
-            window = sum(row[:size])
-            for x in range(300 - size):
-                window += row[x + size]
-                xrow.append(window)
-                window -= row[x]
-            xgroups.append(xrow)
-
-        ygroups = []
-        for col in zip(*xgroups):
-            ycol = []
-            window = sum(col[:size])
-            for y in range(300 - size):
-                window += col[y + size]
-                ycol.append(window)
-                window -= col[y]
-            ygroups.append(ycol)
-
-        groups = list(zip(*ygroups))
-        return max(
-            (val, x, y)
-            for y, row in enumerate(groups)
-            for x, val in enumerate(row)
-        )
+        # Start below the lowest possible sum, where every cell is -5.
+        best = (-5 * size * size - 1, 0, 0)
+        for y, row in enumerate(grid.windows(size, size)):
+            if (val := max(row)) > best[0]:
+                best = (val, row.index(val), y)
+        return best
 
     (val, x, y), size = max(
         (max_grid(size), size)
-        for size in range(2, 3 if part == 1 else 100)
+        for size in range(3, 4 if part == 1 else 101)
     )
 
     out = [x + 1, y + 1]
     if part == 2:
-        out.append(size + 1)
+        out.append(size)
     return ",".join(str(i) for i in out)
 
 
@@ -2,6 +2,7 @@
 """Advent of Code, Day 12: Subterranean Sustainability. Compute what plants will be alive in future generations."""
 
 from lib import aoc
+from lib import cycles
 
 SAMPLE = [
     """\
@@ -34,34 +35,21 @@ def solve(data: tuple[list[list[bool]], list[list[bool]]], part: int) -> int:
     """Simulate N generations of plant growth."""
     # How many generations to simulate.
     target_gen = 20 if part == 1 else 50000000000
-    state = {i for i, j in enumerate(data[0][0]) if j}
+    state = frozenset(i for i, j in enumerate(data[0][0]) if j)
     # Rules for new generations.
     rules = {tuple(rule[:5]) for rule in data[1] if rule[5]}
-    # Cycle detection.
-    seen: dict[frozenset[int], tuple[int, int]] = {}
 
-    for gen in range(target_gen):
-        new_state = set()
-        for pot in range(min(state) - 2, max(state) + 3):
-            window = tuple(i in state for i in range(pot - 2, pot + 3))
-            if window in rules:
-                new_state.add(pot)
+    def generation(state: frozenset[int]) -> frozenset[int]:
+        """Return the pots with plants in the next generation."""
+        return frozenset(
+            pot
+            for pot in range(min(state) - 2, max(state) + 3)
+            if tuple(i in state for i in range(pot - 2, pot + 3)) in rules
+        )
 
-        state = new_state
-        # For cycle detection, shift pots so the pattern is relative to "0".
+    def pattern(state: frozenset[int]) -> frozenset[int]:
+        """Return the pots relative to the first one. The pattern drifts along the row once it settles."""
         offset = min(state)
-        shift_state = frozenset(pot - offset for pot in state)
-        # Cycle detected.
-        if shift_state in seen:
-            prior_gen, prior_offset = seen[shift_state]
-            gen_delta, offset_delta = (gen - prior_gen, offset - prior_offset)
-            assert gen_delta == 1  # Less math if the cycle is 1 gen each.
-            steps = target_gen - gen - 1
-            total_shift = steps * offset_delta
-            state = {pot + total_shift for pot in state}
-            break
-        else:
-            # Record generation.
-            seen[shift_state] = gen, offset
+        return frozenset(pot - offset for pot in state)
 
-    return sum(state)
+    return cycles.extrapolate(state, generation, target_gen, measure=sum, key=pattern)
@@ -1,65 +1,25 @@
 #!/bin/python
 """Advent of Code, Day 16: Chronal Classification. Map op instructions and simulate a CPU."""
 
+import elfcode
 from lib import aoc
+from lib import vm
 
 InputType = list[list[list[list[int]]] | list[list[int]]]
 
 
-
-def compute(instruction: int, op_a: int, op_b: int, memory: list[int]) -> int:
-    """Return the result of a single instruction."""
-    match instruction:
-        case 0:
-            # addr (add register) stores into register C the result of adding register A and register B.
-            return memory[op_a] + memory[op_b]
-        case 1:
-            # addi (add immediate) stores into register C the result of adding register A and value B.
-            return memory[op_a] + op_b
-        case 2:
-            # mulr (multiply register) stores into register C the result of multiplying register A and register B.
-            return memory[op_a] * memory[op_b]
-        case 3:
-            # muli (multiply immediate) stores into register C the result of multiplying register A and value B.
-            return memory[op_a] * op_b
-        case 4:
-            # banr (bitwise AND register) stores into register C the result of the bitwise AND of register A and register B.
-            return memory[op_a] & memory[op_b]
-        case 5:
-            # bani (bitwise AND immediate) stores into register C the result of the bitwise AND of register A and value B.
-            return memory[op_a] & op_b
-        case 6:
-            # borr (bitwise OR register) stores into register C the result of the bitwise OR of register A and register B.
-            return memory[op_a] | memory[op_b]
-        case 7:
-            # bori (bitwise OR immediate) stores into register C the result of the bitwise OR of register A and value B.
-            return memory[op_a] | op_b
-        case 8:
-            # setr (set register) copies the contents of register A into register C. (Input B is ignored.)
-            return memory[op_a]
-        case 9:
-            # seti (set immediate) stores value A into register C. (Input B is ignored.)
-            return op_a
-        case 10:
-            # gtir (greater-than immediate/register) sets register C to 1 if value A is greater than register B. Otherwise, register C is set to 0.
-            return 1 if op_a > memory[op_b] else 0
-        case 11:
-            # gtri (greater-than register/immediate) sets register C to 1 if register A is greater than value B. Otherwise, register C is set to 0.
-            return 1 if memory[op_a] > op_b else 0
-        case 12:
-            # gtrr (greater-than register/register) sets register C to 1 if register A is greater than register B. Otherwise, register C is set to 0.
-            return 1 if memory[op_a] > memory[op_b] else 0
-        case 13:
-            # eqir (equal immediate/register) sets register C to 1 if value A is equal to register B. Otherwise, register C is set to 0.
-            return 1 if op_a == memory[op_b] else 0
-        case 14:
-            # eqri (equal register/immediate) sets register C to 1 if register A is equal to value B. Otherwise, register C is set to 0.
-            return 1 if memory[op_a] == op_b else 0
-        case 15:
-            # eqrr (equal register/register) sets register C to 1 if register A is equal to register B. Otherwise, register C is set to 0.
-            return 1 if memory[op_a] == memory[op_b] else 0
-        case _:
-            raise ValueError("Unknown instruction")
+def candidates(prior: list[int], instruction: list[int], post: list[int]) -> set[int]:
+    """Return the operations which could have produced a capture."""
+    _, op_a, op_b, target = instruction
+    found = set()
+    for op, name in enumerate(elfcode.OP_NAMES):
+        try:
+            if elfcode.execute(name, op_a, op_b, target, prior) == post:
+                found.add(op)
+        except ValueError:
+            # A register operand which is out of range.
+            continue
+    return found
 
 
 def solve(data: InputType, part: int) -> int:
@@ -67,39 +27,32 @@ def solve(data: InputType, part: int) -> int:
     captures, program = data
     if part == 1:
         # Return the number of instructions which map to three or more potential operations.
-        return sum(
-            sum(
-                post[target] == compute(op, op_a, op_b, prior)
-                for op in range(16)
-            ) >= 3
-            for prior, (_, op_a, op_b, target), post in captures
-        )
+        return sum(len(candidates(*capture)) >= 3 for capture in captures)
 
     # Assume all mappings are possible. Then resolve via elimination.
     op_possibilities = {i: set(range(16)) for i in range(16)}
     op_map = {}  # Resolved operations.
-    for prior, (instruction, op_a, op_b, target), post in captures:
+    for prior, sample, post in captures:
+        instruction = sample[0]
         if instruction in op_map:
             # Optimization: do not check instructions we already resolved. 30ms => 20ms.
             continue
-        candidates = {
-            op
-            for op in range(16)
-            if post[target] == compute(op, op_a, op_b, prior)
-        }
-        op_possibilities[instruction] &= candidates
+        op_possibilities[instruction] &= candidates(prior, sample, post)
         if len(op_possibilities[instruction]) == 1:
             found = list(op_possibilities[instruction])[0]
             op_map[instruction] = found
-            for other, candidates in op_possibilities.items():
-                if other != instruction and found in candidates:
-                    candidates.remove(found)
+            for other, options in op_possibilities.items():
+                if other != instruction and found in options:
+                    options.remove(found)
 
     # Run the program.
-    memory = [0] * 4
-    for instruction, op_a, op_b, target in program:
-        memory[target] = compute(op_map[instruction], op_a, op_b, memory)
-    return memory[0]
+    decoded = elfcode.SMALL_DEVICE.decode(
+        [elfcode.OP_NAMES[op_map[instruction]], op_a, op_b, target]
+        for instruction, op_a, op_b, target in program
+    )
+    machine = vm.Machine(decoded)
+    machine.run()
+    return machine[0]
 
 
 # Split the input into the captures and program.
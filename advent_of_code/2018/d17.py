@@ -2,11 +2,11 @@
 """Advent of Code, Day 17: Reservoir Research."""
 from __future__ import annotations
 
-import functools
 import sys
 import typing
 
 from lib import aoc
+from lib import memo
 
 SAMPLE = """\
 x=495, y=2..7
@@ -39,7 +39,7 @@ def solve(data: list[list[int | str]], part: int) -> int:
     source = (500, min_y - 1)
     wet = set()
 
-    @functools.cache
+    @memo.memoize
     def has_leaks(x, y):
         # If we got to the bottom, there is nothing more to do.
         if y == max_y:
@@ -1,11 +1,9 @@
 #!/bin/python
 """Advent of Code, Day 18: Settlers of The North Pole."""
 
-import math
-import typing
-
 from lib import aoc
-import frozendict
+from lib import automaton
+from lib import cycles
 
 SAMPLE = """\
 .#.#...|#.
@@ -24,35 +22,28 @@ SAMPLE = """\
 TESTS = [(1, SAMPLE, 1147)]
 PARSER = aoc.CoordinatesParserC()
 
-def solve(data: aoc.Map, part: int) -> int:
-    area = typing.cast(frozendict.frozendict[complex, str], frozendict.frozendict(data.chars))
-
-    def transform(coord: complex) -> str:
-        """Return the next value for a cell."""
-        match area[coord]:
-            case ".":
-                return "|" if sum(area.get(coord + d, ".") == "|" for d in aoc.EIGHT_DIRECTIONS) >= 3 else "."
-            case "|":
-                return "#" if sum(area.get(coord + d, ".") == "#" for d in aoc.EIGHT_DIRECTIONS) >= 3 else "|"
-            case _:  # "#"
-                adjacent = {area.get(coord + d, ".") for d in aoc.EIGHT_DIRECTIONS}
-                return "#" if "#" in adjacent and "|" in adjacent else "."
+def solve(data: aoc.MapC, part: int) -> int:
+    """Return the resource value after running the lumber collection automaton."""
+    space = automaton.Space((data.width, data.height))
+    kernel = automaton.moore(2)
+    # One board for the trees and one for the lumberyards. Anything else is open ground.
+    trees = space.pack((int(p.real), int(p.imag)) for p in data.coords.get("|", set()))
+    lumber = space.pack((int(p.real), int(p.imag)) for p in data.coords.get("#", set()))
+
+    def step(state: tuple[int, int]) -> tuple[int, int]:
+        """Return the next boards."""
+        trees, lumber = state
+        adjacent_trees = space.count(trees, kernel)
+        adjacent_lumber = space.count(lumber, kernel)
+        open_ground = space.mask & ~trees & ~lumber
+        many_lumber = adjacent_lumber.at_least(3)
+        return (
+            (open_ground & adjacent_trees.at_least(3)) | (trees & ~many_lumber),
+            (trees & many_lumber) | (lumber & adjacent_lumber.at_least(1) & adjacent_trees.at_least(1)),
+        )
 
     steps = 10 if part == 1 else 1000000000
-    # Cycle tracking. A set for effiecient existence check. A list for ordered states.
-    seen = set()
-    states: list[frozendict.frozendict[complex, str]] = []
-    for step in range(steps):
-        area = frozendict.frozendict((coord, transform(coord)) for coord in area)
-        # Cycle detection logic.
-        if area in seen:
-            last_seen = states.index(area)
-            cycle_length = step - states.index(area)
-            remaining_steps = (steps - step - 1) % cycle_length
-            area = states[last_seen + remaining_steps]
-            break
-        seen.add(area)
-        states.append(area)
-    return math.prod(sum(i == char for i in area.values()) for char in "|#")
+    trees, lumber = cycles.skip_ahead((trees, lumber), step, steps)
+    return trees.bit_count() * lumber.bit_count()
 
 # vim:expandtab:sw=4:ts=4
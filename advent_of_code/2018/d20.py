@@ -2,9 +2,9 @@
 """Advent of Code, Day 20: A Regular Map."""
 
 import collections
-import functools
 
 from lib import aoc
+from lib import memo
 
 
 def solve(data: str, part: int) -> int:
@@ -13,7 +13,7 @@ def solve(data: str, part: int) -> int:
     graph = collections.defaultdict(set)
     data = data.removeprefix("^").removesuffix("$")
 
-    @functools.cache
+    @memo.memoize
     def explore(pos: complex, instructions: str) -> None:
         """Explore a segment of the map, with support for branching."""
         for idx, char in enumerate(instructions):
@@ -1,64 +1,21 @@
 #!/bin/python
 """Advent of Code, Day 21: Chronal Conversion."""
-import typing
-
-
-def compute(bound: int, instructions: list[tuple[str, int, int, int]]) -> int:
-    """Run a CPU simulator and report stop steps."""
-    registers = [0] * 6
-
-    mem_size = len(instructions)
-    ip = 0
-
-    while 0 <= ip < mem_size:
-        registers[bound] = ip
-        instruction = instructions[ip]
-        match instruction:
-            case ["seti", a, _, c]:
-                registers[c] = a
-            case ["setr", a, _, c]:
-                registers[c] = registers[a]
-            case ["addi", a, b, c]:
-                registers[c] = registers[a] + b
-            case ["addr", a, b, c]:
-                registers[c] = registers[a] + registers[b]
-            case ["muli", a, b, c]:
-                registers[c] = registers[a] * b
-            case ["mulr", a, b, c]:
-                registers[c] = registers[a] * registers[b]
-            case ["eqir", a, b, c]:
-                registers[c] = 1 if a == registers[b] else 0
-            case ["eqri", a, b, c]:
-                registers[c] = 1 if registers[a] == b else 0
-            case ["eqrr", a, b, c]:
-                registers[c] = 1 if registers[a] == registers[b] else 0
-            case ["gtrr", a, b, c]:
-                registers[c] = 1 if registers[a] > registers[b] else 0
-            case ["gtir", a, b, c]:
-                registers[c] = 1 if a > registers[b] else 0
-            case ["gtri", a, b, c]:
-                registers[c] = 1 if registers[a] > b else 0
-            case ["bani", a, b, c]:
-                registers[c] = registers[a] & b
-            case ["bori", a, b, c]:
-                registers[c] = registers[a] | b
-            case _:
-                raise RuntimeError(f"Unhandled instruction, {instruction}")
-        ip = registers[bound] + 1
-
-    return registers[0]
-
+import elfcode
+from lib import vm
 
 
 def solve(data: list[list[str | int]], part: int) -> int:
     """Return the r0 value needed to make the program terminate."""
-    reg, *instructions = data
     if part == 1:
-        # Instruction 28 compares r0 and r3 and halts if they match
-        # Insert an instruction that copies r3 to r0.
-        # Then the compare matches and r0 is returned -- the answer we want.
-        instructions.insert(28, ["setr", 3, 0, 0])
-        return compute(bound=int(reg[1]), instructions=typing.cast(list[tuple[str, int, int, int]], instructions))
+        # The only instruction which reads r0 compares it to another register and halts if they match.
+        # Run until that instruction and the other register holds the r0 value which halts soonest.
+        program = elfcode.decode(data)
+        ptr, (_, reg_a, reg_b, _) = next(
+            (ptr, line) for ptr, line in enumerate(program.source) if line[0] == "eqrr" and 0 in line[1:3]
+        )
+        machine = vm.Machine(program)
+        machine.run(breakpoints={ptr})
+        return machine[reg_b if reg_a == 0 else reg_a]
 
     """Reverse engineer the program. Run until no new values are discovered."""
     seen = set()
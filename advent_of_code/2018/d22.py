@@ -1,9 +1,9 @@
 #!/bin/python
 """Advent of Code, Day 22: Mode Maze."""
 
-import functools
 import queue
 from lib import aoc
+from lib import memo
 
 
 class PriorityOnceQ(queue.PriorityQueue):
@@ -56,12 +56,12 @@ def solve(data: list[list[int]], part: int) -> int:
             return x * 16807
         return erosion(x - 1, y) * erosion(x, y - 1)
 
-    @functools.cache
+    @memo.memoize
     def erosion(x: int, y: int) -> int:
         """Return the erosion for a location."""
         return (geo_idx(x, y) + depth) % 20183
 
-    @functools.cache
+    @memo.memoize
     def terrain(x: int, y: int) -> int:
         """Return the terrain type for a location."""
         return erosion(x, y) % 3
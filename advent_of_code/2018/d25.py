@@ -1,6 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 25: Four-Dimensional Adventure."""
 
+import collections.abc
+
 from lib import aoc
 
 SAMPLE = [
@@ -50,6 +52,7 @@ SAMPLE = [
 
 
 
+PARSER = aoc.parse_ints
 TESTS = [
     (1, SAMPLE[0], 2),
     (1, SAMPLE[1], 4),
@@ -59,31 +62,20 @@ TESTS = [
 
 def solve(data: list[list[int]], part: int) -> int:
     """Return how many constellations exist by grouping stars based on distances."""
-    groups = 0
-    todo = set(tuple(i) for i in data)
-    while todo:
-        groups += 1
-        group = {todo.pop()}
+    stars = sorted(tuple(i) for i in data)
+    constellations = aoc.DisjointSet[int](size=len(stars))
 
-        prior_size = 0
-        while len(group) != prior_size:
-            prior_size = len(group)
-            candidates = iter(list(todo))
-            while True:
-                to_add = next(
-                    (
-                        i for i in candidates
-                        if any(
-                            abs(i[0] - j[0]) + abs(i[1] - j[1]) + abs(i[2] - j[2]) + abs(i[3] - j[3]) <= 3
-                            for j in group
-                        )
-                    ), None
-                )
-                if to_add is None:
+    def close_pairs() -> collections.abc.Iterator[tuple[int, int]]:
+        """Yield the pairs of stars within range. Stars are sorted so stop once x is out of range."""
+        for i, a in enumerate(stars):
+            for j in range(i + 1, len(stars)):
+                b = stars[j]
+                if b[0] - a[0] > 3:
                     break
-                group.add(to_add)
-                todo.remove(to_add)
+                if abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2]) + abs(a[3] - b[3]) <= 3:
+                    yield i, j
 
-    return groups
+    constellations.union_many(close_pairs())
+    return constellations.components
 
 # vim:expandtab:sw=4:ts=4
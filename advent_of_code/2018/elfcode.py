@@ -0,0 +1,88 @@
+"""Elfcode: the 2018 wrist device CPU. Days 16, 19 and 21."""
+
+from lib import vm
+
+
+def add(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = r[a] + r[b]
+
+
+def mul(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = r[a] * r[b]
+
+
+def ban(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = r[a] & r[b]
+
+
+def bor(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = r[a] | r[b]
+
+
+def set_(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = r[a]
+
+
+def gt(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = 1 if r[a] > r[b] else 0
+
+
+def eq(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[c] = 1 if r[a] == r[b] else 0
+
+
+# The "r" and "i" suffixes pick register or immediate operands. Constant slots let both share a handler.
+OPS = {
+    "addr": vm.Op("rrw", add),
+    "addi": vm.Op("rcw", add),
+    "mulr": vm.Op("rrw", mul),
+    "muli": vm.Op("rcw", mul),
+    "banr": vm.Op("rrw", ban),
+    "bani": vm.Op("rcw", ban),
+    "borr": vm.Op("rrw", bor),
+    "bori": vm.Op("rcw", bor),
+    "setr": vm.Op("r_w", set_),
+    "seti": vm.Op("c_w", set_),
+    "gtir": vm.Op("crw", gt),
+    "gtri": vm.Op("rcw", gt),
+    "gtrr": vm.Op("rrw", gt),
+    "eqir": vm.Op("crw", eq),
+    "eqri": vm.Op("rcw", eq),
+    "eqrr": vm.Op("rrw", eq),
+}
+# Opcodes in the order the puzzle lists them.
+OP_NAMES = list(OPS)
+# Whether the A and B operands of each opcode are registers. C is always a register.
+REGISTER_OPERANDS = {name: (op.args[0] == "r", op.args[1] == "r") for name, op in OPS.items()}
+
+DEVICE = vm.Dialect(range(6), OPS)
+# The day 16 device only has four registers.
+SMALL_DEVICE = vm.Dialect(range(4), OPS)
+
+
+def decode(data: list[list[str | int]]) -> vm.Program:
+    """Decode a program which starts with a `#ip` declaration."""
+    (directive, ip), *instructions = data
+    assert directive == "#ip"
+    return DEVICE.decode(instructions, ip=int(ip))
+
+
+def run(program: vm.Program, register_zero: int = 0) -> int:
+    """Run a program to completion and return register 0."""
+    machine = vm.Machine(program, {0: register_zero})
+    machine.run()
+    return machine[0]
+
+
+def execute(name: str, a: int, b: int, c: int, registers: list[int]) -> list[int]:
+    """Return the registers after running a single instruction.
+
+    This skips decoding a program: the immediates go in the constant slots directly after the registers.
+    """
+    size = len(registers)
+    reg_a, reg_b = REGISTER_OPERANDS[name]
+    if (reg_a and a >= size) or (reg_b and b >= size) or c >= size:
+        raise ValueError(f"Register out of range in {name} {a} {b} {c}")
+    r = registers + [a, b]
+    OPS[name].handler(None, r, 0, a if reg_a else size, b if reg_b else size + 1, c)  # type: ignore
+    return r[:size]
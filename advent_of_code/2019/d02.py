@@ -4,9 +4,9 @@ import itertools
 import intcode
 
 
-def run_with_inputs(program: str, noun: int, verb: int, testing: int) -> int:
+def run_with_inputs(program: str, noun: int, verb: int, testing: int, engine: type[intcode.Computer]) -> int:
     """Run a computer with specific inputs."""
-    computer = intcode.Computer(program)
+    computer = engine(program)
     if not testing:
         computer.memory[1] = noun
         computer.memory[2] = verb
@@ -14,12 +14,12 @@ def run_with_inputs(program: str, noun: int, verb: int, testing: int) -> int:
     return computer.memory[0]
 
 
-def solve(data: str, part: int, testing: bool) -> int:
+def solve(data: str, part: int, testing: bool, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Test the IntCode."""
     if part == 1:
-        return run_with_inputs(data, 12, 2, testing)
+        return run_with_inputs(data, 12, 2, testing, engine)
     for noun, verb in itertools.product(range(100), repeat=2):
-        if run_with_inputs(data, noun, verb, testing) == 19690720:
+        if run_with_inputs(data, noun, verb, testing, engine) == 19690720:
             return 100 * noun + verb
     raise RuntimeError("Not solved.")
 
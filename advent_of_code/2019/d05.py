@@ -4,9 +4,9 @@
 import intcode
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Solve the parts."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     computer.input.append(1 if part == 1 else 5)
     computer.run()
     return computer.output.pop()
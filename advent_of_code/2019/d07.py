@@ -6,18 +6,21 @@ import itertools
 import intcode
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Find the max output for any given input."""
     largest = 0
     input_shift = 0 if part == 1 else 5
+    queues = [collections.deque[int]() for _ in range(5)]
+    # Chain five programs in serial.
+    computers = [
+        engine(data, input_q=queues[i], output_q=queues[(i + 1) % 5])
+        for i in range(5)
+    ]
     # Try all permutations of initial inputs.
     for values in itertools.permutations(range(5)):
-        queues = [collections.deque[int]() for _ in range(5)]
-        # Chain five programs in serial.
-        computers = [
-            intcode.Computer(data, input_q=queues[i], output_q=queues[(i + 1) % 5])
-            for i in range(5)
-        ]
+        # Reuse the computers; a reset keeps the decoded program.
+        for computer in computers:
+            computer.reset()
         for computer, value in zip(computers, values, strict=True):
             computer.input.append(value + input_shift)
         computers[0].input.append(0)  # Initial input: 0
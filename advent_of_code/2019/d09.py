@@ -4,9 +4,9 @@
 import intcode
 
 
-def solve(data: str, part: int, testing: bool) -> int | str:
+def solve(data: str, part: int, testing: bool, engine: type[intcode.Computer] = intcode.FastComputer) -> int | str:
     """Solve the parts."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     if testing:
         computer.run()
         return ",".join(str(i) for i in computer.output)
@@ -5,9 +5,9 @@ import intcode
 from lib import aoc
 
 
-def solve(data: str, part: int) -> int | str:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int | str:
     """Draw a call sign on the ship."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     position = complex()
     direction = complex(0, -1)
     painted: set[complex] = set()
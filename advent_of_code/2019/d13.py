@@ -9,9 +9,9 @@ BALL = 4
 SCORE = (-1, 0)
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Play the game by moving the paddle to follow the ball."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     if part == 2:
         computer.memory[0] = 2  # start the game without tokens
 
@@ -1,10 +1,10 @@
 #!/bin/python
 """Advent of Code, Day 15: Oxygen System."""
 
-import functools
 import itertools
 
 import intcode
+from lib import memo
 
 DIRECTIONS = {
     complex(0, +1): 1,  # North
@@ -12,90 +12,44 @@ DIRECTIONS = {
     complex(-1, 0): 3,  # West
     complex(+1, 0): 4,  # East
 }
+MOVES = {code: direction for direction, code in DIRECTIONS.items()}
 BOT_WALL = 0
 BOT_MOVED = 1
 BOT_FOUND = 2
-# Based on benchmarking
-BACKTRACK_LIMIT = 24
 
 
-@functools.cache
-def explore(program: str) -> tuple[set[complex], set[complex], complex]:
-    """Explore the map by moving around, backtracking at dead ends."""
+@memo.memoize
+def explore(program: str, engine: type[intcode.Computer]) -> tuple[set[complex], set[complex], complex]:
+    """Explore the map with a breadth first search over droid moves.
+
+    Each move is run from a snapshot of the droid at the prior location,
+    rather than walking the droid back and forth.
+    """
     # Track discovered hallways, walls and oxygen.
     hall = {complex()}
     wall: set[complex] = set()
     oxygen: complex | None = None
-    # Track pathways from the start to any given location.
-    # May not be the shortest path.
-    # Potential optimization: compute shortest known path on the fly.
-    paths: dict[complex, list[complex]] = {complex(): []}
-
-    # Explore until we explored the entire map.
-    while True:
-        explored = hall | wall
-        # Find any positions with unexplored adjacencies.
-        candidates = {
-            pos for pos in hall
-            if any(pos + direction not in explored for direction in DIRECTIONS)
-        }
-        # All locations were explored.
-        if not candidates:
-            assert oxygen is not None
-            return hall, wall, oxygen
-
-        computer = intcode.Computer(program)
-
-        def move(direction: complex) -> int:
-            computer.input.append(DIRECTIONS[direction])
-            computer.run()
-            return computer.output.popleft()
-
-        direction: complex | None
-        # Select a location and navigate to it.
-        pos = candidates.pop()
-        path = paths[pos]
-        for direction in path:
-            move(direction)
-
-        # From this location, explore the area.
-        # When there are no explored adjacencies, backtrack.
-        backtrack_limit = BACKTRACK_LIMIT
-        while backtrack_limit:
-            # Find the next unexplored adjacency.
-            while direction := next(
-                (direction for direction in DIRECTIONS if pos + direction not in explored),
-                None,
-            ):
-                backtrack_limit = BACKTRACK_LIMIT
-                new_pos = pos + direction
-                explored.add(new_pos)
-                candidates.discard(new_pos)
-                got = move(direction)
-                # If we hit a wall, record it and continue.
-                if got == BOT_WALL:
-                    wall.add(new_pos)
-                    continue
-                # Not a wall? New location discovered. Track it. Update state.
-                if got == BOT_FOUND:
-                    oxygen = new_pos
-                hall.add(new_pos)
-                path = path + [direction]
-                paths[new_pos] = path
-                pos = new_pos
-            # Got to a dead end. Backtrack when possible.
-            if not path:
-                break
-            backtrack_limit -= 1
-            direction = path[-1]
-            path = path[:-1]
-            pos -= direction
-            move(-direction)
+    nodes = intcode.explore(
+        engine(program),
+        moves=list(MOVES),
+        key=lambda pos, move, output, snapshot: pos + MOVES[move],
+        start_key=complex(),
+        expand=lambda node: node.output[0] != BOT_WALL,
+    )
+    for node in nodes:
+        if node.output[0] == BOT_WALL:
+            wall.add(node.key)
+            continue
+        hall.add(node.key)
+        if node.output[0] == BOT_FOUND:
+            oxygen = node.key
+    assert oxygen is not None
+    return hall, wall, oxygen
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Return the steps needed to find the oxygen or for the oxygen to fill the room."""
-    hall, wall, oxygen = explore(data)
+    hall, wall, oxygen = explore(data, engine)
     start = complex()
 
     total_space = len(hall)
@@ -75,9 +75,9 @@ def compute_program(steps: list[str], subroutines: dict[str, list[str]]) -> list
     return program
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Walk the scaffolding via a compact ASCII program."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     # Run the computer, read the output map, parse it.
     computer.run()
     map_data = [chr(i) for i in computer.output]
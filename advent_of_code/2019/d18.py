@@ -8,30 +8,34 @@ import string
 import typing
 
 from lib import aoc
+from lib import gridgraph
+from lib import search
 
 
 def build_edges(data: aoc.MapC, nodes: dict[str, complex]) -> dict[str, dict[str, tuple[int, int]]]:
     """Return a map of all {start|key}-key pairs with the min distance and blocking doors."""
+    # Walls are not in the map. Compress the hallways, keeping keys, doors and starts as nodes.
+    doors = [pos for pos, char in data.chars.items() if str(char).isupper()]
+    graph = gridgraph.contract(data, passable=lambda char: True, points=[*nodes.values(), *doors])
+    door_bits = [
+        1 << string.ascii_uppercase.index(char) if (char := str(data.chars[pos])).isupper() else 0
+        for pos in graph.nodes
+    ]
+    key_ids = {graph.ids[pos]: char for char, pos in nodes.items() if char.islower()}
+
     edges: dict[str, dict[str, tuple[int, int]]] = {node: {} for node in nodes}
-    # For each starting point, explore depth first to discover paths to keys.
+    # For each starting point, find the shortest paths to all the keys then collect the doors along each.
     for start, pos in nodes.items():
-        todo = collections.deque([(0, pos, 0)])
-        seen = {pos}
-        while todo:
-            steps, pos, doors = todo.popleft()
-            char = typing.cast(str, data.chars[pos])
-            if char.islower() and char != start:
-                edges[start][char] = (steps, doors)
-            steps += 1
-            for n in data.neighbors(pos):
-                if n in seen:
-                    continue
-                seen.add(n)
-                char = typing.cast(str, data.chars[n])
-                new_doors = doors
-                if char.isupper():
-                    new_doors |= 1 << string.ascii_uppercase.index(char)
-                todo.append((steps, n, new_doors))
+        result = search.dijkstra(
+            [graph.ids[pos]], lambda node: graph.edges[node].items(), paths=True,
+        )
+        for node, cost in result.costs.items():
+            if node not in key_ids or key_ids[node] == start:
+                continue
+            path_doors = 0
+            for step in result.path(node):
+                path_doors |= door_bits[step]
+            edges[start][key_ids[node]] = (cost, path_doors)
     return edges
 
 
@@ -5,9 +5,9 @@ import collections
 import intcode
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Solve the parts."""
-    return (part1 if part == 1 else part2)(data)
+    return (part1 if part == 1 else part2)(data, engine)
 
 
 def is_on(computer, x: int, y: int) -> bool:
@@ -18,9 +18,9 @@ def is_on(computer, x: int, y: int) -> bool:
     return computer.output.pop() == 1
 
 
-def part1(data: str) -> int:
+def part1(data: str, engine: type[intcode.Computer]) -> int:
     """Return the size of the beam."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     total = 0
     left, right, last_y = 0, 0, 0
     for y in range(50):
@@ -50,9 +50,9 @@ def part1(data: str) -> int:
     return total
 
 
-def part2(data: str) -> int:
+def part2(data: str, engine: type[intcode.Computer]) -> int:
     """Find where a 100x100 fits in the beam."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     left, right = 10, 10
     prior: collections.deque[tuple[int, int]] = collections.deque()
     for y in range(10, 100000):
@@ -3,6 +3,8 @@
 import collections
 import string
 from lib import aoc
+from lib import gridgraph
+from lib import search
 PARSER = aoc.CoordinatesParserC()
 
 
@@ -90,28 +92,29 @@ def build_map(
 def solve(data: aoc.MapC, part: int) -> int:
     """Return the number of steps required to solve the maze."""
     start, end, portal = build_map(data, part)
+    # Each portal connects the open cells next to its two ends, one step apart.
+    warps = {
+        next(p for p in data.neighbors(coord) if p in data.coords["."]): target
+        for coord, target in portal.items()
+    }
+    # Walk the hallways once. The search then only visits forks, dead ends and portals.
+    graph = gridgraph.contract(data, passable=lambda char: char == ".", points=[start, end, *warps])
+    edges = [{graph.nodes[n]: distance for n, distance in node_edges.items()} for node_edges in graph.edges]
 
-    todo = collections.deque([(0, 0, start)])
-    seen = {(start, 0)}
-    valid = set(data.coords["."]) | set(portal)
-    while todo:
-        steps, depth, pos = todo.popleft()
-        if pos == end and depth == 0:
-            return steps
-        steps += 1
-        for neighbor in data.neighbors(pos):
-            n_depth = depth
-            if neighbor in portal:
-                neighbor, depth_offset = portal[neighbor]
-                n_depth += depth_offset
-                # We can go "inside" indefinitely but cannot go outside beyond "0".
-                if n_depth < 0:
-                    continue
-            if neighbor in valid and (neighbor, n_depth) not in seen:
-                seen.add((neighbor, n_depth))
-                todo.append((steps, n_depth, neighbor))
+    def neighbors(state: tuple[complex, int]) -> list[tuple[tuple[complex, int], int]]:
+        pos, depth = state
+        options = [((n, depth), distance) for n, distance in edges[graph.ids[pos]].items()]
+        if pos in warps:
+            target, depth_offset = warps[pos]
+            # We can go "inside" indefinitely but cannot go outside beyond "0".
+            if depth + depth_offset >= 0:
+                options.append(((target, depth + depth_offset), 1))
+        return options
 
-    raise RuntimeError("No solution found.")
+    result = search.dijkstra([(start, 0)], neighbors, goal=lambda state: state == (end, 0))
+    if result.cost is None:
+        raise RuntimeError("No solution found.")
+    return result.cost
 
 
 SAMPLE = [
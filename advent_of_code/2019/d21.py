@@ -3,9 +3,9 @@
 import intcode
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Run a springscript ASCII program to navigate a droid across holes."""
-    computer = intcode.Computer(data)
+    computer = engine(data)
     computer.run()
     if part == 1:
         # Jump if (there is a hole in 1,2, or 3) and (there is ground at 4).
@@ -4,10 +4,10 @@ import typing
 import intcode
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Construct a computer network."""
     # Initialize and run computers.
-    computers = [intcode.Computer(data) for _ in range(50)]
+    computers = [engine(data) for _ in range(50)]
     for i, c in enumerate(computers):
         c.input.append(i)
         c.run()
@@ -15,8 +15,8 @@ CHECKPOINT = "Security Checkpoint"
 class Explorer:
     """Explorer is a droid used to explore the spaceship."""
 
-    def __init__(self, program: str):
-        self.c = intcode.Computer(program)
+    def __init__(self, program: str, engine: type[intcode.Computer]):
+        self.c = engine(program)
 
         self.connections = collections.defaultdict[str, dict[str, str]](dict)
         self.doors = dict[str, list[str]]()
@@ -117,10 +117,10 @@ class Explorer:
         raise RuntimeError("Not solved.")
 
 
-def solve(data: str, part: int) -> int:
+def solve(data: str, part: int, engine: type[intcode.Computer] = intcode.FastComputer) -> int:
     """Find the code to open the ship."""
     del part
-    e = Explorer(data)
+    e = Explorer(data, engine)
     e.explore_ship()
     for step in e.steps(CHECKPOINT):
         e.explore_room(step)
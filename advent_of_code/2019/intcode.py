@@ -3,9 +3,10 @@
 import collections
 import dataclasses
 import enum
+import itertools
 import operator
 import more_itertools
-from typing import Callable, Iterable
+from typing import Callable, Hashable, Iterable, Iterator, Sequence
 
 from lib import aoc
 
@@ -45,6 +46,47 @@ PARAMETER_MODE_POSITIONAL = 0
 PARAMETER_MODE_IMMEDIATE  = 1
 PARAMETER_MODE_RELATIVE   = 2
 
+# Snapshots split memory into pages so snapshots can share unchanged pages.
+# Writes mark their page dirty and a snapshot copies only the dirty pages.
+PAGE_BITS = 8
+PAGE_SIZE = 1 << PAGE_BITS
+ZERO_PAGE = (0,) * PAGE_SIZE
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    """Immutable machine state. Memory pages are shared between snapshots when unchanged.
+
+    Every page holds PAGE_SIZE values; memory past the last page is zero.
+    """
+
+    pages: tuple[tuple[int, ...], ...]
+    ptr: int
+    relative_base: int
+    state: State
+    input: tuple[int, ...]
+    output: tuple[int, ...]
+
+    def fingerprint(self) -> int:
+        """Return a hash of the machine state, ignoring pending IO and trailing zero pages."""
+        pages = self.pages
+        size = len(pages)
+        while size and pages[size - 1] == ZERO_PAGE:
+            size -= 1
+        return hash((self.ptr, self.relative_base, pages[:size]))
+
+
+class PagedMemory(collections.defaultdict):
+    """Sparse memory which records the pages written to."""
+
+    def __init__(self, dirty: set[int]):
+        super().__init__(int)
+        self.dirty = dirty
+
+    def __setitem__(self, addr: int, value: int) -> None:
+        super().__setitem__(addr, value)
+        self.dirty.add(addr >> PAGE_BITS)
+
 
 class Computer:
     """Intcode computer."""
@@ -85,13 +127,95 @@ class Computer:
         }
 
     def reset(self) -> None:
-        self.memory: dict[int, int] = collections.defaultdict(int)
+        # Pages written since the last snapshot or restore.
+        self.dirty: set[int] = set()
+        self.memory: dict[int, int] = PagedMemory(self.dirty)
         self.memory.update(self.program)
         self.ptr = 0
         self.relative_base = 0
         self.input.clear()
         self.output.clear()
         self.state = State.READY
+        self._last_snapshot: Snapshot | None = None
+
+    def memory_size(self) -> int:
+        """Return how many memory cells are in use."""
+        return max(self.memory, default=-1) + 1
+
+    def page(self, index: int) -> tuple[int, ...]:
+        """Return the contents of a page of memory."""
+        start = index * PAGE_SIZE
+        return tuple(map(self.memory.get, range(start, start + PAGE_SIZE), itertools.repeat(0)))
+
+    def load_memory(self, pages: tuple[tuple[int, ...], ...]) -> None:
+        """Replace memory with the contents of snapshot pages."""
+        self.memory = PagedMemory(self.dirty)
+        for i, page in enumerate(pages):
+            self.write_page(i, page)
+
+    def write_page(self, index: int, page: tuple[int, ...]) -> None:
+        """Overwrite a page of memory."""
+        self.memory.update(enumerate(page, start=index * PAGE_SIZE))
+
+    def snapshot(self) -> Snapshot:
+        """Return a snapshot of the machine state.
+
+        Pages which were not written since the last snapshot or restore are shared with it.
+        """
+        prior = self._last_snapshot
+        count = -(-self.memory_size() // PAGE_SIZE)
+        if prior is None:
+            pages = [self.page(i) for i in range(count)]
+        else:
+            pages = list(prior.pages)
+            for i in self.dirty:
+                if i < len(pages):
+                    pages[i] = self.page(i)
+            pages.extend(self.page(i) for i in range(len(pages), count))
+        self.dirty.clear()
+        snapshot = Snapshot(
+            pages=tuple(pages),
+            ptr=self.ptr,
+            relative_base=self.relative_base,
+            state=self.state,
+            input=tuple(self.input),
+            output=tuple(self.output),
+        )
+        self._last_snapshot = snapshot
+        return snapshot
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Restore the machine to a snapshot. The IO deques are updated in place.
+
+        Coming from another snapshot, only the pages which were written since
+        or which differ between the two snapshots are copied in.
+        """
+        prior = self._last_snapshot
+        if prior is None:
+            self.load_memory(snapshot.pages)
+        else:
+            changed = set(self.dirty)
+            changed.update(
+                i for i, (old, new) in enumerate(itertools.zip_longest(prior.pages, snapshot.pages))
+                if old is not new
+            )
+            for i in changed:
+                self.write_page(i, snapshot.pages[i] if i < len(snapshot.pages) else ZERO_PAGE)
+        self.dirty.clear()
+        self.ptr = snapshot.ptr
+        self.relative_base = snapshot.relative_base
+        self.state = snapshot.state
+        self.input.clear()
+        self.input.extend(snapshot.input)
+        self.output.clear()
+        self.output.extend(snapshot.output)
+        self._last_snapshot = snapshot
+
+    def fork(self) -> "Computer":
+        """Return a new computer, with its own IO deques, in the same state as this one."""
+        other = type(self)([self.program[i] for i in range(len(self.program))])
+        other.restore(self.snapshot())
+        return other
 
     def __str__(self):
         """Pretty print the memory."""
@@ -197,3 +321,321 @@ class Computer:
         # self._debug(f"{op_str:>16} => {act.__name__}({values})")
         act(*values)
 
+
+# Operand counts for the fast engine: (read operands, write operands).
+OPERAND_COUNTS = {
+    OP_CODE_ADD:     (2, 1),
+    OP_CODE_MUL:     (2, 1),
+    OP_CODE_INPUT:   (0, 1),
+    OP_CODE_OUTPUT:  (1, 0),
+    OP_CODE_J_TRUE:  (2, 0),
+    OP_CODE_J_FALSE: (2, 0),
+    OP_CODE_LT:      (2, 1),
+    OP_CODE_EQ:      (2, 1),
+    OP_CODE_RELBASE: (1, 0),
+    OP_CODE_STOP:    (0, 0),
+}
+# Statement templates per opcode. {a} and {b} are read operands, {t} is the write target.
+OP_CODE_BODIES = {
+    OP_CODE_ADD:     ["mem[{t}] = {a} + {b}"],
+    OP_CODE_MUL:     ["mem[{t}] = {a} * {b}"],
+    OP_CODE_INPUT:   ["if not inp:", "    s.ptr = p", "    s.state = IOWAIT", "    return -1", "mem[{t}] = inp.popleft()"],
+    OP_CODE_OUTPUT:  ["out.append({a})"],
+    OP_CODE_J_TRUE:  ["if {a}:", "    return {b}"],
+    OP_CODE_J_FALSE: ["if not {a}:", "    return {b}"],
+    OP_CODE_LT:      ["mem[{t}] = 1 if {a} < {b} else 0"],
+    OP_CODE_EQ:      ["mem[{t}] = 1 if {a} == {b} else 0"],
+    OP_CODE_RELBASE: ["rb[0] += {a}"],
+    OP_CODE_STOP:    ["s.ptr = p", "s.state = STOP", "return -1"],
+}
+_FACTORIES: dict[int, tuple[Callable, int, tuple[int, ...]]] = {}
+
+
+def instruction_factory(word: int) -> tuple[Callable, int, tuple[int, ...]]:
+    """Return a factory which builds a closure for one instruction word, eg 1002.
+
+    The closure runs the instruction and returns the next ptr, or -1 to stop running.
+    Source is generated and compiled once per instruction word then cached.
+    Along with the factory, return the operand count and which operands are positional.
+    """
+    if word in _FACTORIES:
+        return _FACTORIES[word]
+    param_modes, opcode = divmod(word, 100)
+    if opcode not in OPERAND_COUNTS:
+        raise ValueError(f"Invalid opcode {opcode} in {word}")
+    reads, writes = OPERAND_COUNTS[opcode]
+    lines = []
+    names = {}
+    positional = []
+    for i, name in enumerate("ab"[:reads] + "t" * writes):
+        param_modes, mode = divmod(param_modes, 10)
+        arg = f"o{i}"
+        if mode == PARAMETER_MODE_RELATIVE:
+            lines += [f"x{i} = rb[0] + {arg}", f"if x{i} >= len(mem):", f"    grow(x{i})"]
+            arg = f"x{i}"
+        elif mode == PARAMETER_MODE_IMMEDIATE and name == "t":
+            raise ValueError(f"Write operand in immediate mode in {word}")
+        elif mode == PARAMETER_MODE_POSITIONAL:
+            positional.append(i)
+        elif mode != PARAMETER_MODE_IMMEDIATE:
+            raise ValueError(f"Invalid param mode, {mode}")
+        names[name] = arg if mode == PARAMETER_MODE_IMMEDIATE or name == "t" else f"mem[{arg}]"
+    lines += [line.format(**names) for line in OP_CODE_BODIES[opcode]]
+    if writes:
+        lines += [f"dirty.add({names['t']} >> {PAGE_BITS})"]
+        lines += [f"if {names['t']} in owner:", f"    invalidate({names['t']})"]
+    if opcode != OP_CODE_STOP:
+        lines.append("return nxt")
+    params = ["s", "mem", "rb", "inp", "out", "owner", "dirty", "grow", "invalidate", "p", "nxt"]
+    params += [f"o{i}" for i in range(reads + writes)]
+    source = "\n".join(
+        [f"def factory({', '.join(params)}):", "    def op():"]
+        + [f"        {line}" for line in lines]
+        + ["    return op"]
+    )
+    namespace = {"IOWAIT": State.IOWAIT, "STOP": State.STOP}
+    exec(compile(source, f"<intcode {word}>", "exec"), namespace)
+    _FACTORIES[word] = (namespace["factory"], reads + writes, tuple(positional))
+    return _FACTORIES[word]
+
+
+class Memory:
+    """List backed memory which grows on demand and invalidates decoded instructions on write."""
+
+    def __init__(self, computer: "FastComputer"):
+        self.computer = computer
+
+    def __getitem__(self, addr: int) -> int:
+        mem = self.computer.mem
+        return mem[addr] if addr < len(mem) else 0
+
+    def __setitem__(self, addr: int, value: int) -> None:
+        computer = self.computer
+        computer.grow(addr)
+        computer.mem[addr] = value
+        computer.dirty.add(addr >> PAGE_BITS)
+        if addr in computer.owner:
+            computer.invalidate(addr)
+
+    def __len__(self) -> int:
+        return len(self.computer.mem)
+
+    def __iter__(self) -> Iterable[int]:
+        return iter(self.computer.mem)
+
+
+class FastComputer(Computer):
+    """Intcode computer which pre-decodes instructions into closures.
+
+    Memory is a flat list. Each instruction is decoded into a closure the first time
+    it runs, with its operand modes resolved and its operands baked in. Writes to
+    memory which hold a decoded instruction invalidate that instruction so
+    self-modifying code still works.
+    """
+
+    def __init__(
+        self,
+        program: str | list[int],
+        input_q: collections.deque | None = None,
+        output_q: collections.deque | None = None,
+        debug: bool = False,
+    ):
+        nums = program if isinstance(program, list) else program.split(",")
+        self.program_list = [int(i) for i in nums]
+        self.mem = list(self.program_list)
+        self.rb = [0]
+        # ptr -> closure, ptr -> raw instruction cells, cell -> ptrs of instructions using that cell.
+        self.code: dict[int, Callable[[], int]] = {}
+        self.raw: dict[int, tuple[int, ...]] = {}
+        self.owner: dict[int, list[int]] = {}
+        # Decoded instructions hold on to this set, so it is cleared and never replaced.
+        self.dirty: set[int] = set()
+        super().__init__(self.program_list, input_q, output_q, debug)
+
+    def reset(self) -> None:
+        """Reset memory to the program, retaining any decoded instructions which are still valid."""
+        mem = self.mem
+        size = len(mem)
+        mem[:] = self.program_list
+        mem.extend([0] * (size - len(mem)))
+        for ptr, raw in list(self.raw.items()):
+            if tuple(mem[ptr:ptr + len(raw)]) != raw:
+                self.invalidate(ptr)
+        self.memory = Memory(self)
+        self.ptr = 0
+        self.rb[0] = 0
+        self.input.clear()
+        self.output.clear()
+        self.state = State.READY
+        self._last_snapshot = None
+        self.dirty.clear()
+
+    def memory_size(self) -> int:
+        """Return how many memory cells are in use."""
+        return len(self.mem)
+
+    def page(self, index: int) -> tuple[int, ...]:
+        """Return the contents of a page of memory."""
+        start = index * PAGE_SIZE
+        page = self.mem[start:start + PAGE_SIZE]
+        if len(page) < PAGE_SIZE:
+            page.extend([0] * (PAGE_SIZE - len(page)))
+        return tuple(page)
+
+    def load_memory(self, pages: tuple[tuple[int, ...], ...]) -> None:
+        """Copy in every page of a snapshot. Memory past the snapshot is zero."""
+        for i, page in enumerate(pages):
+            self.write_page(i, page)
+        for i in range(len(pages), -(-len(self.mem) // PAGE_SIZE)):
+            self.write_page(i, ZERO_PAGE)
+
+    def write_page(self, index: int, page: tuple[int, ...]) -> None:
+        """Overwrite a page of memory, invalidating decoded instructions which changed."""
+        mem = self.mem
+        owner = self.owner
+        start = index * PAGE_SIZE
+        end = start + PAGE_SIZE
+        self.grow(end - 1)
+        current = mem[start:end]
+        if tuple(current) != page:
+            for addr, (old, new) in enumerate(zip(current, page), start=start):
+                if old != new and addr in owner:
+                    self.invalidate(addr)
+            mem[start:end] = page
+
+    @property
+    def relative_base(self) -> int:
+        return self.rb[0]
+
+    @relative_base.setter
+    def relative_base(self, value: int) -> None:
+        self.rb[0] = value
+
+    def grow(self, addr: int) -> None:
+        """Grow memory to contain an address."""
+        mem = self.mem
+        if addr >= len(mem):
+            mem.extend([0] * (max(addr + 1, 2 * len(mem)) - len(mem)))
+
+    def invalidate(self, addr: int) -> None:
+        """Drop decoded instructions which use a memory cell."""
+        for ptr in self.owner.get(addr, []):
+            if ptr not in self.raw:
+                continue
+            for cell in range(ptr, ptr + len(self.raw.pop(ptr))):
+                if cell in self.owner:
+                    self.owner[cell] = [i for i in self.owner[cell] if i != ptr]
+                    if not self.owner[cell]:
+                        del self.owner[cell]
+            del self.code[ptr]
+
+    def decode(self, ptr: int) -> Callable[[], int]:
+        """Decode the instruction at ptr into a closure."""
+        mem = self.mem
+        if ptr + 4 >= len(mem):
+            self.grow(ptr + 4)
+        word = mem[ptr]
+        factory, count, positional = instruction_factory(word)
+        operands = mem[ptr + 1:ptr + 1 + count]
+        # Positional operands are fixed addresses; make sure they are in memory.
+        for i in positional:
+            if operands[i] >= len(mem):
+                self.grow(operands[i])
+        op = factory(
+            self, mem, self.rb, self.input, self.output, self.owner, self.dirty, self.grow, self.invalidate,
+            ptr, ptr + 1 + count, *operands,
+        )
+        self.code[ptr] = op
+        self.raw[ptr] = (word, *operands)
+        owner = self.owner
+        for cell in range(ptr, ptr + 1 + count):
+            if cell in owner:
+                owner[cell].append(ptr)
+            else:
+                owner[cell] = [ptr]
+        return op
+
+    def run(self) -> None:
+        """Run a program until it stops or blocks on input."""
+        if self.state == State.IOWAIT and not self.input:
+            return
+        self.state = State.RUN
+        code = self.code
+        decode = self.decode
+        ptr = self.ptr
+        while ptr >= 0:
+            ptr = (code.get(ptr) or decode(ptr))()
+
+    def step(self):
+        """Run one step."""
+        self.state = State.RUN
+        ptr = (self.code.get(self.ptr) or self.decode(self.ptr))()
+        if ptr >= 0:
+            self.ptr = ptr
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchNode:
+    """One state reached by the explore() search."""
+
+    key: Hashable
+    move: int | str | None
+    output: tuple[int, ...]
+    snapshot: Snapshot
+    parent: "SearchNode | None" = None
+
+    @property
+    def path(self) -> list[int | str]:
+        """Return the moves taken to get to this node."""
+        moves = []
+        node: SearchNode | None = self
+        while node is not None and node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        return moves[::-1]
+
+
+def explore(
+    computer: Computer,
+    moves: Sequence[int | str],
+    key: Callable[[Hashable, int | str, tuple[int, ...], Snapshot], Hashable] | None = None,
+    start_key: Hashable | None = None,
+    expand: Callable[[SearchNode], bool] | None = None,
+) -> Iterator[SearchNode]:
+    """Breadth first search over input moves, starting from the computer's current state.
+
+    Each move is an int input or a str ASCII line. Rather than replaying from the
+    start, each move is run from a restored snapshot of its parent state.
+    Newly visited nodes are yielded in BFS order.
+
+    key(parent_key, move, output, snapshot) returns the visited-state key of a
+    node. By default this is the hash of the machine state.
+    expand(node) decides if moves should be explored from a node.
+    """
+    start = computer.snapshot()
+    if key is None:
+        key = lambda parent_key, move, output, snapshot: snapshot.fingerprint()
+        start_key = start.fingerprint()
+    root = SearchNode(key=start_key, move=None, output=(), snapshot=start)
+    seen = {root.key}
+    todo = collections.deque([root])
+    while todo:
+        node = todo.popleft()
+        for move in moves:
+            computer.restore(node.snapshot)
+            if isinstance(move, str):
+                computer.input_line(move)
+            else:
+                computer.input.append(move)
+            computer.run()
+            output = tuple(computer.output)
+            computer.output.clear()
+            snapshot = computer.snapshot()
+            child_key = key(node.key, move, output, snapshot)
+            if child_key in seen:
+                continue
+            seen.add(child_key)
+            child = SearchNode(key=child_key, move=move, output=output, snapshot=snapshot, parent=node)
+            yield child
+            if expand is None or expand(child):
+                todo.append(child)
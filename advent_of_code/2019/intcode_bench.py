@@ -0,0 +1,42 @@
+#!/bin/python
+"""Benchmark the Intcode engines against each other on every day which uses Intcode."""
+
+import importlib
+import pathlib
+
+import click
+
+import intcode
+from lib import helpers
+
+DAYS = [2, 5, 7, 9, 11, 13, 15, 17, 19, 21, 23, 25]
+ENGINES = {"Computer": intcode.Computer, "FastComputer": intcode.FastComputer}
+
+
+@click.command()
+@click.option("--day", "-d", "days", type=int, multiple=True, default=DAYS)
+def main(days: tuple[int]) -> None:
+    """Run each day with each engine, checking they agree and printing the timings."""
+    inputs = pathlib.Path(__file__).parent.parent / "inputs"
+    print(f"{'Day':8} " + " ".join(f"{name:>14}" for name in ENGINES) + "  Speedup")
+    for day in days:
+        module = importlib.import_module(f"d{day:02}")
+        data = (inputs / f"2019.{day:02}.txt").read_text().rstrip("\n")
+        for part in (1,) if day == 25 else (1, 2):
+            durations = {}
+            results = {}
+            for name, engine in ENGINES.items():
+                durations[name], results[name] = helpers.timed_ns(module.solve, data=data, part=part, testing=False, engine=engine)
+            if len(set(map(str, results.values()))) != 1:
+                print(f"2019.{day:02}.{part} engines disagree: {results}")
+            print(
+                f"2019.{day:02}.{part} "
+                + " ".join(f"{helpers.format_ns(duration):>14}" for duration in durations.values())
+                + f"  {durations['Computer'] / durations['FastComputer']:6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+# vim:ts=4:sw=4:expandtab
@@ -1,21 +1,19 @@
 #!/bin/python3
+"""Play Recursive Combat on many pairs of hands, one pair per worker."""
 
 import pathlib
+import sys
 
 import d22
-
-
-class Day22(d22.Day22):
-  pass
+from lib import parallel
 
 
 if __name__ == '__main__':
-  day = Day22()
-  data = pathlib.Path('data/22.pool.txt').read_text().strip()
-  hands = data.split('\n\n')
+  path = pathlib.Path(sys.argv[1] if len(sys.argv) > 1 else 'data/22.pool.txt')
+  hands = path.read_text().strip().split('\n\n')
   inputs = [[int(i) for i in h.strip().split('\n')[1:]] for h in hands]
-  res = [day.part2(inputs[i * 2:i * 2 + 2]) for i in range(15)]
-  print(res)
+  pairs = [inputs[i:i + 2] for i in range(0, len(inputs) - 1, 2)]
+  print(parallel.map_lines(d22.part2, pairs, min_items=2))
 
 
 # vim:ts=2:sw=2:expandtab
@@ -1,61 +1,48 @@
 #!/usr/bin/env python
 """AoC Day 8: Handheld Halting."""
 
+from lib import vm
 
-def compute(lines: list[list[str]]) -> tuple[int, bool]:
-    """Run the code, returning the accumulator and if the end was hit."""
-    # Accumulator
-    acc = 0
-    # Instruction pointer. The next instruction to execute.
-    ptr = 0
-    # Track which instructions were previously executed for loop detection.
-    seen = set()
-    # max value for the ptr, ie the end of the instructions.
-    max_ptr = len(lines) - 1
 
-    while True:
-        seen.add(ptr)
-        op, sval = lines[ptr]
-        val = int(sval)
-        if op == 'nop':
-            ptr += 1
-        elif op == 'jmp':
-            ptr += val
-        elif op == 'acc':
-            ptr += 1
-            acc += val
-        else:
-            raise ValueError(f'Invalid op {op}')
+def accumulate(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[0] += a
+
+
+def jmp(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int:
+    return ptr + a
+
 
-        # Got to the end.
-        if ptr > max_ptr:
-            return acc, True
-        # Loop detection.
-        if ptr in seen:
-            return acc, False
+CONSOLE = vm.Dialect(["acc"], {"nop": vm.Op("n", vm.nop), "acc": vm.Op("n", accumulate), "jmp": vm.Op("n", jmp)})
+
+
+def compute(program: vm.Program) -> tuple[int, bool]:
+    """Run the code, returning the accumulator and if the end was hit."""
+    machine = vm.Machine(program)
+    # Loop detection. The accumulator does not affect control flow so only track the instruction pointer.
+    status = machine.run(detect_loops=True, loop_key=lambda ptr, _: ptr)
+    return machine["acc"], status == vm.Status.HALTED
 
 
 def solve(data, part: int) -> int:
     """Run a program to get the accumulator value."""
+    program = CONSOLE.decode(data)
     if part == 1:
         # Run the code until a loop is detected.
-        acc, end = compute(data)
+        acc, end = compute(program)
         return acc
 
     # Swap jmp<>nop until the code can run to the end.
-    for i, (op, val) in enumerate(data.copy()):
-        op, val = data[i]
-        line = data[i]
+    # Decode the swapped program once and splice in one swapped instruction at a time.
+    swapped = CONSOLE.decode([[{'nop': 'jmp', 'jmp': 'nop'}.get(op, op), val] for op, val in data])
+    for i, (op, _) in enumerate(data):
         if op == 'acc':
             continue
-        if op == 'nop':
-            data[i] = ['jmp', val]
-        elif op == 'jmp':
-            data[i] = ['nop', val]
-        acc, end = compute(data)
+        line = program.code[i]
+        program.code[i] = swapped.code[i]
+        acc, end = compute(program)
         if end:
             return acc
-        data[i] = line
+        program.code[i] = line
     raise RuntimeError
 
 
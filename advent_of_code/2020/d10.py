@@ -2,7 +2,8 @@
 "Day 10. Power adapters."""
 
 import collections
-import functools
+
+from lib import memo
 
 
 def solve(data: list[int], part: int) -> int:
@@ -28,7 +29,7 @@ def part2(data: list[int]) -> int:
     """Count all possible paths from 0 to dest."""
     nums = [0] + sorted(data) + [max(data) + 3]
 
-    @functools.cache
+    @memo.memoize
     def possible_paths_from(i):
         """Compute all possible paths from node i to the end.
 
@@ -3,45 +3,38 @@
 
 import data as inputs
 from lib import aoc
+from lib import automaton
 
 
 def solve(data: aoc.Map, part: int) -> int:
     """Determine how many seats are in use."""
-    seats = data.coords.get("#", set()) | data.coords["L"]
-    occupied = data.coords.get("#", set())
-    board = set(data.chars.keys())
+    space = automaton.Space((data.width, data.height))
+    kernel = automaton.moore(2)
+    seats = space.pack(data.coords.get("#", set()) | data.coords["L"])
+    floor = space.mask & ~seats
+    occupied = space.pack(data.coords.get("#", set()))
     limit = 4 if part == 1 else 5
-    prior = {0}
-    while prior != occupied:
-
-        def look(pos, direction):
-            x, y = pos
-            dx, dy = direction
-            x += dx
-            y += dy
-            if part == 1:
-                return (x, y) in occupied
-            while (x, y) in board:
-                if (x, y) in occupied:
-                    return True
-                if (x, y) in seats:
-                    return False
-                x += dx
-                y += dy
-            return False
 
-        new = set()
-        for seat in seats:
-            adjacent_occupied = sum(look(seat, d) for d in aoc.EIGHT_DIRECTIONS_T)
-            if seat not in occupied:
-                if adjacent_occupied == 0:
-                    new.add(seat)
-            else:
-                if adjacent_occupied < limit:
-                    new.add(seat)
-        prior, occupied = occupied, new
-
-    return len(occupied)
+    def visible(occupied: int) -> list[int]:
+        """Return, for each direction, the cells which see an occupied seat past any floor."""
+        boards = []
+        for direction in kernel:
+            seen = space.shift(occupied, direction)
+            see_through = space.shift(floor, direction)
+            # Extend the line of sight one more floor cell at a time until nothing changes.
+            while (extended := seen | (see_through & space.shift(seen, direction))) != seen:
+                seen = extended
+            boards.append(seen)
+        return boards
+
+    prior = -1
+    while prior != occupied:
+        if part == 1:
+            counts = space.count(occupied, kernel)
+        else:
+            counts = automaton.Counts.add(visible(occupied), space.mask)
+        prior, occupied = occupied, (seats & ~occupied & counts.equal(0)) | (occupied & ~counts.at_least(limit))
+    return occupied.bit_count()
 
 
 S1 = inputs.D11S1
@@ -1,9 +1,10 @@
 #!/usr/bin/env python
 """AoC Day 24: Lobby Layout."""
 
-import collections
 import re
 
+from lib import automaton
+
 
 # https://www.redblobgames.com/grids/hexagons/ -- axial coordinates.
 # Cartesian coordinates represented by complex numbers, as per Day 12.
@@ -27,17 +28,15 @@ def solve(data: list[list[str]], part: int, testing: bool) -> int:
 
     # Speed up tests for convenience.
     limit = 20 if testing else 100
-    for _ in range(limit):
-        # Count all the "neighbor" values.
-        counts = collections.Counter(coord + x for x in DIRS for coord in live)
-
-        next_board = set()
-        for coord, count in counts.items():
-            if count == 2 or (count == 1 and coord in live):
-                next_board.add(coord)
-        live = next_board
-
-    return len(live)
+    # The floor is infinite but the pattern grows at most one tile per day in each direction.
+    xs = [int(c.real) for c in live]
+    ys = [int(c.imag) for c in live]
+    origin = (min(xs) - limit - 1, min(ys) - limit - 1)
+    space = automaton.Space((max(xs) - origin[0] + limit + 2, max(ys) - origin[1] + limit + 2))
+    board = space.pack((int(c.real) - origin[0], int(c.imag) - origin[1]) for c in live)
+    # automaton.HEX holds the DIRS as (x, y) offsets.
+    flips = automaton.Automaton(space, automaton.HEX, born={2}, survive={1, 2})
+    return flips.run(board, limit).bit_count()
 
 
 def build_grid(puzzle_input: list[list[str]]) -> set[complex]:
@@ -2,7 +2,8 @@
 """Advent of Code: Day 12. Find all the paths through a maze/graph."""
 
 import collections
-import functools
+
+from lib import memo
 
 
 def solve(data: dict[str, list[str]], part: int) -> int:
@@ -11,9 +12,12 @@ def solve(data: dict[str, list[str]], part: int) -> int:
     Do not revisit small caves... excepting maybe one small cave.
     """
     twice = "start" if part == 1 else None
+    # Track the small caves seen as a bitmask.
+    bits = {node: 1 << i for i, node in enumerate(data)}
 
-    @functools.cache
-    def paths(start: str, seen: frozenset[str], twice: str | None) -> int:
+    # Once a cave has been visited twice, which one it was does not matter.
+    @memo.memoize(key=lambda start, seen, twice: (start, seen, twice is None))
+    def paths(start: str, seen: int, twice: str | None) -> int:
         """Count all the paths from `start` to "end" without revisiting `seen`.
 
         Allow a single small cave to be visited twice.
@@ -22,10 +26,10 @@ def solve(data: dict[str, list[str]], part: int) -> int:
         if start == "end":
             return 1
         # The start node should not appear in the seen nodes.
-        assert start not in seen or start == twice
+        assert not seen & bits[start] or start == twice
         # Update the list of nodes we cannot revisit.
         if start.islower():
-            seen = frozenset(seen | set([start]))
+            seen |= bits[start]
         # Count paths from every neighbor to the end.
         subpaths = 0
         for node in data[start]:
@@ -33,14 +37,14 @@ def solve(data: dict[str, list[str]], part: int) -> int:
             if node == "start":
                 continue
             # If the node is not a small cave we already visited, visit it.
-            if node not in seen:
+            if not seen & bits[node]:
                 subpaths += paths(node, seen, twice)
             # If we already visited it once, maybe visit it a second time.
             elif twice is None:
                 subpaths += paths(node, seen, node)
         return subpaths
 
-    return paths("start", frozenset(), twice)
+    return paths("start", 0, twice)
 
 
 def input_parser(data: str) -> dict[str, list[str]]:
@@ -2,6 +2,7 @@
 """Advent of Code: Day 15. Navigate through a maze of chiton, minimizing damage/cost."""
 import typing
 from lib import aoc
+from lib import search
 
 
 def solve(data: aoc.Map, part: int) -> int:
@@ -29,31 +30,23 @@ def solve(data: aoc.Map, part: int) -> int:
 
 
 def solve_graph(node_weights: dict[tuple[int, int], int]) -> int:
-    """Return the lowest cost path from start to end with Djiksta's."""
+    """Return the lowest cost path from start to end with A*."""
     starting_point = (0, 0)
-    end_point = max(node_weights)
+    end_x, end_y = end_point = max(node_weights)
 
-    # Use Djiksta's to compute the cost from start to every node.
-    cost = {starting_point: 0}
-    visited = set()
-    todo = {starting_point}
-    while todo:
-        # Pop the lowest cost node.
-        current = sorted(todo, key=lambda x: cost[x])[0]
-        todo.remove(current)
-        # Mark it visited.
-        visited.add(current)
-        # Update neighbors with min(existing cost, cost through current)
-        for neighbor in aoc.t_neighbors4(current):
-            if neighbor in visited or neighbor not in node_weights:
-                continue
-            ncost = node_weights[neighbor]
-            cost_through_current = cost[current] + ncost
-            if neighbor not in cost or cost[neighbor] > cost_through_current:
-                cost[neighbor] = cost_through_current
-                # Add unvisited neighbors to the todo list.
-                todo.add(neighbor)
-    return cost[end_point]
+    def neighbors(point: tuple[int, int]) -> list[tuple[tuple[int, int], int]]:
+        return [(n, node_weights[n]) for n in aoc.t_neighbors4(point) if n in node_weights]
+
+    # Every node costs at least one so the distance to the end never overestimates.
+    result = search.astar(
+        [starting_point],
+        neighbors,
+        goal=lambda point: point == end_point,
+        heuristic=lambda point: end_x - point[0] + end_y - point[1],
+    )
+    if result.cost is None:
+        raise RuntimeError("Not solved")
+    return result.cost
 
 
 SAMPLE = """\
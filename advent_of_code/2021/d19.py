@@ -2,12 +2,12 @@
 """Advent of Code: Day 19. Merge disperate sensor maps of beacons into one unified map."""
 
 import collections
-import functools
 import itertools
 import input_data
+from lib import memo
 
 
-@functools.cache
+@memo.memoize
 def orientations(scanner):
     """Return all 24 orientations of a beacon map.
 
@@ -51,7 +51,7 @@ def orientations(scanner):
     return options
 
 
-@functools.cache
+@memo.memoize
 def relative_offsets(beacon_map):
     """Compute the pairwise Manhatten distance of all points in a map.
 
@@ -64,7 +64,7 @@ def relative_offsets(beacon_map):
     return distances
 
 
-@functools.cache
+@memo.memoize
 def potential_match(map_a, map_b) -> bool:
     """Orientation-agnostic check to see if two maps may line up.
 
@@ -82,7 +82,7 @@ def potential_match(map_a, map_b) -> bool:
 
 
 # This is slow. Cache results so part2 can reuse part1.
-@functools.cache
+@memo.memoize
 def merge(beacon_maps):
     """Merge all the sensor maps into a unified map of the beacons.
 
@@ -1,84 +1,52 @@
 #!/bin/python
 """Advent of Code: Day 20. Image enhancing algorithm."""
 
-import functools
 import input_data
 
+from lib import automaton
 
-@functools.cache  # 2x faster
-def point_to_area(point: complex):
-    """Return the 3x3 points centered around `point`."""
-    return [point + complex(x, y) for y in range(-1, 2) for x in range(-1, 2)]
 
-
-def solve(data: tuple[dict[str, bool], set[complex]], part: int) -> int:
+def solve(data: tuple[list[bool], list[str]], part: int) -> int:
     """Enhance the image N times.
 
-    For every iteration, expand the area of interest by expanding outwards
-    one step from the prior iteration. For all points in that area,
-    examine all their neighbors to determine their new state.
-
-    When blinking is in effect, points outside the area of interest (from
-    the prior iteration) are "unexplored" and blink on and off.
+    The image is infinite but everything outside the area the input can
+    influence shares one background value. When the algorithm maps an all
+    dark area to lit, the background blinks on and off.
 
-    When they blink off, they can be ignored. When blinked on (even steps),
-    any point outside the "explored" region are "on" when evaluated.
+    The board is packed into an automaton.Space padded by the step count, so
+    the image never reaches the edge, and the algorithm is applied to all
+    cells at once with automaton.lookup(). Cells outside the space read as
+    off, so while the background is lit the board holds the image inverted.
+    Flipping the table indexes accounts for the inverted input and flipping
+    the table values stores the output inverted.
     """
-    algo, image = data
-
-    # The background blinks if 000_000_000 => on and 111_111_111 => off
-    is_blinking = algo["000" * 3] and not algo["111" * 3]
-    # Mapping to translate bool to str to a binary number.
-    trans = {True: "1", False: "0"}
-
-    candidate_points = image
-    new_area = image
-
-    for step in range(2 if part == 1 else 50):
-        # The explored area is the points we evaluated last iteration.
-        # Anything not explored may be blinking.
-        explored = candidate_points
-        # Expand the area of interest by one neighbor.
-        # We could use the old candidate_points directly to compute the new
-        # candidate_points, but tracking what area is "new" reduces the area
-        # which needs expanding and speeds things up.
-        # candidate_points = set().union(*(set(point_to_area(point)) for point in candidate_points))
-        new_area = set().union(*(set(point_to_area(point)) for point in new_area)) - explored
-        candidate_points = candidate_points | new_area
-
-        # When the unexplored area is blinked on, points outside the explored
-        # area are "on".
-        if is_blinking and step % 2:
-            on_logic = lambda point: point not in explored or point in image
-        else:
-            on_logic = lambda point: point in image
-
-        # We could use a tuple(bool, ...) instead of converting to a string
-        # but that only saves 10% speed
-        def bitstring(point):
-            return "".join(trans[on_logic(p)] for p in point_to_area(point))
-
-        image = {
-            point
-            for point in candidate_points
-            if algo[bitstring(point)]
-        }
-
-    return len(image)
-
-
-def input_parser(data: str) -> tuple[dict[str, bool], set[complex]]:
+    algo, lines = data
+    steps = 2 if part == 1 else 50
+    width, height = len(lines[0]), len(lines)
+    margin = steps + 1
+    space = automaton.Space((width + 2 * margin, height + 2 * margin))
+    board = space.from_lines(lines, origin=(margin, margin))
+    # The neighbors in index order, most significant bit first.
+    area = [(x, y) for y in range(-1, 2) for x in range(-1, 2)]
+    full = len(algo) - 1
+
+    background = False
+    for _ in range(steps):
+        new_background = algo[full if background else 0]
+        table = [algo[i ^ full if background else i] ^ new_background for i in range(len(algo))]
+        board = automaton.lookup(space.neighbors(board, area), table, space.mask)
+        background = new_background
+
+    if background:
+        raise ValueError("The lit background is infinite.")
+    return board.bit_count()
+
+
+def input_parser(data: str) -> tuple[list[bool], list[str]]:
     """Parse the input data."""
     first, second = data.split("\n\n")
-    algo = {f"{i:09b}": char == "#" for i, char in enumerate(first)}
-
-    image = set(
-        complex(x, y)
-        for y, line in enumerate(second.splitlines())
-        for x, elem in enumerate(line)
-        if elem == "#"
-    )
-    return algo, image
+    # The algorithm has one entry for each 9 bit index.
+    return [char == "#" for char in first[:512]], second.splitlines()
 
 
 SAMPLE = input_data.D20_SAMPLE
@@ -2,73 +2,29 @@
 """Advent of Code: Day 22. Reactor Reboot. Compute cuboid overlaps."""
 
 import re
-InputType = list[tuple[bool, int, int, int, int, int, int]]
-Cube = tuple[int, int, int, int, int, int]
-
-
-def overlaps(
-    others: list[Cube],
-    ax0: int, ax1: int, ay0: int, ay1: int, az0: int, az1: int,
-) -> list[Cube]:
-    """Return the overlapping sections of one cube with others."""
-    out = []
-    for bx0, bx1, by0, by1, bz0, bz1 in others:
-        if (
-            bx1 < ax0 or bx0 > ax1 or
-            by1 < ay0 or by0 > ay1 or
-            bz1 < az0 or bz0 > az1
-        ):
-            continue
-        out.append((
-            max(ax0, bx0), min(ax1, bx1),
-            max(ay0, by0), min(ay1, by1),
-            max(az0, bz0), min(az1, bz1),
-        ))
-    return out
 
+from lib import boxes
 
-def volume(cubes: list[Cube]) -> int:
-    """Return the sum volume of cubes."""
-    return sum(
-        (x1 - x0 + 1) * (y1 - y0 + 1) * (z1 - z0 + 1)
-        for x0, x1, y0, y1, z0, z1 in cubes
-    )
-
-
-def restrict(data: InputType) -> InputType:
-    """Filter the input to a -50..50 volume."""
-    modified: InputType = []
-    for on, x0, x1, y0, y1, z0, z1 in data:
-        if (x1 < -50 or y1 < -50 or z1 < -50):
-            continue
-        if (x0 > 50 or y0 > 50 or z0 > 50):
-            continue
-        modified.append((
-            on,
-            max(x0, -50), min(x1, 50),
-            max(y0, -50), min(y1, 50),
-            max(z0, -50), min(z1, 50),
-        ))
-    return modified
+InputType = list[tuple[bool, int, int, int, int, int, int]]
+# The initialization procedure region for part 1.
+INIT_REGION = ((-50, 50), (-50, 50), (-50, 50))
 
 
 def solve(data: InputType, part: int) -> int:
     """Return the number of points which are on, no restrictions."""
-    if part == 1:
-        data = restrict(data)
-
-    add: list[Cube] = []
-    sub: list[Cube] = []
-
-    for on, *cube in data:
-        new_sub = overlaps(add, *cube)
-        new_add = overlaps(sub, *cube)
-        add.extend(new_add)
-        sub.extend(new_sub)
+    reactor = boxes.BoxSet()
+    for on, x0, x1, y0, y1, z0, z1 in data:
+        cube = ((x0, x1), (y0, y1), (z0, z1))
+        if part == 1:
+            # Filter the input to a -50..50 volume.
+            cube = boxes.intersection(cube, INIT_REGION)
+            if cube is None:
+                continue
         if on:
-            add.append(tuple(cube))  # type: ignore
-
-    return volume(add) - volume(sub)
+            reactor.add(cube)
+        else:
+            reactor.remove(cube)
+    return reactor.volume
 
 
 def input_parser(data: str) -> InputType:
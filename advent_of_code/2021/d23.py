@@ -28,10 +28,11 @@ further away from their room (x-distance). Solve with that assumption held for
 "BCD" then "CD" then "D" then "".
 """
 
-import functools
 import itertools
 import re
 
+from lib import memo
+
 
 # Amphipod type ("ABCD") and (x, y) location.
 Piece = tuple[str, int, int]
@@ -104,7 +105,7 @@ class AmphipodGame:
             if (x0 + dx, y0 + dy) in self.all_spots
         ]
 
-    @functools.cache
+    @memo.memoize
     def possible_moves(self, piece: Piece, occupied: Board) -> dict[Location, int]:
         """Return Locations a Piece can reach and step count, considering other pieces.
 
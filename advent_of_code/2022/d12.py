@@ -2,30 +2,23 @@
 """Advent of Code, Day 12: Hill Climbing Algorithm. Solve for the shortest path through a maze."""
 
 import string
-import collections
 
 from lib import aoc
+from lib import search
 
 
 def get_steps(starts: list[complex], end: complex, board: dict[complex, int]) -> int:
-    """Return the min steps from start to end."""
-    step_count = {point: 0 for point in starts}
-    to_visit = collections.deque([(p, 0) for p in starts])
+    """Return the min steps from any of the starts to the end."""
 
-    while to_visit:
-        point, height = to_visit.popleft()
-        for neighbor in aoc.neighbors(point):
-            n_height = board.get(neighbor, 99)
-            # Cannot climb a steep hill.
-            if n_height - 1 > height:
-                continue
-            if neighbor in step_count:
-                continue
-            if neighbor == end:
-                return step_count[point] + 1
-            step_count[neighbor] = step_count[point] + 1
-            to_visit.append((neighbor, n_height))
-    raise RuntimeError("Not found.")
+    def neighbors(point: complex) -> list[complex]:
+        # Cannot climb a steep hill.
+        height = board[point] + 1
+        return [n for n in (point + 1, point - 1, point + 1j, point - 1j) if board.get(n, 99) <= height]
+
+    result = search.bfs(starts, neighbors, goal=lambda point: point == end)
+    if result.cost is None:
+        raise RuntimeError("Not found.")
+    return result.cost
 
 
 def solve(data: tuple[complex, complex, dict[complex, int]], part: int) -> int:
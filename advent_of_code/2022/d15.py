@@ -4,40 +4,26 @@
 import itertools
 
 from lib import aoc
+from lib import intervals
 
 
+Sensors = list[tuple[int, int, int]]
+Beacons = set[tuple[int, int]]
 
-def flatten_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
-    """Flatten a list of ranges into a set of non-overlapping ranges."""
-    out = []
-    ranges = sorted(ranges)
-    start_a, end_a = ranges[0]
-    for start_b, end_b in ranges[1:]:
-        if end_b < start_a:
-            # Distinct ranges, range b occurs before range a.
-            raise RuntimeError("Ranges not sorted!")
-        if start_b > end_a:
-            # Distinct ranges, range b occurs after range a.
-            out.append((start_a, end_a))
-            start_a, end_a = start_b, end_b
-        else:
-            # Ranges overlap. Combine ranges.
-            start_a = min(start_a, start_b)
-            end_a = max(end_a, end_b)
-    out.append((start_a, end_a))
-    return out
-
-
-def solve(data: list[tuple[int, int, int]], part: int, testing: bool) -> int:
+
+def solve(data: tuple[Sensors, Beacons], part: int, testing: bool) -> int:
     """Solve the parts."""
-    return (part1 if part == 1 else part2)(data, testing)
+    sensors, beacons = data
+    if part == 1:
+        return part1(sensors, beacons, testing)
+    return part2(sensors, testing)
 
 
-def part1(puzzle_input: list[tuple[int, int, int]], testing: bool) -> int:
+def part1(puzzle_input: Sensors, beacons: Beacons, testing: bool) -> int:
     """Return the number of coordinates on a given row which cannot contain the beacon.
 
-    Collect a bunch of intervals for each sensor then aggregate them at the end into
-    combined ranges. Return sum size of ranges.
+    Collect a bunch of intervals for each sensor then aggregate them into
+    combined ranges. Return sum size of ranges, less the known beacons in them.
     """
     row = 10 if testing else 2000000
 
@@ -50,8 +36,9 @@ def part1(puzzle_input: list[tuple[int, int, int]], testing: bool) -> int:
         end = sensor_x + (sensor_range - y_dist)
         ranges.append((start, end))
 
-    covered_points = sum(end - start for start, end in flatten_ranges(ranges))
-    return covered_points
+    covered = intervals.IntervalSet(ranges)
+    # Covered spots which hold a known beacon do not count.
+    return covered.size - sum(1 for x, y in beacons if y == row and x in covered)
 
 def part2_line_intersections(sensors: list[tuple[int, int, int]]):
     """Use line intersections to locate the distress beacon.
@@ -152,17 +139,19 @@ def part2(puzzle_input: list[tuple[int, int, int]], testing: bool) -> int:
     return part2_line_intersections(puzzle_input)
     # return part2_linesweep(puzzle_input)
 
-def input_parser(puzzle_input: str) -> list[tuple[int, int, int]]:
-    """Parse a line into a tuple of sensor's coordinates and range."""
+def input_parser(puzzle_input: str) -> tuple[Sensors, Beacons]:
+    """Parse lines into tuples of sensor's coordinates and range, along with the distinct beacons."""
     data = []
+    beacons = set()
     for line in puzzle_input.splitlines():
         # Sensor (x, y) and beacon(x, y)
         a, b, c, d = (int(i) for i in aoc.RE_INT.findall(line))
         # Sensor (x, y) and sensor range (distance to beacon).
         data.append((a, b, abs(a - c) + abs(b - d)))
+        beacons.add((c, d))
     # Sort sensors, left to right.
     data.sort()
-    return data
+    return data, beacons
 
 SAMPLE = """\
 Sensor at x=2, y=18: closest beacon is at x=-2, y=15
@@ -2,13 +2,12 @@
 """Advent of Code, Day 16: Proboscidea Volcanium. Open valves to release pressure."""
 
 import collections
-import functools
 import itertools
-import math
 import re
 import time
 
-from lib import aoc
+from lib import subsets
+
 
 def input_parser(data: str) -> tuple[dict[str, int], dict[str, list[str]]]:
     rates = {}
@@ -55,34 +54,35 @@ def solve(data: tuple[dict[str, int], dict[str, list[str]]], part: int) -> int:
     distance = complete_graph(direct, rates)
     max_time = 30 if part == 1 else 26
 
-    @functools.cache
-    def dp(position: str, time_left: int, remaining: frozenset[str]) -> int:
-        most = 0
-        dist = distance[position]
-        for next_position, time_cost in distance[position].items():
-            if time_cost >= time_left or next_position not in remaining:
-                continue
-            adjusted_time = time_left - time_cost
-            additional_flow = adjusted_time * rates[next_position]
-            downstream = dp(next_position, adjusted_time, frozenset(remaining - {next_position}))
-            total_flow = additional_flow + downstream
-            if total_flow > most:
-                most = total_flow
-        return most
+    # Number the valves worth opening so a set of open valves is a bitmask.
+    valves = [valve for valve in distance if rates[valve] > 0]
+    bits = {valve: 1 << i for i, valve in enumerate(valves)}
+    # The most pressure released by opening exactly the valves in a mask.
+    best = [0] * (1 << len(valves))
 
-    all_valves = frozenset(distance)
-    if part == 1:
-        return dp("AA", max_time, all_valves)
+    # Walk forward in time. Routes which reach the same valve at the same time with the same valves open
+    # are merged, keeping the one which released the most.
+    routes: dict[int, dict[tuple[str, int], int]] = collections.defaultdict(dict)
+    routes[max_time][("AA", 0)] = 0
+    for time_left in range(max_time, 0, -1):
+        for (position, opened), released in routes.pop(time_left, {}).items():
+            if released > best[opened]:
+                best[opened] = released
+            for next_position, time_cost in distance[position].items():
+                bit = bits[next_position]
+                if time_cost >= time_left or opened & bit:
+                    continue
+                adjusted_time = time_left - time_cost
+                total = released + adjusted_time * rates[next_position]
+                arrived = routes[adjusted_time]
+                key = (next_position, opened | bit)
+                if total > arrived.get(key, -1):
+                    arrived[key] = total
 
-    most = 0
-    for r in range(len(distance)):
-        start = time.perf_counter_ns()
-        for group_one in itertools.combinations(distance, r=r):
-            g = frozenset(group_one)
-            combined = dp("AA", max_time, g) + dp("AA", max_time, frozenset(all_valves - g))
-            most = max(most, combined)
-        end = time.perf_counter_ns()
-    return most
+    if part == 1:
+        return max(best)
+    # Split the valves between us and the elephant.
+    return subsets.best_disjoint_pair(best)
 
 
 SAMPLE = """\
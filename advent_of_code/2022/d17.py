@@ -1,10 +1,9 @@
 #!/bin/python
 """Advent of Code, Day 17: Pyroclastic Flow. Compute the height of a Tetris-like rock pile after rocks have landed."""
 
-import collections
-import itertools
+import dataclasses
 
-from lib import aoc
+from lib import cycles
 
 ROCKS = """
     ####
@@ -25,91 +24,125 @@ ROCKS = """
     ##
     ##
     """
-GRAVITY = complex(0, -1)
+WIDTH = 7
+FULL_ROW = (1 << WIDTH) - 1
+LEFT_WALL = 1
+RIGHT_WALL = 1 << (WIDTH - 1)
 
 
-def build_rocks() -> None:
-    """Parse the rock shapes from ASCII art."""
+def build_rocks() -> list[tuple[int, ...]]:
+    """Parse the rock shapes from ASCII art.
+
+    Rocks and the tower are rows of bits, where bit x is column x from the left wall.
+    Rows are listed bottom to top and rocks start two columns from the left wall.
+    """
     rocks = []
-    parser = aoc.CoordinatesParserC()
     for block in ROCKS.strip().split("\n\n"):
-        block = block.replace(" ", "")
-        # Flip rocks upside down so Y increases from the bottom to the top.
-        # Most my parsing assumes Y increases as you move down through text.
-        block = "\n".join(reversed(block.splitlines()))
-        rocks.append(parser.parse(block)["#"])
-    rock_heights = [int(max(i.imag for i in r)) for r in rocks]
-    return rocks, rock_heights
+        lines = [line.strip() for line in block.splitlines()]
+        rocks.append(tuple(
+            sum(1 << (x + 2) for x, char in enumerate(line) if char == "#")
+            for line in reversed(lines)
+        ))
+    return rocks
+
+
+@dataclasses.dataclass(frozen=True)
+class Tower:
+    """The rock pile, between rocks.
+
+    rows: the rows which falling rocks can still reach, bottom first, up to the top of the pile.
+    pruned: the rows below those which are sealed off and dropped.
+    rock: the index of the next rock.
+    wind: the index of the next gust of wind.
+    """
+
+    rows: tuple[int, ...]
+    pruned: int
+    rock: int
+    wind: int
+
+    @property
+    def height(self) -> int:
+        return self.pruned + len(self.rows)
+
+    def key(self) -> tuple[tuple[int, ...], int, int]:
+        """Return everything which decides where the next rocks land, ie not how deep the pile is."""
+        return self.rows, self.rock, self.wind
+
+
+def reachable_floor(rows: list[int]) -> int:
+    """Return the lowest row which a falling rock could reach.
+
+    Rocks only move down, left and right so spread the open space down from
+    the top, one row at a time. This over-approximates what a whole rock fits
+    through, which is safe: it only keeps more rows than needed.
+    """
+    reach = FULL_ROW
+    lowest = len(rows)
+    for i in range(len(rows) - 1, -1, -1):
+        row = rows[i]
+        reach &= ~row
+        while (spread := (reach | reach << 1 | reach >> 1) & ~row & FULL_ROW) != reach:
+            reach = spread
+        if not reach:
+            break
+        lowest = i
+    return lowest
 
 
 def solve(data: str, part: int) -> int:
     """Compute the height of the tower after n rocks have fallen."""
     # Rounds to run, part 1 vs part 2.
     target_rock_count = 2022 if part == 1 else 1000000000000
-    rocks, rock_heights = build_rocks()
-    stream = data
-    stream_size = len(stream)
-    # Wind directions, translated to a number.
-    wind_direction = [aoc.ARROW_DIRECTIONS[i] for i in stream]
-    # Index counter which wraps around.
-    wind_idx_iter = itertools.cycle(range(stream_size))
-
-    # All the state we need to track.
-    landed = set()
-    tower_height = 0
-    seen = {}
-    height_deltas = []
-
-    # Drop rocks.
-    for rock_cnt in range(target_rock_count):
-        rock_shape = rocks[rock_cnt % 5]
-        # Rocks materialize at this offset.
-        bottom_left_corner = complex(2, tower_height + 4)
-
-        # Apply wind then gravity until it hits rock bottom.
+    rocks = build_rocks()
+    # Wind directions, as a shift to the right.
+    winds = [1 if i == ">" else -1 for i in data]
+
+    def drop(tower: Tower) -> Tower:
+        """Drop the next rock, applying wind then gravity until it hits rock bottom."""
+        rows = list(tower.rows)
+        shape = rocks[tower.rock]
+        wind = tower.wind
+        # Rocks materialize three rows above the top of the pile.
+        bottom = len(rows) + 3
+
+        def fits(shape: tuple[int, ...], bottom: int) -> bool:
+            if bottom < 0:
+                return False
+            return not any(
+                rows[bottom + i] & row for i, row in enumerate(shape) if bottom + i < len(rows)
+            )
+
         while True:
-            # Apply wind when it doesn't blow into rock.
-            wind_idx = next(wind_idx_iter)
-            wind = wind_direction[wind_idx]
-            new_corner = wind + bottom_left_corner
-            new_rock_positions = {r + new_corner for r in rock_shape}
-            if all(0 <= r.real < 7 for r in new_rock_positions) and landed.isdisjoint(new_rock_positions):
-                bottom_left_corner = new_corner
+            # Apply wind when it doesn't blow into a wall or rock.
+            if winds[wind] > 0:
+                if not any(row & RIGHT_WALL for row in shape):
+                    moved = tuple(row << 1 for row in shape)
+                    if fits(moved, bottom):
+                        shape = moved
+            elif not any(row & LEFT_WALL for row in shape):
+                moved = tuple(row >> 1 for row in shape)
+                if fits(moved, bottom):
+                    shape = moved
+            wind = (wind + 1) % len(winds)
 
             # Apply gravity or stop moving.
-            new_corner = GRAVITY + bottom_left_corner
-            new_rock_positions = {r + new_corner for r in rock_shape}
-            if all(0 < r.imag for r in new_rock_positions) and landed.isdisjoint(new_rock_positions):
-                bottom_left_corner = new_corner
-            else:
+            if not fits(shape, bottom - 1):
                 break
+            bottom -= 1
 
-        # Update data.
-        landed.update({bottom_left_corner + r for r in rock_shape})
-        next_height = max(tower_height, int(bottom_left_corner.imag) + rock_heights[rock_cnt%5])
-        # Store the heights to replay N steps after applying cyclic growth.
-        height_deltas.append(next_height - tower_height)
-        tower_height = next_height
-
-        # Mark this setup to detect a repeat for cycle detection.
-        fingerprint = (wind_idx, rock_cnt % 5, int(bottom_left_corner.real))
-        # Wait at least 50 rocks for the board to get into a steady state.
-        if rock_cnt > 50 and fingerprint in seen:
-            prior_rock_cnt, prior_height = seen[fingerprint]
-            cycle_size = rock_cnt - prior_rock_cnt
-            height_diff = tower_height - prior_height
-
-            # Apply N cycles of changes plus the remainder of rocks needed.
-            cycle_count, remaining = divmod(target_rock_count - rock_cnt, cycle_size)
-            tower_height += cycle_count * height_diff
-            tower_height += sum(height_deltas[prior_rock_cnt + 1:prior_rock_cnt + remaining])
-            return tower_height
-        seen[fingerprint] = (rock_cnt, tower_height)
-
-    # Part 1.
-    if rock_cnt + 1 == target_rock_count:
-        return tower_height
-    raise RuntimeError("Not found")
+        for i, row in enumerate(shape):
+            if bottom + i < len(rows):
+                rows[bottom + i] |= row
+            else:
+                rows.append(row)
+        lowest = reachable_floor(rows)
+        return Tower(tuple(rows[lowest:]), tower.pruned + lowest, (tower.rock + 1) % len(rocks), wind)
+
+    # The pile grows by the same amount each time the rocks, wind and top of the pile line up again.
+    return cycles.extrapolate(
+        Tower((), 0, 0, 0), drop, target_rock_count, measure=lambda tower: tower.height, key=Tower.key,
+    )
 
 
 SAMPLE = '>>><<><>><<<>><>>><<<>>><<<><<<>><>><<>>'
@@ -1,10 +1,13 @@
 #!/bin/python
 """Advent of Code, Day 19: Not Enough Minerals."""
 
+import collections.abc
 import math
+import operator
 import re
 
-from lib import aoc
+from lib import parallel
+from lib import search
 
 ORE = 0
 CLAY = 1
@@ -18,116 +21,92 @@ TYPES = {
     "geode": GEODE,
 }
 
-TIMEOUT = 300
-
-def simulator(puzzle_input: list[list[int]], minutes: int) -> int:
-    scores = []
-    for idx, blueprint in enumerate(puzzle_input, start=1):
-        max_spend = {rock: max(cost[rock] for cost in blueprint.values()) for rock in (ORE, CLAY, OBSIDIAN)}
-        seen = set()
-        todo = {(-minutes, 0, 0, 0, 0, 0, 0, 1, 0)}
-        turns_to_bots = {1: -minutes}
-        highest = 0
-        while todo:
-            cur = max(todo)
-            todo.remove(cur)
-            turns, rg, ig, rb, ib, rc, ic, rr, ir = cur
-            if turns == 0:
-                highest = max(highest, ig)
+# time left, ore, clay, obsidian, ore robots, clay robots, obsidian robots, geodes.
+# Geodes are counted in full when a geode robot is built, so the robots need not be tracked.
+State = tuple[int, int, int, int, int, int, int, int]
+
+
+def most_geodes(blueprint: dict[int, tuple[int, int, int]], minutes: int) -> int:
+    """Return the most geodes a blueprint can open in the time.
+
+    Rather than stepping a minute at a time, each move picks the next robot to
+    build and skips ahead to the minute it gets built. Never build more of a
+    robot than the most of its resource which can be spent in a minute. Cap
+    stockpiles at what could still be spent so states differing only in waste
+    are merged.
+    """
+    costs = [(robot, *blueprint[robot]) for robot in (GEODE, OBSIDIAN, CLAY, ORE)]
+    max_ore = max(cost[ORE] for cost in blueprint.values())
+    max_clay = blueprint[OBSIDIAN][CLAY]
+    max_obsidian = blueprint[GEODE][OBSIDIAN]
+    geode_ore, _, geode_obsidian = blueprint[GEODE]
+
+    def children(state: State) -> collections.abc.Iterator[State]:
+        time_left, ore, clay, obsidian, ore_bots, clay_bots, obsidian_bots, geodes = state
+        for robot, ore_cost, clay_cost, obsidian_cost in costs:
+            if (
+                (robot == ORE and ore_bots >= max_ore)
+                or (robot == CLAY and clay_bots >= max_clay)
+                or (robot == OBSIDIAN and obsidian_bots >= max_obsidian)
+                or (clay_cost and not clay_bots)
+                or (obsidian_cost and not obsidian_bots)
+            ):
                 continue
+            # Wait for the resources, then a minute to build.
+            wait = 1 + max(
+                0,
+                -(-(ore_cost - ore) // ore_bots),
+                -(-(clay_cost - clay) // clay_bots) if clay_cost else 0,
+                -(-(obsidian_cost - obsidian) // obsidian_bots) if obsidian_cost else 0,
+            )
+            # A robot built in the last minute is too late to collect anything.
+            if wait >= time_left:
+                continue
+            left = time_left - wait
+            yield (
+                left,
+                min(ore + ore_bots * wait - ore_cost, max_ore * left),
+                min(clay + clay_bots * wait - clay_cost, max_clay * left),
+                min(obsidian + obsidian_bots * wait - obsidian_cost, max_obsidian * left),
+                ore_bots + (robot == ORE),
+                clay_bots + (robot == CLAY),
+                obsidian_bots + (robot == OBSIDIAN),
+                geodes + left if robot == GEODE else geodes,
+            )
+
+    def bound(state: State) -> int:
+        """Return the geodes if ore was free and an obsidian robot was added every minute."""
+        time_left, _, _, obsidian, _, _, obsidian_bots, geodes = state
+        for left in range(time_left - 1, 0, -1):
+            if obsidian >= geode_obsidian:
+                obsidian += obsidian_bots - geode_obsidian
+                geodes += left
+            else:
+                obsidian += obsidian_bots
+            obsidian_bots += 1
+        return geodes
 
-            # never build more robots than can be spent on a single turn
-            # stop early if we haven't built enough geode robots to reach our goal before time limit (highest seen so far)
-            # stop early if we haven't built enough obsidian robots to reach our goal of geode robots before we need to switch to making only geode robots (as many as we need to hit our geode goal)
-            # didn't do the stop early's exactly, just close enough to ensure super dead branches weren't explored. some dead branches still got through but not very many (eg assume we have resources to make a geode bot each minute, assume that we'll have the full output of the obsidian miners in the whole 30 minutes at the time we start building geode bots)
+    best, _ = search.branch_and_bound(
+        [(minutes, 0, 0, 0, 1, 0, 0, 0)], children, value=operator.itemgetter(7), bound=bound,
+    )
+    assert best is not None
+    return best
 
-            if ig + rg * -turns + (turns * (turns + 1)) // 2 < highest:
-                continue
 
-            candidates = []
-
-            if blueprint[GEODE][ORE] <= ir and blueprint[GEODE][OBSIDIAN] <= ib:
-                candidates.append((
-                    True,
-                    turns + 1,
-                    rg + 1, ig + rg,
-                    rb    , ib + rb - blueprint[GEODE][OBSIDIAN],
-                    rc    , ic + rc,
-                    rr    , ir + rr - blueprint[GEODE][ORE],
-                ))
-            else:
-                max_obs_used = blueprint[GEODE][OBSIDIAN] * (-turns - 1)
-                min_obs_avail = ib + rb * (-turns - 1)
-                if rb < max_spend[OBSIDIAN] and blueprint[OBSIDIAN][ORE] <= ir and blueprint[OBSIDIAN][CLAY] <= ic and max_obs_used > min_obs_avail:
-                        candidates.append((
-                            True,
-                            turns + 1,
-                            rg    , ig + rg,
-                            rb + 1, ib + rb,
-                            rc    , ic + rc - blueprint[OBSIDIAN][CLAY],
-                            rr    , ir + rr - blueprint[OBSIDIAN][ORE],
-                        ))
-                max_clay_used = blueprint[OBSIDIAN][CLAY] * (-turns - 1)
-                min_clay_avail = ic + rc * (-turns - 1)
-                if rc < max_spend[CLAY] and blueprint[CLAY][ORE] <= ir and blueprint[CLAY][ORE] and max_clay_used > min_clay_avail:
-                    candidates.append((
-                        True,
-                        turns + 1,
-                        rg    , ig + rg,
-                        rb    , ib + rb,
-                        rc + 1, ic + rc,
-                        rr    , ir + rr - blueprint[CLAY][ORE],
-                    ))
-                if rr < max_spend[ORE] and blueprint[ORE][ORE] <= ir and blueprint[ORE][ORE] < -turns:
-                    candidates.append((
-                        True,
-                        turns + 1,
-                        rg    , ig + rg,
-                        rb    , ib + rb,
-                        rc    , ic + rc,
-                        rr + 1, ir + rr - blueprint[ORE][ORE],
-                    ))
-                candidates.append((
-                    False,
-                    turns + 1,
-                    rg, ig + rg,
-                    rb, ib + rb,
-                    rc, ic + rc,
-                    rr, ir + rr,
-                ))
-            for next_state in candidates:
-                building = next_state[0]
-                next_state = next_state[1:]
-                bots = 0
-                for i in (1, 3, 5, 7):
-                    bots <<= 5
-                    bots |= next_state[i]
-                hsh = (bots << 7) | -next_state[0]
-                for i in (2, 4, 6, 8):
-                    hsh <<= 9
-                    hsh |= next_state[i]
-                if hsh in seen:
-                    continue
-                if building and bots in turns_to_bots:
-                    if turns_to_bots[bots] < next_state[0]:
-                        continue
-                turns_to_bots[bots] = next_state[0]
-
-                seen.add(hsh)
-                todo.add(next_state)
-        scores.append(highest)
-    return scores
-
-
-def solve(data: list[list[int]], part: int) -> int:
+def simulator(blueprints: list[dict[int, tuple[int, int, int]]], minutes: int, testing: bool) -> list[int]:
+    """Return the most geodes for each blueprint, solving blueprints in parallel."""
+    return parallel.map_lines(most_geodes, blueprints, minutes, testing=testing, min_items=2)
+
+
+def solve(data: list[dict[int, tuple[int, int, int]]], part: int, testing: bool) -> int:
     if part == 1:
-        scores = simulator(data, 24)
+        scores = simulator(data, 24, testing)
         return sum(idx * score for idx, score in enumerate(scores, start=1))
 
-    return math.prod(simulator(data[:3], 32))
+    return math.prod(simulator(data[:3], 32, testing))
 
 
-def input_parser(puzzle_input: str) -> list[list[int]]:
+def input_parser(puzzle_input: str) -> list[dict[int, tuple[int, int, int]]]:
     """Parse the input data."""
     blueprints = []
     RE = re.compile("Each (.*) robot costs (.*)")
@@ -2,10 +2,10 @@
 """Advent of Code, Day 22: Monkey Map. Wander a wrapped map to find a final location."""
 
 import collections
-import functools
 from typing import Type
 
 from lib import aoc
+from lib import memo
 
 OPEN = "."
 WALL = "#"
@@ -30,7 +30,7 @@ class Mapper:
 class FlatMap(Mapper):
     """Navigate a flat map with edge-wrapping."""
 
-    @functools.cache
+    @memo.memoize
     def get_next(self, cur_position: complex, cur_dir: complex) -> tuple[complex, complex]:
         """Return the next position and direction."""
         points = self.points
@@ -199,7 +199,7 @@ class CubeMap(Mapper):
             })
         return face_map
 
-    @functools.cache
+    @memo.memoize
     def get_next(self, cur_position: complex, cur_dir: complex) -> tuple[complex, complex]:
         """Return the next position and direction."""
         next_dir = cur_dir
@@ -2,11 +2,11 @@
 """Advent of Code, Day 5: If You Give A Seed A Fertilizer.
 
 Work a set of seeds through a number of range-translations."""
-import collections
 from lib import aoc
+from lib import intervals
 
 
-def solve(data: tuple[list[int], list[list[list[int]]]], part: int) -> int:
+def solve(data: tuple[list[int], list[list[tuple[int, int, int]]]], part: int) -> int:
     """Map ranges of seeds to a final value and return the min."""
     seeds, translation_layers = data
 
@@ -16,43 +16,18 @@ def solve(data: tuple[list[int], list[list[list[int]]]], part: int) -> int:
         seeds = [i for seed in seeds for i in [seed, 1]]
 
     # Convert [seed, length, seed, length] into [(start, end), (start, end)] inclusive intervals.
-    values = []
-    for i in range(0, len(seeds), 2):
-        values.append((seeds[i], seeds[i] + seeds[i + 1] - 1))
+    values = intervals.IntervalSet(
+        (seeds[i], seeds[i] + seeds[i + 1] - 1) for i in range(0, len(seeds), 2)
+    )
 
-    # For each mapping, go through all value ranges and translate them to the next layer.
+    # For each mapping, translate all the value ranges to the next layer at once.
     for block in translation_layers:
-        # Load the rules into a deque for easy access.
-        block.sort()
-        block_q = collections.deque(block)
-        src_start, src_end, distance = block_q.popleft()
-
-        # Copy the values into a queue and reset the list.
-        ranges = collections.deque(sorted(values))
-        values = []
-
-        # Process ranges in order, splitting if needed, to create new ranges.
-        while ranges:
-            start, end = ranges.popleft()
-            # Cycle through rules until a rule is relevant.
-            while block_q and start > src_end:
-                src_start, src_end, distance = block_q.popleft()
-            pre, overlap, post = aoc.interval_overlap((start, end), (src_start, src_end))
-            if overlap is None:
-                values.append((start, end))
-            else:
-                # Pre-overlap is copied without change. Overlap is translated.
-                # Post-overlap is put back into the queue as a later rule may apply.
-                if pre is not None:
-                    values.append(pre)
-                values.append((overlap[0] + distance, overlap[1] + distance))
-                if post is not None:
-                    ranges.appendleft(post)
-
-    return min(values)[0]
-
-
-def input_parser(data: str) -> tuple[list[int], list[list[list[int]]]]:
+        values = intervals.IntervalMap(block).apply(values)
+
+    return values.start
+
+
+def input_parser(data: str) -> tuple[list[int], list[list[tuple[int, int, int]]]]:
     """Parse the input data."""
     parser = aoc.ParseBlocks([aoc.parse_re_findall_int(r"\d+")])
     (seeds,), *translation_layers = parser.parse(data)
@@ -1,9 +1,10 @@
 #!/bin/python
 """Advent of Code, Day 12: Hot Springs."""
-import functools
 
+from lib import memo
 
-@functools.cache
+
+@memo.memoize
 def ways_to_fit(springs: tuple[str, ...], numbers: tuple[int, ...]) -> int:
     """Return the ways springs can fit."""
     if not numbers:
@@ -41,17 +42,24 @@ def ways_to_fit(springs: tuple[str, ...], numbers: tuple[int, ...]) -> int:
     return count
 
 
+def arrangements(line: list[str], part: int) -> int:
+    """Return the number of possible fits for one row."""
+    springs_str, numbers_str = line
+    if part == 2:
+        springs_str = "?".join([springs_str] * 5)
+        numbers_str = ",".join([numbers_str] * 5)
+    springs = tuple(i for i in springs_str.split(".") if i)
+    numbers = tuple(int(i) for i in numbers_str.split(","))
+    return ways_to_fit(springs, numbers)
+
+
 def solve(data: list[list[str]], part: int) -> int:
-    """Return the total number of possible fits."""
-    count = 0
-    for springs_str, numbers_str in data:
-        if part == 2:
-            springs_str = "?".join([springs_str] * 5)
-            numbers_str = ",".join([numbers_str] * 5)
-        springs = tuple(i for i in springs_str.split(".") if i)
-        numbers = tuple(int(i) for i in numbers_str.split(","))
-        count += ways_to_fit(springs, numbers)
-    return count
+    """Return the total number of possible fits.
+
+    Rows run in this process rather than over parallel.map_lines so ways_to_fit
+    keeps one cache, which part 2 reuses from part 1.
+    """
+    return sum(arrangements(line, part) for line in data)
 
 
 SAMPLE = """\
@@ -1,6 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 14: Parabolic Reflector Dish."""
 from lib import aoc
+from lib import cycles
+
 STEPS_P2 = 1000000000
 
 
@@ -63,22 +65,10 @@ def solve(data: aoc.Map, part: int) -> int:
         moving = post_move - stationary
         return int(sum(height - rock[1] for rock in moving))
 
-    # Find a cycle in the rotation.
-    step_to_map = list[frozenset[tuple[int, int]]]()
-    map_to_step = dict[frozenset[tuple[int, int]], int]()
-    for step in range(STEPS_P2):
-        moving = cycle(data.edges, moving, stationary)
-
-        frozen = frozenset(moving)
-        if frozen in map_to_step:
-            cycle_size = step - map_to_step[frozen]
-            remaining_steps = STEPS_P2 - step - 1
-            remaining_steps %= cycle_size
-            moving = set(step_to_map[map_to_step[frozen] + remaining_steps])
-            break
-        map_to_step[frozen] = step
-        step_to_map.append(frozen)
-
+    # The rocks settle into a loop of spin cycles.
+    moving = cycles.skip_ahead(
+        frozenset(moving), lambda rocks: frozenset(cycle(data.edges, rocks, stationary)), STEPS_P2,
+    )
     return int(sum(height - rock[1] for rock in moving))
 
 
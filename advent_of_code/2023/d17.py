@@ -1,51 +1,44 @@
 #!/bin/python
 """Advent of Code, Day 17: Clumsy Crucible."""
-import queue
+from lib import search
+
+State = tuple[int, int, bool]
 
 
 def solve(data: tuple[dict[tuple[int, int], int], tuple[int, int]], part: int) -> int:
     """Return the minimum heat loss from start to end."""
     board, end = data
-    max_distance = 3 if part == 1 else 10
-    seen = dict[tuple[tuple[int, int], tuple[int, int], int], int]()
-
-    loss, location, direction, count = 0, (0, 0), (0, 0), 0
-    todo = queue.PriorityQueue[tuple[int, tuple[int, int], tuple[int, int], int]]()
-    todo.put((loss, location, direction, count))
-
-    while not todo.empty():
-        loss, location, direction, count = todo.get()
-        if location == end and (part == 1 or count >= 4):
-            return loss
-
-        # Try moving in all four directions.
-        for next_direction in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            if next_direction[0] == -direction[0] and next_direction[1] == -direction[1]:
-                # No reversing.
-                continue
-            if part == 2 and direction != (0, 0) and next_direction != direction and count < 4:
-                # Part two: no turning prior to 4 moves.
-                continue
-            if next_direction == direction and count == max_distance:
-                # No moving in one direction for too long.
-                continue
-
-            next_location = (location[0] + next_direction[0], location[1] + next_direction[1])
-            if next_location not in board:
-                continue
-
-            next_loss = loss + board[next_location]
-            next_count = count + 1 if next_direction == direction else 1
+    min_distance, max_distance = (1, 3) if part == 1 else (4, 10)
 
-            # Avoid looping when a path was already explored at equal/lower cost.
-            fp = (next_location, next_direction, next_count)
-            if fp in seen and seen[fp] <= next_loss:
-                continue
-            seen[fp] = next_loss
+    def neighbors(state: State) -> list[tuple[State, int]]:
+        """Return the states reachable by turning and moving in a straight line.
 
-            todo.put((next_loss, next_location, next_direction, next_count))
+        A state is a location and whether the crucible last moved horizontally.
+        The next move turns, so folding the straight run into one move avoids tracking the run length.
+        """
+        x, y, horizontal = state
+        options = []
+        for dx, dy in ((0, 1), (0, -1)) if horizontal else ((1, 0), (-1, 0)):
+            loss = 0
+            for distance in range(1, max_distance + 1):
+                location = (x + dx * distance, y + dy * distance)
+                if location not in board:
+                    break
+                loss += board[location]
+                if distance >= min_distance:
+                    options.append(((*location, not horizontal), loss))
+        return options
 
-    raise RuntimeError("Failed to solve")
+    # Every cell costs at least one so the distance is an admissible A* heuristic.
+    result = search.astar(
+        [(0, 0, True), (0, 0, False)],
+        neighbors,
+        goal=lambda state: state[:2] == end,
+        heuristic=lambda state: end[0] - state[0] + end[1] - state[1],
+    )
+    if result.cost is None:
+        raise RuntimeError("Failed to solve")
+    return result.cost
 
 
 def input_parser(data: str) -> tuple[dict[tuple[int, int], int], tuple[int, int]]:
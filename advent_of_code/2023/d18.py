@@ -1,20 +1,18 @@
 #!/bin/python
 """Advent of Code, Day 18: Lavaduct Lagoon."""
 
-import collections
-import more_itertools
 from lib import aoc
+from lib import areas
 
 LETTER_DIRECTIONS = aoc.LETTER_DIRECTIONS
 NUM_TO_LETTER = {"0": "R", "2": "L", "3": "U", "1": "D"}
 
 
 def solve(data: list[list[str]], part: int) -> int:
-    # Start at 0, 0 and track vertical trenches.
+    """Return how much lava the lagoon holds, counting the trench itself."""
+    # Start at 0, 0 and record the corners of the trench.
     position = complex(0)
-    vertical_trenches = set()
-    prior_direction = complex(0)
-    perimeter_size = 0
+    corners = []
     # Follow the instructions to compute all the perimeter lines.
     for direction_letter, distance_str, color in data:
         if part == 1:
@@ -24,67 +22,12 @@ def solve(data: list[list[str]], part: int) -> int:
             color = color.strip("()#")
             distance = int(color[:-1], 16)
             direction_letter = NUM_TO_LETTER[color[-1]]
-        direction = LETTER_DIRECTIONS[direction_letter]
-
-        # The perimeter_size logic requires we never double back.
-        # Assert we always rotate 90 degrees each line.
-        assert prior_direction not in (direction, -direction)
-        prior_direction = direction
-
-        start = position
-        end = position + direction * distance
-        perimeter_size += distance
-        position = end
-
-        # Record vertical trenches, but sorted.
-        if direction in (aoc.UP, aoc.DOWN):
-            if start.imag > end.imag:
-                start, end = end, start
-            vertical_trenches.add((start, end))
+        position += LETTER_DIRECTIONS[direction_letter] * distance
+        corners.append((int(position.real), int(position.imag)))
 
     # To close the loop, we need to end where we started.
     assert position == complex(0)
-
-    # Do vertical and horizontal line scanning.
-    # The starts and ends are the trenches ordered of
-    # when they need to be applied in a single pass.
-    starts = collections.deque(sorted(
-        (line for line in vertical_trenches),
-        key=lambda x: x[0].imag
-    ))
-    ends = collections.deque(sorted(
-        (line for line in vertical_trenches),
-        key=lambda x: x[1].imag
-    ))
-    active: list[tuple[complex, complex]] = []
-
-    start_y = starts[0][0].imag
-    count = 0.0
-    while ends:
-        # Find where the next change happens, either due to a new start or an end.
-        end_y = ends[0][1].imag
-        if starts:
-            end_y = min(end_y, starts[0][0].imag)
-        # Sort active trenches left to right then iterate in open/close pairs.
-        # The area between the trenches is a block of open pit to add.
-        active.sort(key=lambda x: x[0].real)
-        for start_line, end_line in more_itertools.chunked(active, 2):
-            start_x, end_x = start_line[0].real, end_line[0].real
-            block_size = (end_x - start_x) * (end_y - start_y)
-            count += block_size
-
-        # Update the active ranges. The end_y is where there are new starts/ends to apply.
-        # Use starts to add new active trenches and ends are used
-        # to remove trenches when we hit the bottom.
-        start_y = end_y
-        while starts and starts[0][0].imag == start_y:
-            active.append(starts.popleft())
-        while ends and ends[0][1].imag == start_y:
-            active.remove(ends.popleft())
-    # The block-area includes one edge but not the other.
-    # This makes overlapping blocks work. But requires we add on the perimeter after.
-    count += (perimeter_size // 2) + 1
-    return int(count)
+    return areas.polygon_tiles(corners)
 
 
 SAMPLE = """\
@@ -1,11 +1,12 @@
 #!/bin/python
 """Advent of Code, Day 19: Aplenty."""
 
-import math
 import operator
 import re
 import typing
 
+from lib import boxes
+
 RuleName: typing.TypeAlias = str
 Comparison: typing.TypeAlias = typing.Callable[[float, float], bool]
 CompareRule: typing.TypeAlias = tuple[str, Comparison, int, RuleName]
@@ -16,43 +17,7 @@ RULE_RE = re.compile(r"(\w+){((?:.*,)*)(\w+)}")
 TEST_RE = re.compile(r"(\w+)([><])(\d+):(\w+)")
 ITEM_RE = re.compile(r"([xmas])=(\d+)")
 OPS = {">": operator.gt, "<": operator.lt}
-
-
-def accepted_contraints(rules: RuleSet) -> list[dict[str, tuple[int, int]]]:
-    """Return a collection of constraints which lead to accepted."""
-    accepted = []
-
-    def reverse(attr, oper, val):
-        """Return the reverse of a condition.
-
-        >>> reverse(m > 5)
-        m < 6
-        """
-        if oper == operator.gt:
-            return attr, operator.lt, val + 1
-        return attr, operator.gt, val - 1
-
-    def recurse(constraints, tests):
-        """Recursively explore rules to find constraint sets which are accepted."""
-        attr, oper, val, target = tests[0]
-        if oper is None:
-            # Default rule: no constaints to add, only one brach to explore.
-            if target in rules:
-                recurse(constraints, rules[target])
-            elif target == "A":
-                accepted.append(constraints)
-        else:
-            # Comparison rule: explore both paths with additional constraints added.
-            # True path:
-            if target in rules:
-                recurse(constraints + [(attr, oper, val)], rules[target])
-            elif target == "A":
-                accepted.append(constraints + [(attr, oper, val)])
-            # False path:
-            recurse(constraints + [reverse(attr, oper, val)], tests[1:])
-
-    recurse([], rules["in"])
-    return accepted
+ATTRIBUTES = "xmas"
 
 
 def solve(data: tuple[RuleSet, list[dict[str, int]]], part: int) -> int:
@@ -80,27 +45,38 @@ def part1(data: tuple[RuleSet, list[dict[str, int]]]) -> int:
 
 
 def part2(data: tuple[RuleSet, list[dict[str, int]]]) -> int:
-    """Return the number of possible accepted items."""
+    """Return the number of possible accepted items.
+
+    Walk the rules with the box of ratings which can still reach each rule,
+    a 4D box with one axis per attribute, splitting the box on each comparison
+    to follow both branches. The accepted boxes do not overlap.
+    """
     rules, _ = data
 
-    # Map constraint sets to accepted 4D intervals.
-    all_intervals = []
-    for constraints in accepted_contraints(rules):
-        # Start with a full [1, 4000] interval then update it with each constraint.
-        intervals = {attr: [1, 4000] for attr in "xmas"}
-        for attr, oper, val in constraints:
+    def count(target: RuleName, ratings: boxes.Box) -> int:
+        """Return the number of accepted items, starting at a rule, with the remaining ratings."""
+        if target == "A":
+            return boxes.volume(ratings)
+        if target == "R":
+            return 0
+        total = 0
+        for attr, oper, val, next_target in rules[target]:
+            if oper is None:
+                # Default rule: everything left goes here.
+                return total + count(next_target, ratings)
+            axis = ATTRIBUTES.index(attr)
             if oper == operator.gt:
-                intervals[attr][0] = max(intervals[attr][0], val + 1)
+                fail, passed = boxes.split(ratings, axis, val + 1)
             else:
-                intervals[attr][1] = min(intervals[attr][1], val - 1)
-        all_intervals.append(intervals)
-
-    # Multiply the interval sizes to get the total number of combinations.
-    possibilities = 0
-    for intervals in all_intervals:
-        possibilities += math.prod(end - start + 1 for start, end in intervals.values())
-
-    return possibilities
+                passed, fail = boxes.split(ratings, axis, val)
+            if passed is not None:
+                total += count(next_target, passed)
+            if fail is None:
+                break
+            ratings = fail
+        return total
+
+    return count("in", ((1, 4000),) * len(ATTRIBUTES))
 
 
 def input_parser(data: str) -> tuple[RuleSet, list[dict[str, int]]]:
@@ -1,36 +1,41 @@
 #!/bin/python
 """Advent of Code, Day 4: Ceres Search. Word search."""
 from lib import aoc
-PARSER = aoc.CoordinatesParserC()
+PARSER = aoc.DenseGridParser()
 
 
-def solve(data: aoc.MapC, part: int) -> int:
+def solve(data: aoc.DenseGrid, part: int) -> int:
     """Count occurances of XMAS in the word search."""
+    cells, width, height = data.cells, data.width, data.height
     if part == 1:
-        return sum(
-            all(
-                (start + distance * direction) in data.coords[letter]
-                for distance, letter in enumerate("MAS", start=1)
-            )
-            for start in data.coords["X"]
-            for direction in aoc.EIGHT_DIRECTIONS
-        )
+        m, a, s = b"MAS"
+        total = 0
+        for start in data.indices("X"):
+            y, x = divmod(start, width)
+            for dx, dy, offset in data.steps8:
+                # The word is a straight line so the cells between are in bounds if the end is.
+                if (
+                    0 <= x + 3 * dx < width and 0 <= y + 3 * dy < height
+                    and cells[start + offset] == m
+                    and cells[start + 2 * offset] == a
+                    and cells[start + 3 * offset] == s
+                ):
+                    total += 1
+        return total
 
-    # Look for an X shape.
-    want = {
-        complex(-1, -1): "M",
-        complex(-1, 1): "M",
-        complex(1, 1): "S",
-        complex(1, -1): "S",
-    }
-    return sum(
-        all(
-            (start + offset * 1j ** rotation) in data.coords[letter]
-            for offset, letter in want.items()
-        )
-        for start in data.coords["A"]
-        for rotation in range(4)
-    )
+    # Look for an X shape: both diagonals through the A read MAS in either direction.
+    want = {ord("M"), ord("S")}
+    total = 0
+    for start in data.indices("A"):
+        y, x = divmod(start, width)
+        if not (0 < x < width - 1 and 0 < y < height - 1):
+            continue
+        if (
+            {cells[start - width - 1], cells[start + width + 1]} == want
+            and {cells[start - width + 1], cells[start + width - 1]} == want
+        ):
+            total += 1
+    return total
 
 
 SAMPLE = """\
@@ -1,10 +1,11 @@
 #!/bin/python
 """Advent of Code, Bridge Repair."""
 from lib import aoc
+from lib import parallel
 PARSER = aoc.parse_ints
 
 
-def solve(data: list[list[int]], part: int) -> int | str:
+def solve(data: list[list[int]], part: int, testing: bool) -> int | str:
     """Return the results of the valid equations."""
 
     def valid(result: int, numbers: list[int]) -> bool:
@@ -37,11 +38,12 @@ def solve(data: list[list[int]], part: int) -> int | str:
         #     )
         # )
 
-    return sum(
-        result
-        for result, *numbers in data
-        if valid(result, list(reversed(numbers)))
-    )
+    def calibration(equation: list[int]) -> int:
+        """Return the result of an equation if it is valid, else 0."""
+        result, *numbers = equation
+        return result if valid(result, list(reversed(numbers))) else 0
+
+    return sum(parallel.map_lines(calibration, data, testing=testing))
 
 
 SAMPLE = """190: 10 19
@@ -1,9 +1,10 @@
 #!/bin/python
 """Advent of Code, Day 11: Plutonian Pebbles."""
-import functools
 
+from lib import memo
 
-@functools.cache
+
+@memo.memoize
 def count_stone(stone: int, steps: int) -> int:
     """Count how many stones one stone turns into after steps."""
     if steps == 0:
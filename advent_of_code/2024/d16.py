@@ -1,8 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 16: Reindeer Maze."""
 
-import queue
 from lib import aoc
+from lib import search
 PARSER = aoc.CoordinatesParserC()
 
 
@@ -42,47 +42,29 @@ def solve(data: aoc.MapC, part: int) -> int:
     if False:
         return networkx_solver(open_space, start, end, part)
 
-    def score(p: complex) -> int:
+    def score(state: tuple[complex, complex]) -> int:
         """Score a position -- distance to the end. A* heuristic."""
+        p = state[0]
         return int(abs(end.real - p.real) + abs(end.imag - p.imag))
 
-    # Track the lowest cost to get to a location -- and how you get there.
-    lowest: dict[tuple[complex, complex], tuple[int, set[tuple[complex, complex]]]] = {(start, complex(1)): (0, set())}
-    # Track what paths to explore next, cheapest first.
-    todo: queue.PriorityQueue[tuple[int, int, float, float, float, float]] = queue.PriorityQueue()
-    # Start at the start facing easy -- complex(1, 0).
-    todo.put((score(start), 0, start.real, start.imag, 1, 0))
-
-    while not todo.empty():
-        # Pop the next option to explore.
-        rank, cost, pos_x, pos_y, dir_x, dir_y = todo.get()
-        pos = complex(pos_x, pos_y)
-        direction = complex(dir_x, dir_y)
-        if pos == end:
-            if part == 1:
-                return cost
-            # Part two: walk the path backwards from the end to find seats.
-            to_explore = {(end, direction)}
-            good_seats = set()
-            while to_explore:
-                p, d = to_explore.pop()
-                good_seats.add(p)
-                to_explore.update(lowest[p, d][1])
-            return len(good_seats)
-
-        # Options always include rotation and sometimes include moving forward.
-        options = [(pos, direction * 1j, cost + 1000), (pos, direction * -1j, cost + 1000)]
+    def neighbors(state: tuple[complex, complex]) -> list[tuple[tuple[complex, complex], int]]:
+        """Options always include rotation and sometimes include moving forward."""
+        pos, direction = state
+        options = [((pos, direction * 1j), 1000), ((pos, direction * -1j), 1000)]
         if (next_pos := pos + direction) in open_space:
-            options.append((next_pos, direction, cost + 1))
+            options.append(((next_pos, direction), 1))
+        return options
 
-        for next_pos, next_dir, next_cost in options:
-            if (next_pos, next_dir) not in lowest:
-                lowest[(next_pos, next_dir)] = (next_cost, {(pos, direction)})
-                rank = score(next_pos) + next_cost
-                todo.put((rank, next_cost, next_pos.real, next_pos.imag, next_dir.real, next_dir.imag))
-            elif lowest[(next_pos, next_dir)][0] == next_cost:
-                lowest[(next_pos, next_dir)][1].add((pos, direction))
-    raise RuntimeError("Did not solve.")
+    # Start at the start facing east -- complex(1, 0).
+    # Part two tracks every shortest path, to find the seats along them.
+    result = search.astar(
+        [(start, complex(1))], neighbors, lambda state: state[0] == end, score, all_paths=part == 2,
+    )
+    if result.cost is None:
+        raise RuntimeError("Did not solve.")
+    if part == 1:
+        return result.cost
+    return len({pos for pos, _ in result.on_shortest_paths()})
 
 
 SAMPLE = [
@@ -3,57 +3,96 @@
 
 import itertools
 from lib import aoc
+from lib import vm
 
 PARSER = aoc.ParseBlocks([aoc.ParseIntergers()])
 
 
-def simulate(reg: dict[str, int], instructions: list[int]) -> list[int]:
+def adv(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[0] = r[0] >> r[a]
+
+
+def bxl(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[1] = r[1] ^ r[a]
+
+
+def bst(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[1] = r[a] % 8
+
+
+def jnz(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> int | None:
+    return a if r[0] != 0 else None
+
+
+def bxc(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[1] = r[1] ^ r[2]
+
+
+def out(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    m.outputs.append(r[a] % 8)
+
+
+def bdv(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[1] = r[0] >> r[a]
+
+
+def cdv(m: vm.Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    r[2] = r[0] >> r[a]
+
+
+# Opcodes, in order. Combo operands are values or registers. jnz jumps to an absolute instruction.
+OPS = [
+    ("adv", vm.Op("v", adv)),
+    ("bxl", vm.Op("c", bxl)),
+    ("bst", vm.Op("v", bst)),
+    ("jnz", vm.Op("n", jnz)),
+    ("bxc", vm.Op("_", bxc)),
+    ("out", vm.Op("v", out)),
+    ("bdv", vm.Op("v", bdv)),
+    ("cdv", vm.Op("v", cdv)),
+]
+CPU = vm.Dialect("ABC", dict(OPS))
+
+
+def decode(instructions: list[int]) -> vm.Program:
+    """Decode the opcode, operand pairs."""
+    lines: list[list[str | int]] = []
+    for opcode, operand in zip(instructions[::2], instructions[1::2]):
+        name, op = OPS[opcode]
+        if op.args == "v" and operand >= 4:
+            # Combo operands 4-6 are registers A-C.
+            lines.append([name, "ABC"[operand - 4]])
+        elif name == "jnz":
+            # The instruction pointer counts pairs.
+            if operand % 2:
+                raise ValueError(f"Unaligned jump to {operand}")
+            lines.append([name, operand // 2])
+        else:
+            lines.append([name, operand])
+    return CPU.decode(lines)
+
+
+def simulate(reg: dict[str, int], program: vm.Program) -> list[int]:
     """Simulate a CPU."""
-    ptr = 0
-
-    def val(i):
-        if 0 <= i <= 3:
-            return i
-        return reg[{4: "A", 5: "B", 6: "C"}[i]]
-
-    out = []
-    while ptr + 1 < len(instructions):
-        instruction, op = instructions[ptr:ptr + 2]
-        ptr += 2
-        match instruction:
-            case 0:  # adv
-                reg["A"] = reg["A"] // (2 ** val(op))
-            case 1:  # bxl
-                reg["B"] = reg["B"] ^ op
-            case 2:  # bst
-                reg["B"] = val(op) % 8
-            case 3 if reg["A"] != 0:  # jnz
-                ptr = op
-            case 4:  # bxc
-                reg["B"] = reg["B"] ^ reg["C"]
-            case 5:  # out
-                out.append((val(op) % 8))
-            case 6:  # bdv
-                reg["B"] = reg["A"] // (2 ** val(op))
-            case 7:  # cdv
-                reg["C"] = reg["A"] // (2 ** val(op))
-
-    return out
+    machine = vm.Machine(program, reg)  # type: ignore
+    machine.run()
+    return machine.outputs
 
 
 def solve(data: tuple[list[int], list[int]], part: int, testing: bool) -> int | str:
     """Compute the initial A value to make a program a quine."""
     reg_vals, instructions = data
     registers = {char: reg_vals[i] for i, char in enumerate("ABC")}
+    program = decode(instructions)
     if part == 1:
-        return ",".join(str(i) for i in simulate(registers, instructions))
+        return ",".join(str(i) for i in simulate(registers, program))
 
     # Naive brute force. Doesn't work on the real input.
     if testing:
         # Speed up the tests by jumping towards the solution.
         for i in itertools.count(start=100_000):
             registers["A"] = i
-            got = simulate(registers.copy(), instructions)
+            got = simulate(registers, program)
             if got == instructions:
                 return i
 
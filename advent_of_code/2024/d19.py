@@ -1,8 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 19: Linen Layout."""
 
-import functools
 from lib import aoc
+from lib import memo
 PARSER = aoc.ParseBlocks([
     aoc.ParseMultiWords(input_type=str, separator=", "),
     aoc.parse_one_str_per_line,
@@ -15,7 +15,7 @@ def part1_fast(data: tuple[list[str], list[str]]) -> int:
     towels, patterns = data
     towels.sort(key=len)
 
-    @functools.cache
+    @memo.memoize
     def possible(pattern: str) -> bool:
         return any(
             pattern == towel or (
@@ -31,7 +31,7 @@ def solve(data: tuple[list[str], list[str]], part: int) -> int:
     """Return how many ways the patterns can be formed with the given towels."""
     towels, patterns = data
 
-    @functools.cache
+    @memo.memoize
     def possible(pattern: str) -> int:
         count = 0
         for towel in towels:
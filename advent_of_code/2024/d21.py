@@ -2,10 +2,10 @@
 """Advent of Code, Day 21: Keypad Conundrum."""
 
 import collections
-import functools
 import itertools
 
 from lib import aoc
+from lib import memo
 DIGITS_LAYOUT = """\
 789
 456
@@ -52,7 +52,7 @@ def solve(data: list[str], part: int) -> int:
             options.add(parts[1] + parts[0])
         return options
 
-    @functools.cache
+    @memo.memoize
     def explode_seq(sequence: str, indirections: int) -> int:
         """Return the minimum keypresses to enter a key sequence through a number of indirections."""
         if indirections == 0:
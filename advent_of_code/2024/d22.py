@@ -1,15 +1,37 @@
 #!/bin/python
-"""Advent of Code, Day 22: Monkey Market."""
+"""Advent of Code, Day 22: Monkey Market.
+
+Every buyer's generator is stepped at once. The secret numbers are packed
+into the lanes of one big int (see lib.lanes) so each shift, xor and mask
+below applies to all buyers in a single operation.
+"""
 import collections
+import itertools
+import operator
+
+from lib import lanes
+
 MOD = 16777216
+# x // 10 == x * DIV10 >> 27 for any x below 2^24, without dividing.
+DIV10 = 0xCCCCCD
+# Four price changes, each biased by 9 into a 5 bit field, make a 20 bit pattern.
+PATTERN_MASK = (1 << 20) - 1
 
 
-def pseudo_randon(number: int) -> int:
-    """Generate the next pseudo random number."""
-    number = (number ^ (number << 6)) % MOD   # i <<  6 == i  *   64
-    number = (number ^ (number >> 5)) % MOD   # i >>  5 == i //   32
-    number = (number ^ (number << 11)) % MOD  # i << 11 == i  * 2048
-    return number
+def pseudo_randon(secrets: int, mask: int) -> int:
+    """Generate the next pseudo random number in every lane. mask holds MOD - 1 in each lane."""
+    secrets ^= (secrets << 6) & mask   # i <<  6 == i  *   64
+    secrets ^= (secrets >> 5) & mask   # i >>  5 == i //   32
+    secrets ^= (secrets << 11) & mask  # i << 11 == i  * 2048
+    return secrets
+
+
+def encode(deltas: list[int]) -> int:
+    """Return the pattern for four price changes."""
+    pattern = 0
+    for delta in deltas:
+        pattern = pattern << 5 | (delta + 9)
+    return pattern
 
 
 def solve(data: list[int], part: int, testing: bool) -> int:
@@ -20,57 +42,54 @@ def solve(data: list[int], part: int, testing: bool) -> int:
 def part1(data: list[int], testing: bool) -> int:
     """Compute the 2000th pseudo random number."""
     del testing
-    total = 0
-    for number in data:
-        for _ in range(2000):
-            number = pseudo_randon(number)
-        total += number
-    return total
+    buyers = lanes.Lanes(len(data))
+    mask = buyers.fill(MOD - 1)
+    secrets = buyers.pack(data)
+    for _ in range(2000):
+        secrets = pseudo_randon(secrets, mask)
+    return sum(buyers.unpack(secrets))
 
 
 def part2(data: list[int], testing: bool) -> int:
     """Find the delta-pattern which maximizes returns."""
-
-    def delta_values():
-        """Generate the deltas between the last digit of 2000 prices."""
-        patterns_seen = set()
-        delta_collections = []
-        for number in data:
-            deltas = collections.deque(maxlen=4)
-            # Compute the first three deltas.
-            for _ in range(3):
-                next_num = pseudo_randon(number)
-                deltas.append((next_num % 10) - (number % 10))
-                number = next_num
-            prices_per_pattern = {}
-            # Load the next number, compute the delta. Store the price for the run of the last 5 prices.
-            for _ in range(1997):
-                next_num = pseudo_randon(number)
-                deltas.append((next_num % 10) - (number % 10))
-                number = next_num
-
-                # Create a pattern based on four deltas.
-                pattern = 0
-                for delta in deltas:
-                    pattern = pattern * 100 + delta
-
-                patterns_seen.add(pattern)
-                if pattern not in prices_per_pattern:
-                    prices_per_pattern[pattern] = number % 10
-            delta_collections.append(prices_per_pattern)
-        return delta_collections, patterns_seen
-
-    sequence_prices, patterns_seen = delta_values()
+    buyers = lanes.Lanes(len(data))
+    mask = buyers.fill(MOD - 1)
+    quotient_mask = buyers.fill((1 << 21) - 1)
+    pattern_mask = buyers.fill(PATTERN_MASK)
+    nines = buyers.fill(9)
+
+    def prices(secrets: int) -> int:
+        return secrets - ((secrets * DIV10 >> 27) & quotient_mask) * 10
+
+    # For each of 2000 prices, every buyer's pattern of the last four changes and their price,
+    # packed into one value, pattern << 4 | price.
+    secrets = buyers.pack(data)
+    price = prices(secrets)
+    pattern = 0
+    steps = []
+    for step in range(2000):
+        secrets = pseudo_randon(secrets, mask)
+        next_price = prices(secrets)
+        pattern = ((pattern << 5) & pattern_mask) | (next_price + nines - price)
+        price = next_price
+        if step >= 3:
+            steps.append(buyers.unpack((pattern << 4) | price))
+
+    # A buyer sells at the first time a pattern shows up. Building a dict from the buyer's
+    # steps in reverse leaves the first step for each pattern. Count the (pattern, price) pairs.
+    sales: collections.Counter[int] = collections.Counter()
+    shift = itertools.repeat(4)
+    for buyer_steps in zip(*steps):
+        first = dict(zip(map(operator.rshift, reversed(buyer_steps), shift), reversed(buyer_steps)))
+        sales.update(first.values())
+
+    totals: collections.Counter[int] = collections.Counter()
+    for sale, count in sales.items():
+        totals[sale >> 4] += (sale & 15) * count
 
     if testing:
-        deltas = [-2, 1, -1, 3]
-        pattern = deltas[0] * 1000000 + deltas[1] * 10000 + deltas[2] * 100 + deltas[3] * 1
-        return sum(prices.get(pattern, 0) for prices in sequence_prices)
-
-    return max(
-        sum(prices.get(pattern, 0) for prices in sequence_prices)
-        for pattern in patterns_seen
-    )
+        return totals[encode([-2, 1, -1, 3])]
+    return max(totals.values())
 
 
 SAMPLE = [
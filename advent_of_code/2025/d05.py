@@ -1,27 +1,16 @@
 #!/bin/python
 """Advent of Code, Day 5: Cafeteria."""
 
+from lib import intervals
+
 
 def solve(data: tuple[list[list[int]], list[int]], part: int) -> int:
     """Return how many fresh ingredients there are."""
-    fresh, available = data
-    fresh.sort()
+    ranges, available = data
+    fresh = intervals.IntervalSet((start, end) for start, end in ranges)
     if part == 1:
-        return sum(
-            any(x <= ingredient <= y for x, y in fresh)
-            for ingredient in available
-        )
-
-    opened, closed = fresh[0]
-    total = 0
-    for start, end in fresh[1:]:
-        if start > closed:
-            total += 1 + closed - opened
-            opened, closed = start, end
-        else:
-            closed = max(closed, end)
-    total += 1 + closed - opened
-    return total
+        return sum(ingredient in fresh for ingredient in available)
+    return fresh.size
 
 
 SAMPLE = """\
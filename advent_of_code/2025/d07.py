@@ -1,8 +1,8 @@
 #!/bin/python
 """Advent of Code, Day 7: Laboratories."""
 
-import functools
 from lib import aoc
+from lib import memo
 
 
 def solve(data: aoc.Map, part: int) -> int:
@@ -11,7 +11,7 @@ def solve(data: aoc.Map, part: int) -> int:
     splitters = data.coords["^"]
     splitters_used = set[tuple[int, int]]()
 
-    @functools.cache
+    @memo.memoize
     def timelines(x: int, y: int) -> int:
         """Return the number of timelines from a given point."""
         if y == data.height:
@@ -4,37 +4,28 @@ import heapq
 import itertools
 import math
 
+from lib import aoc
+
 
 def solve(data: list[list[int]], part: int, testing: bool) -> int:
     """Return stats from connecting junction boxes into circuits using minimum distances."""
     boxes = [tuple(i) for i in data]
-    distances: list[tuple[int, int, int]] = [(math.dist(a, b), a, b) for a, b in itertools.combinations(boxes, 2)]
+    distances = [
+        (math.dist(boxes[i], boxes[j]), i, j)
+        for i, j in itertools.combinations(range(len(boxes)), 2)
+    ]
     heapq.heapify(distances)
-    circuits = list[set[int]]()
-
-    def add_connection(new: set[int]) -> set[int]:
-        """Add a new connection to the collection of circuits. Simplified Disjoint Set Union."""
-        for a in list(circuits):
-            if a & new:
-                circuits.remove(a)
-                a |= new
-                return add_connection(a)
-        circuits.append(new)
-        return new
+    circuits = aoc.DisjointSet[int](size=len(boxes))
 
     if part == 1:
-        for _ in range(10 if testing else 1000):
-            _, i, j = heapq.heappop(distances)
-            add_connection({i, j})
-        sizes = sorted(len(i) for i in circuits)[-3:]
-        return math.prod(sizes)
+        circuits.union_many(heapq.heappop(distances)[1:] for _ in range(10 if testing else 1000))
+        return math.prod(sorted(circuits.group_sizes())[-3:])
 
-    total_boxes = len(boxes)
     while distances:
-        _, a, b = heapq.heappop(distances)
-        circuit = add_connection({a, b})
-        if len(circuit) == total_boxes:
-            return a[0] * b[0]
+        _, i, j = heapq.heappop(distances)
+        circuits.union(i, j)
+        if circuits.components == 1:
+            return boxes[i][0] * boxes[j][0]
     raise RuntimeError("Not solved")
 
 
@@ -1,12 +1,13 @@
 #!/bin/python
 """Advent of Code, Day 11: Reactor."""
-import functools
+
+from lib import memo
 
 
 def solve(data: dict[str, list[str]], part: int) -> int:
     """Return the total paths from a source to output."""
 
-    @functools.cache
+    @memo.memoize
     def paths_via(node: str, seen: int) -> int:
         """Return how many ways from node to out. Seen indicates if we saw the needed nodes."""
         if node == "out":
@@ -24,6 +24,7 @@ import inotify_simple  # type: ignore
 
 from pylib import aoc
 from pylib import helpers
+from pylib import profiling
 from pylib import site
 
 EST = zoneinfo.ZoneInfo("America/New_York")
@@ -88,8 +89,10 @@ class ChallengeRunner:
         input_file: Optional[str],
         part: tuple[int, ...],
         timeout: int,
+        profiler: Optional[profiling.Profiler] = None,
+        max_mem: Optional[int] = None,
     ) -> None:
-        """Run the challenge code, with a timeout."""
+        """Run the challenge code, with a timeout. max_mem limits the address space of the child, in bytes."""
         for mode, run in run_args.items():
             if not run:
                 continue
@@ -99,6 +102,8 @@ class ChallengeRunner:
             except SyntaxError:
                 traceback.print_exc()
                 return
+            target.profiler = profiler
+            target.max_mem = max_mem
             if target.TIMEOUT and target.TIMEOUT > timeout:
                 timeout = target.TIMEOUT
             proc = multiprocessing.Process(
@@ -391,6 +396,12 @@ def show_parsers():
 @click.option("--timeout", type=int, default=30, help="Set the timeout.")
 @click.option("--input-file", "--input", "--file", type=str, default=None, help="Alternative input file.")
 @click.option("--cookie", type=str, required=False, help="Set cookie")
+@click.option("--profile", "profile_mode", flag_value="profile", help="Profile each part with cProfile.")
+@click.option("--trace-alloc", "profile_mode", flag_value="trace-alloc", help="Trace each part's allocations with tracemalloc.")
+@click.option("--sample", "profile_mode", flag_value="sample", help="Profile each part with a sampling profiler.")
+@click.option("--profile-top", type=int, default=20, help="How many functions or allocation sites to report when profiling.")
+@click.option("--profile-sort", type=click.Choice(["tottime", "cumulative", "ncalls"]), default="tottime", help="cProfile sort order.")
+@click.option("--max-mem", type=int, default=None, help="Limit each run's address space to this many MiB.")
 @click.option("--verbose", "-v", count=True)
 def main(
     date: Optional[str],
@@ -409,6 +420,10 @@ def main(
     timeout: int,
     year: Optional[int],
     cookie: Optional[str],
+    profile_mode: Optional[str],
+    profile_top: int,
+    profile_sort: str,
+    max_mem: Optional[int],
     verbose: int,
 ) -> None:
     """Run the code in some fashion."""
@@ -432,6 +447,8 @@ def main(
     year_dir = pathlib.Path(__file__).parent / str(year)
 
     runner = Runner.build(year, day, watch, timeout)
+    profiler = profiling.Profiler(profile_mode, top=profile_top, sort=profile_sort) if profile_mode else None
+    max_mem_bytes = max_mem * 1024 * 1024 if max_mem else None
     if december:
         return runner.december(timeout)
     if waitlive:
@@ -453,7 +470,7 @@ def main(
             days = [day]
 
         for day in days:
-            ChallengeRunner(year, day).run_code(run_args, input_file, part, timeout)
+            ChallengeRunner(year, day).run_code(run_args, input_file, part, timeout, profiler, max_mem_bytes)
         return None
 
     # Set up inotify watches and run a Challenge in a loop.
@@ -467,7 +484,7 @@ def main(
             continue
         day = int(pathlib.Path(events[0].name).stem)
         print(datetime.datetime.now().strftime("%H:%M:%S"))
-        ChallengeRunner(year, day).run_code(run_args, input_file, part, timeout)
+        ChallengeRunner(year, day).run_code(run_args, input_file, part, timeout, profiler, max_mem_bytes)
         print("Done.")
         print()
     return None
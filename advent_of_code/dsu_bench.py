@@ -0,0 +1,124 @@
+#!/bin/python
+"""Benchmark DisjointSet against the set merging 2025/d08 and 2018/d25 used before it."""
+
+import heapq
+import importlib.util
+import itertools
+import math
+import pathlib
+import random
+import sys
+
+import click
+
+from lib import helpers
+
+BASE = pathlib.Path(__file__).parent
+
+
+def load_day(year: int, day: int):
+    """Import a day's module from its year directory."""
+    name = f"d{year}_{day:02}"
+    spec = importlib.util.spec_from_file_location(name, BASE / str(year) / f"d{day:02}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def merge_sets(edges: list[tuple[int, int]], total: int) -> int:
+    """Return the edge index which joins all the nodes, merging a list of sets as 2025/d08 used to."""
+    circuits = list[set[int]]()
+
+    def add_connection(new: set[int]) -> set[int]:
+        """Add a new connection to the collection of circuits."""
+        for a in list(circuits):
+            if a & new:
+                circuits.remove(a)
+                a |= new
+                return add_connection(a)
+        circuits.append(new)
+        return new
+
+    for n, (i, j) in enumerate(edges):
+        if len(add_connection({i, j})) == total:
+            return n
+    raise RuntimeError("Not joined")
+
+
+def merge_dsu(edges: list[tuple[int, int]], total: int) -> int:
+    """Return the edge index which joins all the nodes, using a DisjointSet."""
+    circuits = helpers.DisjointSet[int](size=total)
+    for n, (i, j) in enumerate(edges):
+        circuits.union(i, j)
+        if circuits.components == 1:
+            return n
+    raise RuntimeError("Not joined")
+
+
+def constellations_sets(data: list[list[int]]) -> int:
+    """Count constellations by growing one group at a time, as 2018/d25 used to."""
+    groups = 0
+    todo = set(tuple(i) for i in data)
+    while todo:
+        groups += 1
+        group = {todo.pop()}
+        prior_size = 0
+        while len(group) != prior_size:
+            prior_size = len(group)
+            candidates = iter(list(todo))
+            while True:
+                to_add = next(
+                    (
+                        i for i in candidates
+                        if any(
+                            abs(i[0] - j[0]) + abs(i[1] - j[1]) + abs(i[2] - j[2]) + abs(i[3] - j[3]) <= 3
+                            for j in group
+                        )
+                    ), None
+                )
+                if to_add is None:
+                    break
+                group.add(to_add)
+                todo.remove(to_add)
+    return groups
+
+
+def report(name: str, old: tuple[int, int], new: tuple[int, int]) -> None:
+    """Print the two timings, checking the results agree."""
+    if old[1] != new[1]:
+        print(f"{name} results disagree: {old[1]} != {new[1]}")
+    print(f"{name:18} {helpers.format_ns(old[0]):>14} {helpers.format_ns(new[0]):>14}  {old[0] / new[0]:6.2f}x")
+
+
+@click.command()
+@click.option("--boxes", type=int, default=1000, help="Junction boxes for 2025/d08.")
+@click.option("--stars", type=int, default=1200, help="Stars for 2018/d25.")
+@click.option("--seed", type=int, default=0)
+def main(boxes: int, stars: int, seed: int) -> None:
+    """Time the old set merging and DisjointSet on generated inputs of puzzle size."""
+    rng = random.Random(seed)
+    print(f"{'Workload':18} {'Sets':>14} {'DisjointSet':>14}  Speedup")
+
+    points = [tuple(rng.randrange(100_000) for _ in range(3)) for _ in range(boxes)]
+    distances = [(math.dist(points[i], points[j]), i, j) for i, j in itertools.combinations(range(boxes), 2)]
+    heapq.heapify(distances)
+    edges = [heapq.heappop(distances)[1:] for _ in range(len(distances))]
+    report(
+        "2025.08 merging",
+        helpers.timed_ns(merge_sets, edges, boxes),
+        helpers.timed_ns(merge_dsu, edges, boxes),
+    )
+
+    data = [[rng.randint(-8, 8) for _ in range(4)] for _ in range(stars)]
+    report(
+        "2018.25 solve",
+        helpers.timed_ns(constellations_sets, data),
+        helpers.timed_ns(load_day(2018, 25).solve, data=data, part=1),
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+# vim:ts=4:sw=4:expandtab
@@ -7,6 +7,7 @@ import sys
 import click
 import requests
 from lxml import etree
+from lib import profiling
 from lib import running
 
 
@@ -60,7 +61,7 @@ class Runner(running.Runner):
 
 
 @click.command()
-@click.option("--day", "-d", type=int, required=True)
+@click.option("--day", "-d", type=int, required=False)
 @click.option("--year", "-y", type=int, default=2025)
 @click.option("--check", "-c", is_flag=True)
 @click.option("--solve", "-s", is_flag=True)
@@ -68,14 +69,39 @@ class Runner(running.Runner):
 @click.option("--submit", "-x", is_flag=True)
 @click.option("--part", "-p", "parts", type=int, multiple=True, default=(1, 2))
 @click.option("--live", "-l", is_flag=True)
+@click.option("--all", "-a", "all_days", is_flag=True, help="Run all days of the year over a process pool.")
+@click.option("--jobs", "-j", type=int, default=None, help="Batch worker count. Defaults to the core count.")
+@click.option("--report", "-r", is_flag=True, help="Report the slowest parts and timing regressions.")
+@click.option("--threshold", type=float, default=1.5, help="Report parts slower than this multiple of their median.")
+@click.option("--top", type=int, default=20, help="How many of the slowest parts to report.")
+@click.option("--profile", "profile_mode", flag_value="profile", help="Profile each part with cProfile.")
+@click.option("--trace-alloc", "profile_mode", flag_value="trace-alloc", help="Trace each part's allocations with tracemalloc.")
+@click.option("--sample", "profile_mode", flag_value="sample", help="Profile each part with a sampling profiler.")
+@click.option("--profile-top", type=int, default=20, help="How many functions or allocation sites to report when profiling.")
+@click.option("--profile-sort", type=click.Choice(["tottime", "cumulative", "ncalls"]), default="tottime", help="cProfile sort order.")
+@click.option("--max-mem", type=int, default=None, help="Run each part in a child process limited to this many MiB of address space.")
 @click.option("--verbose", "-v", count=True)
-def main(day: int, year: int, check: bool, solve: bool, test: bool, submit: bool, live: bool, parts: tuple[int], verbose: int) -> None:
+def main(day: int | None, year: int, check: bool, solve: bool, test: bool, submit: bool, live: bool, parts: tuple[int], all_days: bool, jobs: int | None, report: bool, threshold: float, top: int, profile_mode: str | None, profile_top: int, profile_sort: str, max_mem: int | None, verbose: int) -> None:
+    profiler = profiling.Profiler(profile_mode, top=profile_top, sort=profile_sort) if profile_mode else None
+    max_mem_bytes = max_mem * 1024 * 1024 if max_mem else None
+    if report:
+        Runner(year=year, day=0, data=None, parts=parts, verbose=verbose).report(top, threshold)
+        return
+    if all_days:
+        if year < 2000:
+            year += 2000
+        got = Runner(year=year, day=0, data=None, parts=parts, verbose=verbose, profiler=profiler, max_mem=max_mem_bytes).run_all(check, solve, test, jobs)
+        if not got:
+            sys.exit(1)
+        return
+    if day is None:
+        raise click.UsageError("Either --day or --all is required.")
     if day > 100:
         year, day = divmod(day, 100)
     if year < 2000:
         year += 2000
     got = Runner(
-        year=year, day=day, data=None, parts=parts, verbose=verbose,
+        year=year, day=day, data=None, parts=parts, verbose=verbose, profiler=profiler, max_mem=max_mem_bytes,
     ).run(check, solve, test, submit, live)
     if not got:
         sys.exit(1)
@@ -12,6 +12,7 @@ TODO:
 
 from __future__ import annotations
 
+import collections
 import contextlib
 import dataclasses
 import functools
@@ -20,14 +21,17 @@ import logging
 import operator
 import pathlib
 import re
+import resource
 import time
-from typing import Any, Callable, Generator, Iterable, Iterator, Optional, Sequence, TypeVar
+from typing import Any, Callable, Generator, Generic, Iterable, Iterator, Optional, Sequence, TypeVar
 
 from .helpers import *
 from .ocr import *
 from .parsers import *
 from . import parsers
+from . import profiling
 from . import site
+from . import timings
 
 
 TEST_SKIP = "__DO_NOT_RUN__"
@@ -80,6 +84,45 @@ class CachedIterator(Iterator[T]):
         return result
 
 
+class WindowedIterable(Generic[T]):
+    """Lazily read an iterable by position, keeping only the last `size` items read.
+
+    For look-ahead searches which only ever look a bounded distance back, eg
+    "is there a match in the next 1000 items". Reading past the end of the
+    window pulls more items; items which fall out of the window are dropped.
+    """
+
+    def __init__(self, iterable: Iterable[T], size: int) -> None:
+        self._iter = iter(iterable)
+        self._window: collections.deque[T] = collections.deque(maxlen=size)
+        # The position of the oldest item in the window.
+        self.start = 0
+
+    def __getitem__(self, index: int) -> T:
+        window = self._window
+        while index >= self.start + len(window):
+            try:
+                val = next(self._iter)
+            except StopIteration:
+                raise IndexError(f"{index} is past the end of the iterable") from None
+            if len(window) == window.maxlen:
+                self.start += 1
+            window.append(val)
+        if index < self.start:
+            raise IndexError(f"{index} fell out of the window, which starts at {self.start}")
+        return window[index - self.start]
+
+    def items(self, start: int, stop: Optional[int] = None) -> Iterator[T]:
+        """Yield the items from position start up to stop, or until the iterable runs out."""
+        for index in itertools.count(start) if stop is None else range(start, stop):
+            try:
+                yield self[index]
+            except IndexError:
+                if index < self.start:
+                    raise
+                return
+
+
 def n_dim_directions(dims: int, diagonal=False):
     """Return all the directions of a point for an n-dimensional point."""
     if diagonal:
@@ -215,6 +258,8 @@ class Challenge:
     TESTS: list[TestCase] = []
     SUBMIT = {1: True, 2: True}
     TIMEOUT: Optional[int] = None
+    # How parsed inputs are reused across parts and tests. See parsers.ParseCache.
+    PARSE_CACHE = "copy"
 
     def __init__(self, year: int, day: int, parts_to_run: tuple[int, ...] = (1, 2)):
         self.year = year
@@ -224,6 +269,16 @@ class Challenge:
         self.funcs = {1: self.part1, 2: self.part2}
         self.parts_to_run = parts_to_run
         self.testing = False
+        self.profiler: Optional[profiling.Profiler] = None
+        self.parse_cache = parsers.ParseCache(self.PARSE_CACHE)
+        # Duration of the most recent parse, to report it apart from the solve time.
+        self.parse_ns = 0
+        # CPU time of the most recent solve, including reaped worker processes.
+        self.cpu_ns = 0
+        # Peak RSS above the RSS when the most recent run started, in bytes.
+        self.rss = 0
+        # Address space limit in bytes, applied by run(). aocrunner calls run() in a child process.
+        self.max_mem: Optional[int] = None
         self._site = None
         self._filecache: dict[pathlib.Path, str] = {}
         super().__init__()
@@ -234,6 +289,11 @@ class Challenge:
         """Return a cached Website object."""
         return site.Website(self.year, self.day)
 
+    @functools.cached_property
+    def timing_store(self) -> timings.TimingStore:
+        """Return the timing history store, next to the solutions."""
+        return timings.TimingStore(self.solutions_dir.parent / "timings.jsonl")
+
     @property
     def data_file(self) -> pathlib.Path:
         """Return the path to today's data file."""
@@ -367,24 +427,59 @@ class Challenge:
 
     def input_parser(self, puzzle_input: str) -> Any:
         """Parse input data. Block of text -> output."""
-        return get_parser(self.raw_data(None), self.INPUT_PARSER)(puzzle_input.rstrip("\n"))
+        parser = get_parser(self.raw_data(None), self.INPUT_PARSER)
+        start = time.perf_counter_ns()
+        parsed = self.parse_cache.parse(parser, puzzle_input.rstrip("\n"))
+        self.parse_ns = time.perf_counter_ns() - start
+        return parsed
 
     def run_solver(self, part: int, puzzle_input: str) -> Any:
-        """Run a solver for one part."""
+        """Run a solver for one part, under the profiler if one is set."""
+        if self.profiler is None:
+            return self._run_measured(part, puzzle_input)
+        name = f"advent_of_code.{self.year}.{self.day:02}.{part}" + (".test" if self.testing else "")
+        return self.profiler.run(name, self._run_measured, part, puzzle_input)[1]
+
+    def _run_measured(self, part: int, puzzle_input: str) -> Any:
+        """Run a solver for one part, recording how far the RSS grew."""
+        reset_peak_memory()
+        start_rss, _ = memory_usage()
+        try:
+            return self._run_solver(part, puzzle_input)
+        finally:
+            _, peak_rss = memory_usage()
+            self.rss = max(0, peak_rss - start_rss)
+
+    def describe_run(self, solve_ns: int) -> str:
+        """Return the solve time along with the CPU time, parse time and memory growth of the most recent run."""
+        return (
+            f"{format_ns(solve_ns)} (cpu {format_ns(self.cpu_ns)}, parse {format_ns(self.parse_ns)}, "
+            f"mem +{format_bytes(self.rss, pad=False)})"
+        )
+
+    def out_of_memory(self) -> str:
+        return f"OOM: exceeded the {format_bytes(self.max_mem or 0, pad=False)} memory limit"
+
+    def _run_solver(self, part: int, puzzle_input: str) -> Any:
+        """Parse the input and run a solver for one part."""
         func = {1: self.part1, 2: self.part2}
         parsed_input = self.input_parser(puzzle_input)
+        start_cpu = cpu_ns()
         try:
-            return self.solver(parsed_input, part == 1)
-        except NotImplementedError:
-            pass
-        try:
-            result = func[part](parsed_input)
-        except NotImplementedError:
-            return None
-        if isinstance(result, float):
-            print("=== WARNING!! Casting float to int. ===")
-            result = int(result)
-        return result
+            try:
+                return self.solver(parsed_input, part == 1)
+            except NotImplementedError:
+                pass
+            try:
+                result = func[part](parsed_input)
+            except NotImplementedError:
+                return None
+            if isinstance(result, float):
+                print("=== WARNING!! Casting float to int. ===")
+                result = int(result)
+            return result
+        finally:
+            self.cpu_ns = cpu_ns() - start_cpu
 
     def test(self, input_file: Optional[str] = None) -> None:
         """Run the tests."""
@@ -403,13 +498,17 @@ class Challenge:
             if len(case.inputs) <= 1:
                 print('WARNING TestCase.inputs is less than two chars.')
             start = time.perf_counter_ns()
-            got = self.run_solver(case.part, case.inputs)
+            try:
+                got = self.run_solver(case.part, case.inputs)
+            except MemoryError:
+                print(f'{self.year}/{self.day:02d} Test {i + 1}: FAILED! {self.out_of_memory()}')
+                break
             end = time.perf_counter_ns()
             if case.want != got:
                 print(f'{self.year}/{self.day:02d} Test {i + 1}: FAILED! {case.part}: want({case.want}) != got({got})')
                 break
             else:
-                print(f'{self.year}/{self.day:02d} Test {i + 1}: PASS in {format_ns(end - start)}! (part {case.part})')
+                print(f'{self.year}/{self.day:02d} Test {i + 1}: PASS in {self.describe_run(end - start - self.parse_ns)}! (part {case.part})')
         logging.info('=====')
         self.testing = False
 
@@ -420,9 +519,14 @@ class Challenge:
                 start = time.perf_counter_ns()
                 got = self.run_solver(part, self.raw_data(input_file))
                 end = time.perf_counter_ns()
-                print(f'{self.year}/{self.day:02d} Part {part}: GOT {got!r:20} {format_ns(end - start)}!')
+                solve_ns = end - start - self.parse_ns
+                if input_file is None and self.profiler is None:
+                    self.timing_store.record("advent_of_code", self.year, self.day, part, solve_ns, self.parse_ns, self.rss)
+                print(f'{self.year}/{self.day:02d} Part {part}: GOT {got!r:20} {self.describe_run(solve_ns)}!')
             except NotImplementedError:
                 print(f'Part {part}: Not implemented')
+            except MemoryError:
+                print(f'{self.year}/{self.day:02d} Part {part}: {self.out_of_memory()}')
 
     def check(self, input_file: Optional[str] = None) -> None:
         """Check the generated solutions match the contents of solutions.txt."""
@@ -439,7 +543,11 @@ class Challenge:
             return
         for part in self.parts_to_run:
             start = time.perf_counter_ns()
-            got = self.run_solver(part, self.raw_data(input_file))
+            try:
+                got = self.run_solver(part, self.raw_data(input_file))
+            except MemoryError:
+                print(f'{self.year}/{self.day:02d} Part {part}: {self.out_of_memory()}')
+                continue
             end = time.perf_counter_ns()
             if part == 2 and len(solution) == 1:
                 print("No part2 solution in solutions.txt; skipping.")
@@ -447,8 +555,11 @@ class Challenge:
             want: int | str = solution[part - 1]
             if isinstance(got, int):
                 want = int(want)
+            solve_ns = end - start - self.parse_ns
+            if input_file is None and self.profiler is None:
+                self.timing_store.record("advent_of_code", self.year, self.day, part, solve_ns, self.parse_ns, self.rss)
             if want == got:
-                print(f'{self.year}/{self.day:02d} Part {part}: PASS in {format_ns(end - start)}!')
+                print(f'{self.year}/{self.day:02d} Part {part}: PASS in {self.describe_run(solve_ns)}!')
             else:
                 print(f'{self.year}/{self.day:02d} Part {part}: want({want}) != got({got})')
 
@@ -486,6 +597,8 @@ class Challenge:
         check: bool = False,
     ):
         """Run the challenges."""
+        if self.max_mem:
+            resource.setrlimit(resource.RLIMIT_AS, (self.max_mem, self.max_mem))
         f = self.get_run_method(
             test=test,
             solve=solve,
@@ -0,0 +1,139 @@
+"""Area and sum queries over big coordinate ranges.
+
+Puzzles with coordinates in the billions rarely have more than a few hundred
+distinct coordinates. Compressing each axis down to those coordinates, plus
+the gaps between them, turns the plane into a small grid of cells where each
+cell stands for a block of tiles of known width and height.
+
+Tiles are unit squares centered on integer coordinates, as on a puzzle grid.
+Each distinct coordinate gets a cell one tile wide so points and edges on it
+are exact; the gap cells between them cover everything else.
+
+SummedArea answers rectangle sums over a grid in O(1) after one pass to build it.
+"""
+
+import bisect
+import collections.abc
+import itertools
+import operator
+
+Point = tuple[int, int]
+
+
+class Axis:
+    """Compressed coordinates along one axis.
+
+    edges: where each cell starts. Cell i covers edges[i] to edges[i + 1] - 1.
+    widths: the number of tiles in each cell.
+    """
+
+    def __init__(self, values: collections.abc.Iterable[int]):
+        self.edges = sorted({edge for value in values for edge in (value, value + 1)})
+        self.widths = [end - start for start, end in itertools.pairwise(self.edges)]
+
+    def __len__(self) -> int:
+        """Return the number of cells."""
+        return len(self.widths)
+
+    def index(self, value: int) -> int:
+        """Return the cell holding a coordinate."""
+        i = bisect.bisect_right(self.edges, value) - 1
+        if not 0 <= i < len(self.widths):
+            raise ValueError(f"{value} is outside the axis")
+        return i
+
+
+def fill_polygon(vertices: collections.abc.Sequence[Point]) -> tuple[Axis, Axis, list[bytearray]]:
+    """Rasterize a rectilinear polygon onto a compressed grid.
+
+    The vertices are tile coordinates, in order around the polygon. Returns
+    the x and y axes and rows of cells, set for cells inside the polygon or on
+    its edge. Each cell is entirely in or out.
+
+    Rows are filled by a scanline: a ray along a row crosses the vertical edges
+    which span it, and the cells between pairs of crossings are inside.
+    """
+    x_axis = Axis(x for x, _ in vertices)
+    y_axis = Axis(y for _, y in vertices)
+    rows = [bytearray(len(x_axis)) for _ in range(len(y_axis))]
+
+    edges = list(zip(vertices, itertools.chain(vertices[1:], vertices[:1])))
+    # Vertical edges as (x cell, top y, bottom y), sorted left to right.
+    vertical = sorted(
+        (x_axis.index(x1), min(y1, y2), max(y1, y2)) for (x1, y1), (x2, y2) in edges if x1 == x2
+    )
+    for y, row in zip(y_axis.edges, rows):
+        # Count an edge from its top up to but not including its bottom, so a ray through a corner
+        # crosses once where the polygon passes through and zero or two times where it turns back.
+        crossings = [x for x, top, bottom in vertical if top <= y < bottom]
+        for left, right in zip(crossings[::2], crossings[1::2]):
+            row[left:right + 1] = b"\x01" * (right - left + 1)
+
+    # The scanline misses edges which the polygon leaves by, eg a bottom edge. Draw all edges.
+    for (x1, y1), (x2, y2) in edges:
+        left, right = sorted((x_axis.index(x1), x_axis.index(x2)))
+        top, bottom = sorted((y_axis.index(y1), y_axis.index(y2)))
+        for row in rows[top:bottom + 1]:
+            row[left:right + 1] = b"\x01" * (right - left + 1)
+    return x_axis, y_axis, rows
+
+
+def polygon_tiles(vertices: collections.abc.Sequence[Point]) -> int:
+    """Return the number of tiles inside a polygon or on its edge, with the vertices in order.
+
+    This is the shoelace area plus the half of each edge tile outside the area,
+    by Pick's theorem. It needs no grid at all.
+    """
+    area = 0
+    boundary = 0
+    for (x1, y1), (x2, y2) in zip(vertices, itertools.chain(vertices[1:], vertices[:1])):
+        area += x1 * y2 - x2 * y1
+        boundary += abs(x2 - x1) + abs(y2 - y1)
+    return (abs(area) + boundary) // 2 + 1
+
+
+def distance_sums(points: collections.abc.Iterable[int], start: int, end: int) -> list[int]:
+    """Return, for each position from start to end inclusive, the sum of its distances to the points.
+
+    Walking along the positions, each step moves away from the points behind
+    and toward the points ahead, so the sum changes by the difference in counts.
+    """
+    points = sorted(points)
+    total = sum(abs(start - p) for p in points)
+    behind = bisect.bisect_right(points, start)
+    sums = [total]
+    for position in range(start + 1, end + 1):
+        total += behind - (len(points) - behind)
+        while behind < len(points) and points[behind] <= position:
+            behind += 1
+        sums.append(total)
+    return sums
+
+
+class SummedArea:
+    """A summed-area table: rectangle sums over a grid of numbers in O(1).
+
+    table[y][x] is the sum of all the values above and to the left of (x, y), exclusive.
+    """
+
+    def __init__(self, rows: collections.abc.Sequence[collections.abc.Sequence[int]]):
+        width = len(rows[0]) if rows else 0
+        self.table = [[0] * (width + 1)]
+        for row in rows:
+            self.table.append(list(map(operator.add, self.table[-1], itertools.accumulate(row, initial=0))))
+
+    def total(self, x1: int, y1: int, x2: int, y2: int) -> int:
+        """Return the sum of the cells from (x1, y1) to (x2, y2) inclusive."""
+        table = self.table
+        return table[y2 + 1][x2 + 1] - table[y1][x2 + 1] - table[y2 + 1][x1] + table[y1][x1]
+
+    def windows(self, width: int, height: int) -> list[list[int]]:
+        """Return the sums of every width by height window, by the window's top left cell.
+
+        Each row of results is a couple of element-wise list operations rather than a Python loop per window.
+        """
+        out = []
+        for top, bottom in zip(self.table, self.table[height:]):
+            columns = list(map(operator.sub, bottom, top))
+            out.append(list(map(operator.sub, columns[width:], columns)))
+        return out
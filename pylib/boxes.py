@@ -0,0 +1,164 @@
+"""Axis aligned boxes in any number of dimensions.
+
+A Box is a tuple of inclusive (start, end) Intervals, one per axis, eg a
+cuboid is ((x0, x1), (y0, y1), (z0, z1)).
+
+Overlapping boxes are handled by splitting them into disjoint boxes rather
+than tracking signed overlaps. Signed overlap lists gain an entry for every
+overlap of every earlier entry, which grows very quickly, while cutting a box
+out of another leaves at most two pieces per axis.
+"""
+
+import collections
+import collections.abc
+import math
+
+from .helpers import Interval
+from .intervals import IntervalSet
+
+Box = tuple[Interval, ...]
+
+
+def volume(box: Box) -> int:
+    """Return the number of points in a box."""
+    return math.prod(end - start + 1 for start, end in box)
+
+
+def contains(box: Box, point: collections.abc.Sequence[int]) -> bool:
+    """Return if a point is inside a box."""
+    return all(start <= p <= end for (start, end), p in zip(box, point))
+
+
+def overlaps(a: Box, b: Box) -> bool:
+    """Return if two boxes share any points."""
+    # A plain loop rather than all() as this is the hot path of BoxSet.remove().
+    for (a_start, a_end), (b_start, b_end) in zip(a, b):
+        if a_start > b_end or b_start > a_end:
+            return False
+    return True
+
+
+def intersection(a: Box, b: Box) -> Box | None:
+    """Return the box shared by two boxes, or None if they do not overlap."""
+    out = []
+    for (a_start, a_end), (b_start, b_end) in zip(a, b):
+        start, end = max(a_start, b_start), min(a_end, b_end)
+        if start > end:
+            return None
+        out.append((start, end))
+    return tuple(out)
+
+
+def split(box: Box, axis: int, at: int) -> tuple[Box | None, Box | None]:
+    """Return the parts of a box below `at` and from `at` up along an axis. An empty part is None."""
+    start, end = box[axis]
+    if at <= start:
+        return None, box
+    if at > end:
+        return box, None
+    return box[:axis] + ((start, at - 1),) + box[axis + 1:], box[:axis] + ((at, end),) + box[axis + 1:]
+
+
+def subtract(a: Box, b: Box) -> list[Box]:
+    """Return disjoint boxes covering the points of a which are not in b.
+
+    Peel off the slabs of a on either side of b one axis at a time, shrinking
+    what is left of a to b's extent on that axis.
+    """
+    overlap = intersection(a, b)
+    if overlap is None:
+        return [a]
+    pieces = []
+    rest = list(a)
+    for axis, ((start, end), (overlap_start, overlap_end)) in enumerate(zip(a, overlap)):
+        if start < overlap_start:
+            rest[axis] = (start, overlap_start - 1)
+            pieces.append(tuple(rest))
+        if end > overlap_end:
+            rest[axis] = (overlap_end + 1, end)
+            pieces.append(tuple(rest))
+        rest[axis] = (overlap_start, overlap_end)
+    return pieces
+
+
+class BoxSet:
+    """A set of points, stored as disjoint boxes."""
+
+    def __init__(self, boxes: collections.abc.Iterable[Box] = ()):
+        self.boxes: list[Box] = []
+        for box in boxes:
+            self.add(box)
+
+    def __iter__(self) -> collections.abc.Iterator[Box]:
+        return iter(self.boxes)
+
+    def __len__(self) -> int:
+        """Return the number of boxes. See volume for the number of points."""
+        return len(self.boxes)
+
+    def __contains__(self, point: collections.abc.Sequence[int]) -> bool:
+        return any(contains(box, point) for box in self.boxes)
+
+    @property
+    def volume(self) -> int:
+        """Return the number of points in the set."""
+        return sum(volume(box) for box in self.boxes)
+
+    def add(self, box: Box) -> None:
+        """Add the points of a box."""
+        self.remove(box)
+        self.boxes.append(box)
+
+    def remove(self, box: Box) -> None:
+        """Remove the points of a box, splitting the boxes it cuts into."""
+        kept = []
+        for other in self.boxes:
+            if overlaps(other, box):
+                kept.extend(subtract(other, box))
+            else:
+                kept.append(other)
+        self.boxes = kept
+
+    def intersection(self, box: Box) -> "BoxSet":
+        """Return the points of the set which are inside a box."""
+        result = BoxSet()
+        result.boxes = [overlap for other in self.boxes if (overlap := intersection(other, box)) is not None]
+        return result
+
+
+def union_volume(boxes: collections.abc.Sequence[Box]) -> int:
+    """Return the number of points in any of the boxes, which may overlap.
+
+    Sweep along the first axis. Between two consecutive box edges the same
+    boxes are crossed, so a slab's volume is its width times the volume of the
+    crossed boxes' cross sections, found the same way one axis down. Slabs
+    which cross the same boxes share one cross section count.
+    """
+    if not boxes:
+        return 0
+    if len(boxes[0]) == 1:
+        return IntervalSet(box[0] for box in boxes).size
+
+    # Sweep events: boxes start crossing at their start and stop after their end.
+    events = collections.defaultdict(list)
+    for i, box in enumerate(boxes):
+        start, end = box[0]
+        events[start].append(i)
+        events[end + 1].append(~i)
+    known: dict[frozenset[int], int] = {}
+    active: set[int] = set()
+    total = 0
+    edges = sorted(events)
+    for edge, next_edge in zip(edges, edges[1:]):
+        for i in events[edge]:
+            if i >= 0:
+                active.add(i)
+            else:
+                active.discard(~i)
+        if not active:
+            continue
+        crossed = frozenset(active)
+        if crossed not in known:
+            known[crossed] = union_volume([boxes[i][1:] for i in crossed])
+        total += (next_edge - edge) * known[crossed]
+    return total
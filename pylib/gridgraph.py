@@ -0,0 +1,144 @@
+"""Grid graph compression.
+
+Maze days spend most of their time stepping down corridors one cell at a time.
+`contract()` walks each corridor once and returns a weighted graph between the
+junctions, dead ends and points of interest, with the corridor lengths as the
+edge weights.
+
+Nodes get small int ids so a set of visited nodes fits in an int bitmask:
+node `i` is bit `1 << i`.
+"""
+
+import collections.abc
+import dataclasses
+import typing
+
+from .helpers import DenseGrid, FOUR_DIRECTIONS, MapC
+
+P = typing.TypeVar("P", complex, int)
+
+
+@dataclasses.dataclass
+class JunctionGraph(typing.Generic[P]):
+    """A weighted graph between points on a grid.
+
+    nodes: the grid position of each node id. Coordinates for a MapC, cell indices for a DenseGrid.
+    ids: the node id of each position.
+    edges: the neighboring node ids and the distance to each, by node id.
+    """
+
+    nodes: list[P]
+    ids: dict[P, int]
+    edges: list[dict[int, int]]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def mask(self, positions: collections.abc.Iterable[P]) -> int:
+        """Return the bitmask of some positions."""
+        mask = 0
+        for position in positions:
+            mask |= 1 << self.ids[position]
+        return mask
+
+    def longest_path(self, start: P, end: P) -> int | None:
+        """Return the longest path from start to end which does not revisit a node, or None if there is none.
+
+        This is an exhaustive depth first search, tracking the visited nodes as a bitmask.
+        """
+        edges = [[(n, 1 << n, distance) for n, distance in node_edges.items()] for node_edges in self.edges]
+        start_id, end_id = self.ids[start], self.ids[end]
+        extra = 0
+        # When only one node leads to the end, the path must go there once it reaches that node.
+        leading = [n for n, node_edges in enumerate(self.edges) if end_id in node_edges]
+        if len(leading) == 1:
+            end_id, extra = leading[0], self.edges[leading[0]][end_id]
+            if end_id == start_id:
+                return extra
+
+        best = -1
+        todo = [(start_id, 1 << start_id, 0)]
+        while todo:
+            node, seen, steps = todo.pop()
+            if node == end_id:
+                if steps > best:
+                    best = steps
+                continue
+            for n, bit, distance in edges[node]:
+                if not seen & bit:
+                    todo.append((n, seen | bit, steps + distance))
+        return None if best < 0 else best + extra
+
+
+def contract(
+    grid: MapC | DenseGrid,
+    passable: collections.abc.Callable[[str | int], bool],
+    points: collections.abc.Iterable[P] = (),
+    one_way: dict[str, complex] | None = None,
+    combine: collections.abc.Callable[[int, int], int] = min,
+) -> JunctionGraph[P]:
+    """Return the junction graph of a grid.
+
+    passable: whether a cell char can be walked on.
+    points: positions which must be nodes, eg keys or portals. Junctions and dead ends are always nodes.
+    one_way: chars which can only be left in one direction, eg slopes. Edges are directed.
+    combine: which distance to keep when two corridors join the same nodes. Use max for longest paths.
+    """
+    one_way = one_way or {}
+    if isinstance(grid, DenseGrid):
+        dense = grid
+        width, height = dense.width, dense.height
+        steps = [(complex(dx, dy), dx, dy, offset) for dx, dy, offset in dense.steps4]
+        open_cells = [i for i in range(len(dense)) if passable(dense[i])]
+        is_open = bytearray(len(dense))
+        for i in open_cells:
+            is_open[i] = 1
+
+        def char(position: P) -> str | int:
+            return dense[position]
+
+        def moves(position: P) -> list[tuple[P, complex]]:
+            y, x = divmod(position, width)  # type: ignore
+            return [
+                (position + offset, direction)  # type: ignore
+                for direction, dx, dy, offset in steps
+                if 0 <= x + dx < width and 0 <= y + dy < height and is_open[position + offset]  # type: ignore
+            ]
+    else:
+        chars = grid.chars
+        open_set = {position for position, value in chars.items() if passable(value)}
+        open_cells = list(open_set)
+
+        def char(position: P) -> str | int:
+            return chars[position]
+
+        def moves(position: P) -> list[tuple[P, complex]]:
+            return [(position + d, d) for d in FOUR_DIRECTIONS if position + d in open_set]  # type: ignore
+
+    adjacent = {position: moves(position) for position in open_cells}
+    nodes = [position for position in open_cells if len(adjacent[position]) != 2]
+    nodes.extend(sorted(set(points) - set(nodes), key=lambda p: (p.imag, p.real) if isinstance(p, complex) else p))
+    ids = {position: i for i, position in enumerate(nodes)}
+
+    def allowed(position: P, direction: complex) -> bool:
+        return (forced := one_way.get(char(position))) is None or forced == direction  # type: ignore
+
+    edges: list[dict[int, int]] = [{} for _ in nodes]
+    for node, start in enumerate(nodes):
+        for current, direction in adjacent[start]:
+            if not allowed(start, direction):
+                continue
+            prior, distance = start, 1
+            # Follow the corridor. Corridor cells have exactly two neighbors, one being where we came from.
+            while current not in ids:
+                nxt, direction = next(move for move in adjacent[current] if move[0] != prior)
+                if not allowed(current, direction):
+                    break
+                prior, current = current, nxt
+                distance += 1
+            else:
+                target = ids[current]
+                if target != node:
+                    known = edges[node].get(target)
+                    edges[node][target] = distance if known is None else combine(known, distance)
+    return JunctionGraph(nodes, ids, edges)
@@ -0,0 +1,209 @@
+"""MD5 hash mining.
+
+Several puzzles hash a salt with an increasing integer suffix, looking for
+digests which match some predicate. This module scans suffix ranges in
+chunks across a process pool and yields the hits in index order.
+
+Hits are cached on disk per (salt, predicate, rounds) along with how far the
+scan got, so reruns replay the cached hits and only scan past that point.
+The pool is started on first use and shared by every search in the run.
+"""
+
+import atexit
+import collections
+import collections.abc
+import concurrent.futures
+import dataclasses
+import hashlib
+import os
+import pathlib
+import re
+import time
+
+from . import helpers
+
+Hit = tuple[int, str]
+
+
+@dataclasses.dataclass(frozen=True)
+class HexPrefix:
+    """Match digests which start with a number of zeros."""
+
+    zeros: int
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_prefix", "0" * self.zeros)
+
+    def __call__(self, digest: str) -> bool:
+        return digest.startswith(self._prefix)  # type: ignore
+
+
+@dataclasses.dataclass(frozen=True)
+class HasRun:
+    """Match digests which contain a run of the same character, eg a triplet or quintuplet."""
+
+    length: int
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_pattern", re.compile(r"(.)\1{%d}" % (self.length - 1)))
+
+    def __call__(self, digest: str) -> bool:
+        return self._pattern.search(digest) is not None  # type: ignore
+
+
+def digest(salt: str, index: int, rounds: int = 0) -> str:
+    """Return the hex digest of a salt and index, stretched with additional rounds of hashing."""
+    hexdigest = hashlib.md5(f"{salt}{index}".encode()).hexdigest()
+    for _ in range(rounds):
+        hexdigest = hashlib.md5(hexdigest.encode()).hexdigest()
+    return hexdigest
+
+
+def scan(salt: str, start: int, end: int, predicate: collections.abc.Callable[[str], bool], rounds: int = 0) -> list[Hit]:
+    """Return the hits for indexes [start, end)."""
+    base = hashlib.md5(salt.encode())
+    md5 = hashlib.md5
+    hits = []
+    for i in range(start, end):
+        h = base.copy()
+        h.update(str(i).encode())
+        hexdigest = h.hexdigest()
+        for _ in range(rounds):
+            hexdigest = md5(hexdigest.encode()).hexdigest()
+        if predicate(hexdigest):
+            hits.append((i, hexdigest))
+    return hits
+
+
+def _scan_timed(*args) -> tuple[list[Hit], int]:
+    """Run scan() in a pool worker. Return the hits and the CPU time the worker spent on them."""
+    start = time.process_time_ns()
+    hits = scan(*args)
+    return hits, time.process_time_ns() - start
+
+
+def cache_dir() -> pathlib.Path:
+    """Return the directory used to cache hits."""
+    return pathlib.Path(os.getenv("XDG_CACHE_HOME", "~/.cache")).expanduser() / "aoc_hashmining"
+
+
+@dataclasses.dataclass
+class HitCache:
+    """Append-only cache of hits for one (salt, predicate, rounds).
+
+    Lines are either "hit <index> <digest>" or "scanned <index>".
+    Only hits below the last scanned index are trusted.
+    """
+
+    path: pathlib.Path
+
+    @classmethod
+    def for_search(cls, salt: str, predicate: collections.abc.Callable[[str], bool], rounds: int) -> "HitCache":
+        key = hashlib.sha256(f"{salt!r} {predicate!r} {rounds}".encode()).hexdigest()[:32]
+        return cls(cache_dir() / f"{key}.txt")
+
+    def load(self) -> tuple[list[Hit], int]:
+        """Return the cached hits and the index up to which the cache is complete."""
+        if not self.path.exists():
+            return [], 0
+        hits = []
+        scanned = 0
+        for line in self.path.read_text().splitlines():
+            kind, *values = line.split()
+            if kind == "scanned" and values:
+                scanned = max(scanned, int(values[0]))
+            elif kind == "hit" and len(values) == 2:
+                hits.append((int(values[0]), values[1]))
+        return sorted(hit for hit in set(hits) if hit[0] < scanned), scanned
+
+    def append(self, hits: list[Hit], scanned: int) -> None:
+        """Record hits and how far the scan got."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"hit {index} {hexdigest}" for index, hexdigest in hits]
+        lines.append(f"scanned {scanned}")
+        with self.path.open("a") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+_executor: concurrent.futures.ProcessPoolExecutor | None = None
+_executor_size = 0
+
+
+def executor(processes: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared process pool, started on first use."""
+    global _executor, _executor_size
+    if _executor is None or _executor_size != processes:
+        shutdown()
+        _executor = concurrent.futures.ProcessPoolExecutor(max_workers=processes)
+        _executor_size = processes
+    return _executor
+
+
+@atexit.register
+def shutdown() -> None:
+    """Stop the shared process pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def mine(
+    salt: str,
+    predicate: collections.abc.Callable[[str], bool],
+    rounds: int = 0,
+    chunk_size: int = 50_000,
+    processes: int | None = None,
+    cache: bool = True,
+    testing: bool = False,
+) -> collections.abc.Iterator[Hit]:
+    """Yield (index, digest) hits in index order, without end.
+
+    Chunks of indexes are scanned in parallel. The predicate must be picklable,
+    ie a module level function or one of the predicate classes here.
+    testing: scan in this process without the disk cache, so tests start
+        quickly and do not depend on or leave behind any state.
+    """
+    if testing:
+        # Small chunks so the scan stops close to the hits the test needs.
+        processes, cache, chunk_size = 1, False, min(chunk_size, 5_000)
+    processes = processes or os.cpu_count() or 1
+    if rounds:
+        # Stretched hashes are much slower; keep chunks to a similar wall time.
+        chunk_size = max(1, chunk_size // (rounds + 1) * 4)
+
+    hit_cache = HitCache.for_search(salt, predicate, rounds) if cache else None
+    start = 0
+    if hit_cache:
+        hits, start = hit_cache.load()
+        yield from hits
+
+    def record(hits: list[Hit], end: int) -> list[Hit]:
+        if hit_cache:
+            hit_cache.append(hits, end)
+        return hits
+
+    if processes == 1:
+        while True:
+            end = start + chunk_size
+            yield from record(scan(salt, start, end, predicate, rounds), end)
+            start = end
+
+    pool = executor(processes)
+    pending: collections.deque[tuple[int, concurrent.futures.Future[tuple[list[Hit], int]]]] = collections.deque()
+    try:
+        while True:
+            # Keep twice as many chunks in flight as there are workers so none go idle.
+            while len(pending) < processes * 2:
+                end = start + chunk_size
+                pending.append((end, pool.submit(_scan_timed, salt, start, end, predicate, rounds)))
+                start = end
+            end, future = pending.popleft()
+            # The pool outlives the part, so its workers are not reaped in time to show up in cpu_ns().
+            hits, worker_ns = future.result()
+            helpers.add_worker_cpu_ns(worker_ns)
+            yield from record(hits, end)
+    finally:
+        # Leave the pool running for the next search.
+        for _, future in pending:
+            future.cancel()
@@ -1,5 +1,6 @@
 """Helper code."""
 
+import array
 import collections
 import collections.abc
 import dataclasses
@@ -9,8 +10,10 @@ import logging
 import math
 import operator
 import os
+import pathlib
 import re
 import resource
+import sys
 import time
 import typing
 
@@ -73,7 +76,8 @@ OPERATORS = {
     "/": operator.floordiv,
 }
 Interval = tuple[int, int]
-DisjointSet = dict[T, tuple[T, int]]
+# Parent and size by item, for the dsu_* functions. See DisjointSet for a faster class.
+DisjointSetDict = dict[T, tuple[T, int]]
 
 
 def rotate_clockwise(x: int, y: int) -> tuple[int, int]:
@@ -151,6 +155,70 @@ def setup_resources() -> None:
         pass
 
 
+def memory_usage() -> tuple[int, int]:
+    """Return the current and peak resident set size of this process, in bytes.
+
+    Reads /proc on Linux. Elsewhere, both values are the lifetime peak from getrusage.
+    """
+    try:
+        status = pathlib.Path("/proc/self/status").read_text()
+        values = dict(re.findall(r"^(VmRSS|VmHWM):\s+(\d+) kB", status, re.MULTILINE))
+        return int(values["VmRSS"]) * 1024, int(values["VmHWM"]) * 1024
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and KiB elsewhere.
+        peak *= 1 if sys.platform == "darwin" else 1024
+        return peak, peak
+
+
+def reset_peak_memory() -> bool:
+    """Reset the peak RSS to the current RSS, where supported (Linux 4.0+). Return if it was reset."""
+    try:
+        pathlib.Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+# CPU time reported by long-lived workers, which are only reaped at exit.
+_worker_cpu_ns = 0
+
+
+def add_worker_cpu_ns(ns: int) -> None:
+    """Count CPU time a long-lived worker process spent on this process's behalf.
+
+    The CPU time of children only shows up in cpu_ns() once they are reaped, so
+    a pool kept for the whole run reports each task's CPU time back instead.
+    """
+    global _worker_cpu_ns
+    _worker_cpu_ns += ns
+
+
+def cpu_ns() -> int:
+    """Return the CPU time used by this process, its reaped children and reporting workers, in nanoseconds.
+
+    Compared to the wall time, this shows how much work ran in parallel, eg in worker processes.
+    """
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return int(total * 1e9) + _worker_cpu_ns
+
+
+def format_bytes(size: float, pad: bool = True) -> str:
+    """Convert a byte count into human units, padded to a fixed width unless pad is False."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "TiB"
+    if not pad:
+        return f"{size:.2f} {unit}"
+    return f"{size:>7.2f} {unit:>3}"
+
+
 def format_ns(ns: float) -> str:
     """Convert nanosecond duration into human time."""
     units = [("ns", 1000), ("µs", 1000), ("ms", 1000), ("s", 60), ("mn", 60)]
@@ -163,14 +231,20 @@ def format_ns(ns: float) -> str:
     return f"{ns:>7.3f} {unit:>2}"
 
 
-def timed(func: collections.abc.Callable[..., T], *args, **kwargs) -> tuple[str, T]:
-    """Run a function. Return how long it took along with the result."""
+def timed_ns(func: collections.abc.Callable[..., T], *args, **kwargs) -> tuple[int, T]:
+    """Run a function. Return how many nanoseconds it took along with the result."""
     params = inspect.signature(func).parameters
     kwargs = {k: v for k, v in kwargs.items() if k in params}
     start = time.perf_counter_ns()
     got = func(*args, **kwargs)
     end = time.perf_counter_ns()
-    return format_ns(end - start), got
+    return end - start, got
+
+
+def timed(func: collections.abc.Callable[..., T], *args, **kwargs) -> tuple[str, T]:
+    """Run a function. Return how long it took along with the result."""
+    duration, got = timed_ns(func, *args, **kwargs)
+    return format_ns(duration), got
 
 
 def neighbors(point: complex, directions: collections.abc.Sequence[complex] = STRAIGHT_NEIGHBORS) -> collections.abc.Iterable[complex]:
@@ -323,6 +397,165 @@ class Map:
         return {n: self.chars[n] for n in neighbors_t(*point, directions) if n in self.all_coords}
 
 
+@dataclasses.dataclass
+class DenseGrid:
+    """A rectangular grid held in one flat bytearray, row by row.
+
+    Cells are addressed by an int index, `y * width + x`, so lookups are list
+    indexing rather than hashing a coordinate. Char grids store the char codes.
+    Digit grids store the digit values.
+
+    Steps are (dx, dy, offset) where the offset is added to an index. Use
+    `in_bounds()` on the target x, y or `neighbors()` to stay on the grid.
+    """
+
+    width: int
+    height: int
+    cells: bytearray
+    digits: bool = False
+
+    def __post_init__(self) -> None:
+        if len(self.cells) != self.width * self.height:
+            raise ValueError(f"Expected {self.width * self.height} cells, got {len(self.cells)}")
+        # Same order as FOUR_DIRECTIONS and EIGHT_DIRECTIONS.
+        deltas = [(0, -1), (0, 1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, -1), (-1, 1)]
+        steps = [(dx, dy, dy * self.width + dx) for dx, dy in deltas]
+        self.steps4 = steps[:4]
+        self.steps8 = steps
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "DenseGrid":
+        """Return a grid from lines of equal length."""
+        width = len(lines[0])
+        if any(len(line) != width for line in lines):
+            raise ValueError("The lines are not all the same length.")
+        text = "".join(lines)
+        if text.isdigit():
+            return cls(width, len(lines), bytearray(int(i) for i in text), digits=True)
+        return cls(width, len(lines), bytearray(text.encode()))
+
+    @classmethod
+    def from_mapc(cls, data: MapC, fill: str | int | None = None) -> "DenseGrid":
+        """Return a grid from a MapC. Cells missing from the MapC, eg ignored chars, are set to `fill`."""
+        digits = all(isinstance(i, int) for i in data.chars.values())
+        width, height = data.max_x + 1, data.max_y + 1
+        if fill is None:
+            fill = 0 if digits else " "
+        grid = cls(width, height, bytearray(width * height), digits)
+        grid.cells[:] = bytes([grid.value(fill)]) * len(grid)
+        for coord, char in data.chars.items():
+            grid.cells[int(coord.imag) * width + int(coord.real)] = grid.value(char)
+        return grid
+
+    def to_mapc(self, chars: collections.abc.Iterable[str] | None = None, ignore: str | None = None) -> MapC:
+        """Return a MapC, as CoordinatesParserC would with the same chars and ignore options."""
+        want = {self.value(i) for i in chars} if chars else set(self.cells)
+        if ignore:
+            want -= {self.value(i) for i in ignore}
+        coords_by_char = collections.defaultdict(set)
+        char_by_coord = {}
+        for i, value in enumerate(self.cells):
+            if value not in want:
+                continue
+            pos = self.coord(i)
+            char = value if self.digits else chr(value)
+            coords_by_char[char].add(pos)
+            char_by_coord[pos] = char
+        blank_char = max(coords_by_char, key=lambda x: len(coords_by_char[x]))
+        return MapC(
+            max_x=self.width - 1,
+            max_y=self.height - 1,
+            chars=char_by_coord,
+            coords=dict(coords_by_char),
+            all_coords=set(char_by_coord),
+            blank_char=str(blank_char),
+            non_blank_chars={str(i) for i in coords_by_char if i != blank_char},
+        )
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, key: int | complex) -> str | int:
+        value = self.cells[self.index_of(key) if isinstance(key, complex) else key]
+        return value if self.digits else chr(value)
+
+    def __setitem__(self, key: int | complex, char: str | int) -> None:
+        self.cells[self.index_of(key) if isinstance(key, complex) else key] = self.value(char)
+
+    def __contains__(self, item) -> bool:
+        if not isinstance(item, complex):
+            raise TypeError(f"contains not defined for {type(item)}")
+        return self.in_bounds(int(item.real), int(item.imag))
+
+    def value(self, char: str | int) -> int:
+        """Return the stored value of a char."""
+        return int(char) if self.digits else ord(char)  # type: ignore
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def index_of(self, coord: complex) -> int:
+        return int(coord.imag) * self.width + int(coord.real)
+
+    def point(self, i: int) -> tuple[int, int]:
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def coord(self, i: int) -> complex:
+        y, x = divmod(i, self.width)
+        return complex(x, y)
+
+    def neighbors(self, i: int, diagonals: bool = False) -> list[int]:
+        """Return the indices of the neighboring cells which are on the grid."""
+        y, x = divmod(i, self.width)
+        return [
+            i + offset
+            for dx, dy, offset in (self.steps8 if diagonals else self.steps4)
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+        ]
+
+    def find(self, char: str | int, start: int = 0) -> int:
+        """Return the index of the first cell holding char at or after start, or -1."""
+        return self.cells.find(self.value(char), start)
+
+    def indices(self, char: str | int) -> list[int]:
+        """Return the indices of all the cells holding char."""
+        value, cells = self.value(char), self.cells
+        found = []
+        i = cells.find(value)
+        while i != -1:
+            found.append(i)
+            i = cells.find(value, i + 1)
+        return found
+
+    def count(self, char: str | int) -> int:
+        return self.cells.count(self.value(char))
+
+    def mask(self, chars: collections.abc.Iterable[str | int]) -> bytearray:
+        """Return a per-cell mask which is 1 where the cell holds any of the chars."""
+        table = bytearray(256)
+        for char in chars:
+            table[self.value(char)] = 1
+        return self.cells.translate(table)
+
+    def row(self, y: int) -> memoryview:
+        """Return a view of one row."""
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def copy(self) -> "DenseGrid":
+        return DenseGrid(self.width, self.height, bytearray(self.cells), self.digits)
+
+    def render(self) -> str:
+        """Render the grid as a string."""
+        rows = (self.cells[y * self.width:(y + 1) * self.width] for y in range(self.height))
+        if self.digits:
+            return "\n".join("".join(str(i) for i in row) for row in rows)
+        return "\n".join(row.decode() for row in rows)
+
+
 def render_char_map(chars: dict[complex, str], height: int, width: int) -> str:
     """Render the map as a string."""
     lines = []
@@ -348,7 +581,111 @@ def binary_search(low: int, high: int, predicate: collections.abc.Callable[[int]
     return high
 
 
-def dsu_make_set(d: DisjointSet, item: T) -> None:
+class DisjointSet(typing.Generic[T]):
+    """Disjoint-set union (union-find) with path compression and union by size.
+
+    Parents and sizes are kept in arrays indexed by int ids. Items are given
+    ids as they are first seen. With `size` set, the items are the ints
+    0..size-1 and are used as the ids directly.
+
+    https://en.wikipedia.org/wiki/Disjoint-set_data_structure
+    """
+
+    def __init__(self, items: collections.abc.Iterable[T] = (), size: int = 0) -> None:
+        self.parent = array.array("q", range(size))
+        self.sizes = array.array("q", [1]) * size
+        self.ids: dict[T, int] | None = None if size else {}
+        self.items: list[T] = []
+        # The number of disjoint sets.
+        self.components = size
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def __contains__(self, item: T) -> bool:
+        if self.ids is None:
+            return 0 <= item < len(self.parent)  # type: ignore
+        return item in self.ids
+
+    def add(self, item: T) -> int:
+        """Add an item as its own set, if it is new. Return its id."""
+        if self.ids is None:
+            if not 0 <= item < len(self.parent):  # type: ignore
+                raise ValueError(f"{item} is out of range for an int DisjointSet of size {len(self.parent)}")
+            return item  # type: ignore
+        if (i := self.ids.get(item)) is None:
+            i = self.ids[item] = len(self.parent)
+            self.parent.append(i)
+            self.sizes.append(1)
+            self.items.append(item)
+            self.components += 1
+        return i
+
+    def _root(self, i: int) -> int:
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point everything on the path directly at the root.
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def _item(self, i: int) -> T:
+        return i if self.ids is None else self.items[i]  # type: ignore
+
+    def find(self, item: T) -> T:
+        """Return the representative item of the set holding item."""
+        return self._item(self._root(self.add(item)))
+
+    def _link(self, a: int, b: int) -> int:
+        """Merge two roots, attaching the smaller set to the larger. Return the new root."""
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.sizes[a] += self.sizes[b]
+        self.components -= 1
+        return a
+
+    def union(self, x: T, y: T) -> T:
+        """Merge the sets holding x and y. Return the representative item of the merged set."""
+        a = self._root(self.add(x))
+        b = self._root(self.add(y))
+        return self._item(a if a == b else self._link(a, b))
+
+    def union_many(self, pairs: collections.abc.Iterable[tuple[T, T]]) -> int:
+        """Merge the sets of each pair. Return how many pairs joined two different sets."""
+        merged = 0
+        for x, y in pairs:
+            a = self._root(self.add(x))
+            b = self._root(self.add(y))
+            if a != b:
+                self._link(a, b)
+                merged += 1
+        return merged
+
+    def connected(self, x: T, y: T) -> bool:
+        return self._root(self.add(x)) == self._root(self.add(y))
+
+    def size(self, item: T) -> int:
+        """Return the size of the set holding item."""
+        return self.sizes[self._root(self.add(item))]
+
+    def groups(self) -> list[set[T]]:
+        """Return the disjoint sets."""
+        grouped = collections.defaultdict(set)
+        for i in range(len(self.parent)):
+            grouped[self._root(i)].add(self._item(i))
+        return list(grouped.values())
+
+    def group_sizes(self) -> list[int]:
+        """Return the size of each disjoint set."""
+        return [self.sizes[i] for i in range(len(self.parent)) if self.parent[i] == i]
+
+
+def dsu_make_set(d: DisjointSetDict, item: T) -> None:
     """Disjoint Set MakeSet.
 
     https://en.wikipedia.org/wiki/Disjoint-set_data_structure
@@ -359,19 +696,20 @@ def dsu_make_set(d: DisjointSet, item: T) -> None:
     d[item] = (item, 1)
 
 
-def dsu_find(d: DisjointSet, item: T) -> T:
-    """Disjoint Set Find.
+def dsu_find(d: DisjointSetDict, item: T) -> T:
+    """Disjoint Set Find, with path compression.
 
     https://en.wikipedia.org/wiki/Disjoint-set_data_structure
     """
-    if d[item][0] == item:
-        return item
-    parent = dsu_find(d, d[item][0])
-    d[item] == (parent, -1)
-    return parent
+    root = item
+    while d[root][0] != root:
+        root = d[root][0]
+    while item != root:
+        d[item], item = (root, -1), d[item][0]
+    return root
 
 
-def dsu_union(d: DisjointSet, x: T, y: T) -> T:
+def dsu_union(d: DisjointSetDict, x: T, y: T) -> T:
     """Disjoint Set Union. Return the root.
 
     https://en.wikipedia.org/wiki/Disjoint-set_data_structure
@@ -387,7 +725,7 @@ def dsu_union(d: DisjointSet, x: T, y: T) -> T:
     return x
 
 
-def dsu_add_pair(d: DisjointSet, x: T, y: T) -> T:
+def dsu_add_pair(d: DisjointSetDict, x: T, y: T) -> T:
     """Disjoint Set MakeSet + MakeSet + Union helper."""
     dsu_make_set(d, x)
     dsu_make_set(d, y)
@@ -406,11 +744,14 @@ def add_to_disjoint_sets(sets: list[set[T]], new: set[T]) -> set[T]:
 
 
 def merge_disjoint_sets(sets: list[set[T]]) -> list[set[T]]:
-    """Merge disjoint sets."""
-    finalized = list[set[T]]()
-    for i in sets:
-        add_to_disjoint_sets(finalized, i)
-    return finalized
+    """Merge overlapping sets."""
+    dsu = DisjointSet[T]()
+    for group in sets:
+        items = list(group)
+        for item in items:
+            dsu.add(item)
+        dsu.union_many(zip(items, items[1:]))
+    return dsu.groups()
 
 
 def run_solution(data, parts = None) -> None:
@@ -0,0 +1,190 @@
+"""Sets of integers stored as ranges.
+
+Range puzzles hand out a few hundred ranges covering billions of integers.
+An IntervalSet stores them as sorted, non-overlapping, inclusive (start, end)
+intervals, the same Interval tuples as aoc.interval_overlap(), so the cost of
+every operation depends on the number of ranges and not their size.
+
+Adjacent ranges are merged, eg (1, 3) and (4, 6) are stored as (1, 6).
+Sets are not changed in place; operations return new sets.
+"""
+
+import bisect
+import collections.abc
+import heapq
+
+from .helpers import Interval
+
+
+class IntervalSet:
+    """A set of integers, stored as sorted inclusive intervals."""
+
+    def __init__(self, intervals: collections.abc.Iterable[Interval] = ()):
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._extend(sorted(intervals))
+
+    @classmethod
+    def _from_sorted(cls, intervals: collections.abc.Iterable[Interval]) -> "IntervalSet":
+        """Return a set from intervals sorted by start, skipping the sort."""
+        result = cls()
+        result._extend(intervals)
+        return result
+
+    def _extend(self, intervals: collections.abc.Iterable[Interval]) -> None:
+        """Add intervals which are sorted by start and do not start before the last interval, merging overlaps."""
+        starts, ends = self._starts, self._ends
+        for start, end in intervals:
+            if start > end:
+                continue
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    def __iter__(self) -> collections.abc.Iterator[Interval]:
+        return zip(self._starts, self._ends)
+
+    def __len__(self) -> int:
+        """Return the number of intervals. See size for the number of integers."""
+        return len(self._starts)
+
+    def __contains__(self, value: int) -> bool:
+        """Return if a value is in the set, with a binary search."""
+        i = bisect.bisect_right(self._starts, value) - 1
+        return i >= 0 and value <= self._ends[i]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    @property
+    def size(self) -> int:
+        """Return the number of integers in the set."""
+        return sum(self._ends) - sum(self._starts) + len(self._starts)
+
+    @property
+    def start(self) -> int:
+        """Return the lowest value."""
+        if not self._starts:
+            raise ValueError("The set is empty.")
+        return self._starts[0]
+
+    @property
+    def end(self) -> int:
+        """Return the highest value."""
+        if not self._ends:
+            raise ValueError("The set is empty.")
+        return self._ends[-1]
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        """Return the values in either set."""
+        return self._from_sorted(heapq.merge(self, other))
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """Return the values in both sets."""
+        out = []
+        a, b = list(self), list(other)
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start, end = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+            if start <= end:
+                out.append((start, end))
+            # Drop whichever interval ends first. The other may overlap the next one.
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return self._from_sorted(out)
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        """Return the values in this set which are not in the other."""
+        out = []
+        b = list(other)
+        j = 0
+        for start, end in self:
+            # Skip the intervals which end before this one starts.
+            while j < len(b) and b[j][1] < start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] <= end:
+                if b[k][0] > start:
+                    out.append((start, b[k][0] - 1))
+                start = max(start, b[k][1] + 1)
+                k += 1
+            if start <= end:
+                out.append((start, end))
+        return self._from_sorted(out)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def shift(self, offset: int) -> "IntervalSet":
+        """Return the set with every value moved by offset."""
+        result = IntervalSet()
+        result._starts = [start + offset for start in self._starts]
+        result._ends = [end + offset for end in self._ends]
+        return result
+
+    def split(self, at: int) -> tuple["IntervalSet", "IntervalSet"]:
+        """Return the values below `at` and the values from `at` up."""
+        intervals = list(self)
+        i = bisect.bisect_left(self._ends, at)
+        below, above = intervals[:i], intervals[i:]
+        if above and above[0][0] < at:
+            start, end = above[0]
+            below.append((start, at - 1))
+            above[0] = (at, end)
+        return self._from_sorted(below), self._from_sorted(above)
+
+
+class IntervalMap:
+    """A piecewise linear map: values in each (start, end) interval move by an offset. Others are unchanged."""
+
+    def __init__(self, rules: collections.abc.Iterable[tuple[int, int, int]]):
+        """Set up the map from (start, end, offset) rules, which must not overlap."""
+        self.rules = sorted(rules)
+        self._starts = [start for start, _, _ in self.rules]
+        for (_, end, _), (start, _, _) in zip(self.rules, self.rules[1:]):
+            if start <= end:
+                raise ValueError(f"Rules overlap at {start}")
+
+    def __call__(self, value: int) -> int:
+        """Return where a single value maps to."""
+        i = bisect.bisect_right(self._starts, value) - 1
+        if i >= 0 and value <= self.rules[i][1]:
+            return value + self.rules[i][2]
+        return value
+
+    def apply(self, values: IntervalSet) -> IntervalSet:
+        """Return where all the values map to, splitting intervals which span several rules.
+
+        Both the intervals and the rules are sorted, so this walks them together.
+        """
+        rules = self.rules
+        out = []
+        i = 0
+        for start, end in values:
+            # Skip the rules which end before this interval. The last rule used may still cover the next interval.
+            while i < len(rules) and rules[i][1] < start:
+                i += 1
+            j = i
+            while j < len(rules) and rules[j][0] <= end:
+                rule_start, rule_end, offset = rules[j]
+                if start < rule_start:
+                    out.append((start, rule_start - 1))
+                    start = rule_start
+                stop = min(end, rule_end)
+                out.append((start + offset, stop + offset))
+                start = stop + 1
+                j += 1
+            if start <= end:
+                out.append((start, end))
+        return IntervalSet(out)
@@ -0,0 +1,61 @@
+"""Many small integers packed into one Python int, stepped in lockstep.
+
+Python ints have no size limit and their bitwise operators, shifts, adds and
+multiplies by small numbers run in C across the whole number. With one value
+in each 64 bit lane of a big int, a single operation steps every value at
+once, eg every buyer's random number generator. This is SIMD within a
+register (SWAR), at Python speed per operation rather than per value.
+
+Values must stay inside their lane:
+- left shifts and products need headroom below 64 bits, or a mask after;
+- right shifts pull the low bits of the next lane in at the top, so mask them off;
+- subtracting lane by lane needs every lane of the result to be non-negative.
+
+Packed ints are converted to and from bytes little endian on every host,
+byteswapping the native arrays on big endian ones, so lane 0 is the lowest and
+byte i * 8 of packed.to_bytes(..., "little") is the lowest byte of lane i.
+"""
+
+import array
+import collections.abc
+import sys
+
+WIDTH = 64
+ALL_BITS = (1 << WIDTH) - 1
+
+
+class Lanes:
+    """Packs and unpacks a fixed number of 64 bit lanes. Lane 0 is the lowest."""
+
+    def __init__(self, count: int):
+        self.count = count
+        # A 1 in the bottom bit of every lane.
+        self.ones = self.pack([1] * count)
+        self._below_top = self.fill(ALL_BITS >> 1)
+
+    def fill(self, value: int) -> int:
+        """Return the same value in every lane, eg a mask."""
+        return self.ones * value
+
+    def pack(self, values: collections.abc.Iterable[int]) -> int:
+        """Return the values packed into lanes."""
+        native = array.array("Q", values)
+        if sys.byteorder != "little":
+            native.byteswap()
+        return int.from_bytes(native.tobytes(), "little")
+
+    def unpack(self, packed: int) -> memoryview:
+        """Return the lane values. Index it or iterate over it like a list."""
+        raw = packed.to_bytes(self.count * WIDTH // 8, "little")
+        if sys.byteorder == "little":
+            return memoryview(raw).cast("Q")
+        native = array.array("Q", raw)
+        native.byteswap()
+        return memoryview(native)
+
+    def count_nonzero(self, packed: int) -> int:
+        """Return how many lanes are not zero. Lane values must be below 2^63.
+
+        Adding 2^63 - 1 sets a lane's top bit exactly when the lane is not zero.
+        """
+        return (((packed + self._below_top) >> (WIDTH - 1)) & self.ones).bit_count()
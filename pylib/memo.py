@@ -0,0 +1,149 @@
+"""Memoization which can be measured and cleared between runs.
+
+functools.cache never forgets, so a module level cache carries entries from
+the test inputs into the real input and grows for as long as the process
+runs. Functions decorated with memoize are registered here so the runners
+can report how well each cache did on a part and clear them all when the
+input changes. Part 2 keeps what part 1 cached on the same input.
+
+    @memo.memoize
+    def count(stone: int, steps: int) -> int: ...
+
+    @memo.memoize(key=lambda node, seen, twice: (node, seen, twice is None))
+    def paths(node: str, seen: int, twice: str | None) -> int: ...
+
+Without a key, the cache is a functools.cache. With a key, the result is
+cached under key(*args), eg to drop an argument which no longer changes
+the result so more calls share an entry.
+"""
+
+import collections.abc
+import contextlib
+import dataclasses
+import functools
+import typing
+import weakref
+
+T = typing.TypeVar("T")
+Func = typing.Callable[..., T]
+
+# Every live memoized function, for clearing.
+_registered: "weakref.WeakSet[typing.Callable]" = weakref.WeakSet()
+# Memoized functions made during measure(), eg closures inside solve(), held so they can be
+# reported once solve() has returned and dropped them. None outside measure().
+_pinned: list[typing.Callable] | None = None
+# The hits and misses of each cache as of the last stats() or clear(), so stats() reports one part.
+_reported: "weakref.WeakKeyDictionary[typing.Callable, tuple[int, int]]" = weakref.WeakKeyDictionary()
+
+
+@dataclasses.dataclass(frozen=True)
+class Stats:
+    """How one cache did."""
+
+    name: str
+    hits: int
+    misses: int
+    size: int
+
+    def describe(self) -> str:
+        return f"{self.name} {self.hits} hits/{self.misses} misses/{self.size} cached"
+
+
+def _keyed_cache(func: Func, key: typing.Callable[..., typing.Hashable]) -> Func:
+    """Return a func which caches results under key(*args).
+
+    The wrapper has the cache_info() and cache_clear() of a functools.cache.
+    """
+    cache: dict[typing.Hashable, typing.Any] = {}
+    hits = misses = 0
+
+    def wrapper(*args, **kwargs):
+        nonlocal hits, misses
+        k = key(*args, **kwargs)
+        try:
+            result = cache[k]
+        except KeyError:
+            pass
+        else:
+            hits += 1
+            return result
+        misses += 1
+        result = cache[k] = func(*args, **kwargs)
+        return result
+
+    def cache_info() -> functools._CacheInfo:
+        return functools._CacheInfo(hits, misses, None, len(cache))
+
+    def cache_clear() -> None:
+        nonlocal hits, misses
+        cache.clear()
+        hits = misses = 0
+
+    functools.update_wrapper(wrapper, func)
+    wrapper.cache_info = cache_info  # type: ignore
+    wrapper.cache_clear = cache_clear  # type: ignore
+    return wrapper
+
+
+def _register(func: Func, key: typing.Callable[..., typing.Hashable] | None) -> Func:
+    """Wrap a function in a cache and register it.
+
+    This returns the cache itself rather than a wrapper around it, so a recursive
+    call costs no more than with functools.cache.
+    """
+    cached = functools.cache(func) if key is None else _keyed_cache(func, key)
+    _registered.add(cached)
+    if _pinned is not None:
+        _pinned.append(cached)
+    return cached
+
+
+@typing.overload
+def memoize(func: Func) -> Func: ...
+@typing.overload
+def memoize(*, key: typing.Callable[..., typing.Hashable] | None = None) -> typing.Callable[[Func], Func]: ...
+def memoize(func=None, *, key=None):
+    """Memoize a function, as a bare decorator or with options.
+
+    key: cache on key(*args) rather than the args.
+    """
+    if func is not None:
+        return _register(func, key)
+    return lambda func: _register(func, key)
+
+
+def stats() -> list[Stats]:
+    """Return how the caches did since the last stats() or clear(). The caches are kept."""
+    out = []
+    for cached in list(_registered):
+        info = cached.cache_info()
+        hits, misses = _reported.get(cached, (0, 0))
+        if info.hits > hits or info.misses > misses:
+            name = cached.__qualname__.replace(".<locals>", "")
+            out.append(Stats(name, info.hits - hits, info.misses - misses, info.currsize))
+        _reported[cached] = (info.hits, info.misses)
+    return out
+
+
+@contextlib.contextmanager
+def measure() -> collections.abc.Iterator[list[Stats]]:
+    """Hold the caches made inside the block and fill the yielded list with stats() on the way out.
+
+    Caches made outside a measure() block are not held, so calling solve() in a loop does not keep
+    every closure it memoized alive.
+    """
+    global _pinned
+    _pinned = []
+    caches: list[Stats] = []
+    try:
+        yield caches
+    finally:
+        caches.extend(stats())
+        _pinned = None
+
+
+def clear() -> None:
+    """Clear every cache, eg when the input changes."""
+    for cached in list(_registered):
+        cached.cache_clear()
+    _reported.clear()
@@ -0,0 +1,74 @@
+"""Map a function over independent items in a pool of worker processes.
+
+Inputs often hold a list of records which are solved independently, eg
+blueprints or equations. map_lines splits them across processes.
+
+Workers are forked, so the function and any shared arguments are inherited
+once per worker rather than pickled with every chunk of items. That also
+allows closures and lambdas. The items and results are pickled.
+
+Small inputs, tests and single CPU machines run in this process, where a
+pool would only add start up costs.
+
+Memoized functions called by func fill caches in the workers, which go away
+with the pool. The parent's memo stats do not count them and later calls in
+the parent do not reuse them.
+"""
+
+import collections.abc
+import concurrent.futures
+import multiprocessing
+import os
+import typing
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+# By default, fewer items than this are not worth starting workers for.
+MIN_ITEMS = 16
+
+# Set in each worker by _init.
+_func: collections.abc.Callable[..., typing.Any] | None = None
+_shared: tuple[typing.Any, ...] = ()
+
+
+def _init(func: collections.abc.Callable[..., typing.Any], shared: tuple[typing.Any, ...]) -> None:
+    global _func, _shared
+    _func, _shared = func, shared
+
+
+def _call(item: typing.Any) -> typing.Any:
+    assert _func is not None
+    return _func(item, *_shared)
+
+
+def map_lines(
+    func: collections.abc.Callable[..., R],
+    items: collections.abc.Iterable[T],
+    *shared: typing.Any,
+    chunksize: int | None = None,
+    processes: int | None = None,
+    testing: bool = False,
+    min_items: int = MIN_ITEMS,
+) -> list[R]:
+    """Return [func(item, *shared) for item in items], computed over a process pool.
+
+    chunksize: items sent to a worker at a time. Defaults to four chunks per worker.
+    processes: the pool size. Defaults to the CPU count.
+    testing: run serially, so tests stay quick and easy to debug.
+    min_items: run serially with fewer items. Lower it when each item is slow.
+    """
+    items = list(items)
+    processes = min(processes or os.cpu_count() or 1, len(items))
+    if testing or processes <= 1 or len(items) < min_items:
+        return [func(item, *shared) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(items) // (processes * 4)))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init,
+        initargs=(func, shared),
+    ) as executor:
+        return list(executor.map(_call, items, chunksize=chunksize))
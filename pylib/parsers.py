@@ -9,8 +9,11 @@ and returns the parsed value.
 import collections
 import collections.abc
 import dataclasses
+import functools
+import hashlib
 import inspect
 import itertools
+import pickle
 import re
 import warnings
 from typing import Any, Callable, Iterable, TypeVar
@@ -383,6 +386,24 @@ class CoordinatesParser(BaseParser):
         )
 
 
+@dataclasses.dataclass
+class DenseGridParser(BaseParser):
+    """Parse a map into a DenseGrid, a flat bytearray indexed by y * width + x.
+
+    This is much smaller than a MapC for large maps and avoids hashing coordinates.
+    Use DenseGrid.to_mapc() where a day wants the coordinate sets.
+    """
+
+    origin_top_left: bool = True
+
+    def parse(self, puzzle_input: str) -> DenseGrid:
+        """Parse a map into a DenseGrid."""
+        lines = puzzle_input.splitlines()
+        if not self.origin_top_left:
+            lines.reverse()
+        return DenseGrid.from_lines(lines)
+
+
 @dataclasses.dataclass
 class ParseDict(BaseParser):
     """Parse an input into a dict by splitting on ': '."""
@@ -410,11 +431,65 @@ def get_parser(data: str, parser: BaseParser | collections.abc.Callable[[str], A
     if parser is not None:
         return parser if callable(parser) else parser.parse
     # Use heuristics to guess at an input parser.
-    got = _guess_parser(data)
+    got = _cached_guess_parser(data)
     # print("Guessing at parser", got)
     return got.parse
 
 
+@functools.lru_cache(maxsize=32)
+def _cached_guess_parser(data: str) -> BaseParser:
+    """Guess at a parser once per input, rather than on every reload or part."""
+    return _guess_parser(data)
+
+
+@dataclasses.dataclass
+class ParseCache:
+    """Cache parsed inputs per (input hash, parser) so each input is parsed once per run.
+
+    Modes:
+        copy: hand out a fresh copy on each reuse, safe for solvers which mutate their input.
+              The parsed value is pickled on the first parse; reuses unpickle it, which is much
+              cheaper than most parsing. Values which cannot be pickled are parsed again.
+        share: hand out the same object every time. Only for solvers which do not mutate their input.
+        off: always parse.
+    """
+
+    mode: str = "copy"
+    entries: dict[tuple[bytes, int], tuple[Any, Any, bytes | None]] = dataclasses.field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.mode not in ("copy", "share", "off"):
+            raise ValueError(f"Unknown parse cache mode {self.mode!r}")
+
+    def parse(self, parser: Callable[[str], Any], data: str) -> Any:
+        """Return the parsed data, parsing only if this parser has not seen this input."""
+        if self.mode == "off":
+            return parser(data)
+        # Bound methods are created per access. Key on the parser object, which is also held to pin the id.
+        owner = getattr(parser, "__self__", parser)
+        key = (hashlib.blake2b(data.encode(), digest_size=16).digest(), id(owner))
+        if key in self.entries:
+            _, value, pickled = self.entries[key]
+            if self.mode == "share":
+                return value
+            if pickled is not None:
+                return pickle.loads(pickled)
+            return parser(data)
+
+        value = parser(data)
+        pickled = None
+        if self.mode == "copy":
+            try:
+                pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                pickled = None
+        self.entries[key] = (owner, value if self.mode == "share" else None, pickled)
+        return value
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
 def _guess_parser(data: str) -> BaseParser:
     for i in range(5, 1, -1):
         sep = "\n" * i
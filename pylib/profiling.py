@@ -0,0 +1,140 @@
+"""Profile a solution run without editing it.
+
+Modes:
+    profile:     cProfile. Print the top functions and write a .pstats file per run.
+    trace-alloc: tracemalloc. Print the peak traced memory and the top allocation sites.
+    sample:      A SIGPROF sampling profiler. Print the functions most often on the stack.
+
+The runners wrap parsing and solving together so the reports show how the time
+splits between the parser, helpers like MapC and the solver itself.
+"""
+
+import collections
+import cProfile
+import dataclasses
+import io
+import pathlib
+import pstats
+import signal
+import sys
+import time
+import tracemalloc
+import types
+import typing
+
+from .helpers import format_bytes, format_ns
+
+T = typing.TypeVar("T")
+MODES = ("profile", "trace-alloc", "sample")
+FrameKey = tuple[str, int, str]
+
+
+def frame_name(key: FrameKey) -> str:
+    filename, line, name = key
+    return f"{name} ({pathlib.Path(filename).name}:{line})"
+
+
+@dataclasses.dataclass
+class Profiler:
+    """Run functions under one of the profiling modes and print a report per run."""
+
+    mode: str
+    top: int = 20
+    sort: str = "tottime"
+    directory: pathlib.Path = pathlib.Path("profiles")
+    interval: float = 0.001
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {self.mode!r}; pick one of {MODES}")
+
+    def run(self, name: str, func: typing.Callable[..., T], *args, **kwargs) -> tuple[int, T]:
+        """Run a function under the profiler. Return the duration in ns, including overhead, and the result."""
+        match self.mode:
+            case "profile":
+                return self._profile(name, func, *args, **kwargs)
+            case "trace-alloc":
+                return self._trace_alloc(name, func, *args, **kwargs)
+            case _:
+                return self._sample(name, func, *args, **kwargs)
+
+    def _profile(self, name: str, func: typing.Callable[..., T], *args, **kwargs) -> tuple[int, T]:
+        profile = cProfile.Profile()
+        start = time.perf_counter_ns()
+        got = profile.runcall(func, *args, **kwargs)
+        duration = time.perf_counter_ns() - start
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{name}.pstats"
+        profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).strip_dirs().sort_stats(self.sort).print_stats(self.top)
+        print(f"PROFILE {name} {format_ns(duration)}, stats written to {path}")
+        print(out.getvalue().strip("\n"))
+        return duration, got
+
+    def _trace_alloc(self, name: str, func: typing.Callable[..., T], *args, **kwargs) -> tuple[int, T]:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter_ns()
+        try:
+            got = func(*args, **kwargs)
+            duration = time.perf_counter_ns() - start
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ])
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        # Live allocations at the end of the run. Temporaries freed before then only show in the peak.
+        print(f"TRACE {name} {format_ns(duration)}, peak {format_bytes(peak - baseline, pad=False)} above baseline")
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            frame = stat.traceback[0]
+            print(f"  {format_bytes(stat.size)} {stat.count:9,} blocks  {pathlib.Path(frame.filename).name}:{frame.lineno}")
+        return duration, got
+
+    def _sample(self, name: str, func: typing.Callable[..., T], *args, **kwargs) -> tuple[int, T]:
+        own: collections.Counter[FrameKey] = collections.Counter()
+        total: collections.Counter[FrameKey] = collections.Counter()
+        outer = sys._getframe()
+        samples = 0
+
+        def handler(signum: int, frame: types.FrameType | None) -> None:
+            nonlocal samples
+            samples += 1
+            seen = set()
+            while frame is not None and frame is not outer:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if not seen:
+                    own[key] += 1
+                if key not in seen:
+                    seen.add(key)
+                    total[key] += 1
+                frame = frame.f_back
+
+        previous = signal.signal(signal.SIGPROF, handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        start = time.perf_counter_ns()
+        try:
+            got = func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+        print(f"SAMPLE {name} {format_ns(duration)}, {samples} samples every {self.interval * 1000:g} ms")
+        if samples:
+            # Hottest by time spent in the function itself, then by time with the function on the stack.
+            for title, counter in (("self", own), ("total", total)):
+                print(f"  {'self':>6} {'total':>6}  function, by {title}")
+                for key, _ in counter.most_common(self.top):
+                    print(f"  {own[key] / samples:6.1%} {total[key] / samples:6.1%}  {frame_name(key)}")
+        return duration, got
@@ -1,25 +1,85 @@
 #!/bin/python
 
 import collections.abc
+import concurrent.futures
+import contextlib
 import dataclasses
 import datetime
 import importlib
+import io
 import logging
+import multiprocessing
 import os
 import pathlib
+import re
 import requests
 import resource
 import shutil
 import sys
 import time
+import traceback
 import typing
 
 import inotify_simple  # type: ignore
 from lib import helpers
+from lib import memo
 from lib import parsers
+from lib import profiling
+from lib import timings
 
 
 T = typing.TypeVar("T")
+RE_TIMEOUT = re.compile(r"^TIMEOUT = (\d+)", re.MULTILINE)
+_WORKER_FORMATTER: helpers.LogFormatter | None = None
+
+
+def _init_batch_worker(verbose: int) -> None:
+    """Set up logging and resources once per batch worker process."""
+    global _WORKER_FORMATTER
+    _WORKER_FORMATTER = helpers.setup_logging(0, verbose)
+
+
+def _run_batch_day(runner: "Runner", actions: dict[str, bool]) -> tuple[int, bool, str]:
+    """Run one day in a batch worker. Return the day, success and captured output."""
+    assert _WORKER_FORMATTER is not None
+    _WORKER_FORMATTER.day = runner.day
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            success = runner.run_day(formatter=_WORKER_FORMATTER, **actions)
+        except Exception as e:
+            print(f"ERROR {runner.year}.{runner.day:02} {type(e).__name__}: {e}")
+            success = False
+    return runner.day, success, output.getvalue()
+
+
+class PartFailed(Exception):
+    """A part could not complete in its child process, eg it ran out of memory."""
+
+
+@dataclasses.dataclass
+class PartRun:
+    """The outcome of parsing and solving one part."""
+
+    got: typing.Any
+    ns: int
+    parse_ns: int
+    # Peak RSS above the RSS when the part started, in bytes.
+    rss: int
+    # CPU time spent solving, including worker processes: reaped pools and the hash mining pool, which
+    # reports back per chunk. Above ns when work ran in parallel.
+    cpu_ns: int = 0
+    # How the memoized functions did on this part.
+    caches: list[memo.Stats] = dataclasses.field(default_factory=list)
+
+    def describe(self) -> str:
+        out = (
+            f"{helpers.format_ns(self.ns)} (cpu {helpers.format_ns(self.cpu_ns)}, parse {helpers.format_ns(self.parse_ns)}, "
+            f"mem +{helpers.format_bytes(self.rss, pad=False)})"
+        )
+        if self.caches:
+            out += " [" + "; ".join(stats.describe() for stats in self.caches) + "]"
+        return out
 
 
 @dataclasses.dataclass
@@ -29,6 +89,12 @@ class Runner:
     data: str | None
     parts: collections.abc.Iterable[int]
     verbose: bool
+    profiler: profiling.Profiler | None = None
+    # Address space limit in bytes. If set, each part runs in a child process with RLIMIT_AS set.
+    max_mem: int | None = None
+    parse_cache: parsers.ParseCache = dataclasses.field(default_factory=parsers.ParseCache, init=False)
+    # The input the memoized functions last ran on. Their caches are cleared when it changes.
+    memo_input: str | None = dataclasses.field(default=None, init=False)
 
     def __post_init__(self):
         """Initialize."""
@@ -61,6 +127,19 @@ class Runner:
         """Submit the solution."""
         raise NotImplemented
 
+    def site_name(self) -> str:
+        """Return the name of the puzzle site, used to key the timing history."""
+        return pathlib.Path(os.getcwd()).name
+
+    def timing_store(self) -> timings.TimingStore:
+        """Return the timing history store."""
+        return timings.TimingStore(pathlib.Path("timings.jsonl"))
+
+    def record_timing(self, part: int, run: PartRun) -> None:
+        """Record how long a part took on the real input. Profiled runs are skipped as they skew the history."""
+        if self.data is None and self.profiler is None:
+            self.timing_store().record(self.site_name(), self.year, self.day, part, run.ns, run.parse_ns, run.rss)
+
     def get_solutions(self, day: int) -> list[int] | None:
         solutions_path = self.solutions_path()
         want_raw = [line for line in solutions_path.read_text().splitlines() if line.startswith(f"{day:02}.")]
@@ -85,8 +164,77 @@ class Runner:
             return None
         return data_path.read_text().rstrip("\n")
 
-    def compare(self, want, data: typing.Any, msg_success: str, msg_fail: str, func: typing.Callable, **kwargs) -> bool:
-        time_s, got = helpers.timed(func, data=data, **kwargs)
+    def run_part(self, module, parser: parsers.BaseParser, data: str, label: str, **kwargs) -> PartRun:
+        """Parse the input and solve one part.
+
+        Parsed inputs are cached across parts and tests. Memoized functions keep their caches from part
+        to part while the input stays the same. With a profiler set, parsing runs under the profiler too.
+        With max_mem set, the part runs in a child process; PartFailed is raised if it does not complete.
+        """
+        if data != self.memo_input:
+            memo.clear()
+            self.memo_input = data
+
+        def parse_and_solve() -> PartRun:
+            helpers.reset_peak_memory()
+            start_rss, _ = helpers.memory_usage()
+            parse_duration, parsed = helpers.timed_ns(self.parse_cache.parse, parser, data)
+            with memo.measure() as caches:
+                start_cpu = helpers.cpu_ns()
+                duration, got = helpers.timed_ns(module.solve, data=parsed, **kwargs)
+                cpu = helpers.cpu_ns() - start_cpu
+            _, peak_rss = helpers.memory_usage()
+            return PartRun(got, duration, parse_duration, max(0, peak_rss - start_rss), cpu, caches)
+
+        def profiled() -> PartRun:
+            assert self.profiler is not None
+            return self.profiler.run(label, parse_and_solve)[1]
+
+        func = parse_and_solve if self.profiler is None else profiled
+        if self.max_mem is None:
+            return func()
+        return self.run_limited(func)
+
+    def run_limited(self, func: typing.Callable[[], PartRun]) -> PartRun:
+        """Run a part in a forked child process with the address space limited to max_mem."""
+        assert self.max_mem is not None
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+
+        def child() -> None:
+            resource.setrlimit(resource.RLIMIT_AS, (self.max_mem, self.max_mem))
+            # Capture the output here; the parent may be redirecting stdout, eg in batch mode.
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                try:
+                    result: tuple[str, typing.Any] = ("ok", func())
+                except MemoryError:
+                    result = ("failed", f"OOM: exceeded the {helpers.format_bytes(self.max_mem, pad=False)} memory limit")
+                except Exception:
+                    result = ("failed", "ERROR in child process\n" + traceback.format_exc())
+            sender.send((*result, output.getvalue()))
+
+        process = context.Process(target=child)
+        process.start()
+        sender.close()
+        try:
+            status, value, output = receiver.recv()
+        except EOFError:
+            status, value, output = "failed", None, ""
+        process.join()
+        print(output, end="")
+        if status == "ok":
+            return value
+        if value is None:
+            value = f"Child process died with exit code {process.exitcode}; memory limit {helpers.format_bytes(self.max_mem, pad=False)}"
+        raise PartFailed(value)
+
+    def profile_label(self, part: int, test_number: int | None = None) -> str:
+        """Return the name of a profiled run, used for the report and the stats file."""
+        label = f"{self.site_name()}.{self.year}.{self.day:02}.{part}"
+        return label if test_number is None else f"{label}.test{test_number}"
+
+    def compare(self, want, got: typing.Any, time_s: str, msg_success: str, msg_fail: str) -> bool:
         if str(got) == str(want):
             print(msg_success % time_s)
             return True
@@ -98,20 +246,28 @@ class Runner:
             else:
                 msg += f" Too high by {-delta}."
         print(msg)
+        return False
 
     def test(self, module, parser: parsers.BaseParser, formatter) -> bool:
         success = True
         for part in self.parts:
             formatter.set_part(part)
             for test_number, (test_part, test_data, test_want) in enumerate(module.TESTS, 1):
-                if test_part != part:
+                if test_part != part or not success:
+                    continue
+                try:
+                    run = self.run_part(
+                        module, parser, test_data.rstrip("\n"), self.profile_label(part, test_number),
+                        part=part, testing=True, test_number=test_number,
+                    )
+                except PartFailed as e:
+                    print(f"TEST  {self.year}.{self.day:02}.{part} FAIL (test {test_number}). {e}")
+                    success = False
                     continue
                 success = success and self.compare(
-                    test_want, parser(test_data.rstrip("\n")),
+                    test_want, run.got, run.describe(),
                     f"TEST  {self.year}.{self.day:02}.{part} %s PASS (test {test_number})",
                     f"TEST  {self.year}.{self.day:02}.{part} %s FAIL (test {test_number}). Got %r but wants {test_want!r}.",
-                    module.solve,
-                    part=part, testing=True, test_number=test_number,
                 )
         return success
 
@@ -123,9 +279,16 @@ class Runner:
             if data is None:
                 print(f"SOLVE No input data found for day {self.day} part {part}")
                 continue
-            time_s, got = helpers.timed(module.solve, part=part, data=parser(data), testing=False, test_number=None)
-            solutions.append(got)
-            print(f"SOLVE {self.day:02}.{part} {time_s} ---> {got}")
+            try:
+                run = self.run_part(
+                    module, parser, data, self.profile_label(part), part=part, testing=False, test_number=None,
+                )
+            except PartFailed as e:
+                print(f"SOLVE {self.day:02}.{part} {e}")
+                continue
+            self.record_timing(part, run)
+            solutions.append(run.got)
+            print(f"SOLVE {self.day:02}.{part} {run.describe()} ---> {run.got}")
         return solutions
 
     def submit(self, module, parser: parsers.BaseParser, formatter) -> None:
@@ -142,19 +305,26 @@ class Runner:
             return
         success = True
         for part in self.parts:
-            if part > len(want):
+            if part > len(want) or not success:
                 continue
             formatter.set_part(part)
             data = self.input_data(part)
             if data is None:
                 print(f"CHECK No input data found for day {self.day} part {part}")
                 continue
+            try:
+                run = self.run_part(
+                    module, parser, data, self.profile_label(part), part=part, testing=False, test_number=None,
+                )
+            except PartFailed as e:
+                print(f"CHECK {self.year}.{self.day:02}.{part} FAIL. {e}")
+                success = False
+                continue
+            self.record_timing(part, run)
             success = success and self.compare(
-                want[part - 1], parser(data),
+                want[part - 1], run.got, run.describe(),
                 f"CHECK {self.year}.{self.day:02}.{part} %s PASS",
                 f"CHECK {self.year}.{self.day:02}.{part} %s FAIL. Wanted {want[part -1]} but got %s.",
-                module.solve,
-                part=part, testing=False, test_number=None,
             )
         return success
 
@@ -166,6 +336,9 @@ class Runner:
         module = importlib.reload(module)
         parser_override = getattr(module, "PARSER", None) or getattr(module, "input_parser", None)
         parser = parsers.get_parser(self.input_data(1), parser_override)
+        # A fresh cache per run as a reloaded module has new parsers. Solvers which do not mutate their
+        # input can set PARSE_CACHE = "share" to skip copying; "off" disables the cache.
+        self.parse_cache = parsers.ParseCache(getattr(module, "PARSE_CACHE", "copy"))
         success = True
         for want, func in [(test, self.test), (solve, self.solve), (check, self.check), (submit, self.submit)]:
             if want:
@@ -174,6 +347,56 @@ class Runner:
                     success = success and got
         return success
 
+    def available_days(self) -> list[int]:
+        """Return the days which have a solution file."""
+        return [
+            day for day in range(1, 26)
+            if pathlib.Path(f"{self.year}/{dataclasses.replace(self, day=day).module_name()}.py").exists()
+        ]
+
+    def known_runtime(self, day: int, medians: dict[int, int]) -> int:
+        """Return a runtime estimate in ns for a day, used to schedule slow days first.
+
+        Use the timing history when there is one, else the day's TIMEOUT.
+        """
+        if day in medians:
+            return medians[day]
+        source = pathlib.Path(f"{self.year}/{dataclasses.replace(self, day=day).module_name()}.py").read_text()
+        if m := RE_TIMEOUT.search(source):
+            return int(m.group(1)) * 1_000_000_000
+        return 0
+
+    def run_all(self, check: bool = False, solve: bool = False, test: bool = False, jobs: int | None = None) -> bool:
+        """Run all available days over a process pool, printing results as days complete."""
+        helpers.setup_resources()
+        medians = self.timing_store().day_medians(self.site_name(), self.year)
+        days = sorted(self.available_days(), key=lambda day: self.known_runtime(day, medians), reverse=True)
+        actions = {"check": check, "solve": solve, "test": test, "submit": False}
+        failed = []
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs or os.cpu_count(), initializer=_init_batch_worker, initargs=(self.verbose,),
+        ) as executor:
+            futures = [
+                executor.submit(_run_batch_day, dataclasses.replace(self, day=day), actions)
+                for day in days
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                day, success, output = future.result()
+                print(output, end="", flush=True)
+                if not success:
+                    failed.append(day)
+        if failed:
+            print(f"BATCH {self.year} {len(failed)} of {len(days)} days failed: {', '.join(f'{d:02}' for d in sorted(failed))}")
+        else:
+            print(f"BATCH {self.year} all {len(days)} days passed")
+        if check or solve:
+            print(self.timing_store().memory_report(site=self.site_name(), year=self.year))
+        return not failed
+
+    def report(self, top: int, threshold: float) -> None:
+        """Print the slowest parts and any timing regressions."""
+        print(self.timing_store().report(top=top, threshold=threshold))
+
     def run(self, check: bool = False, solve: bool = False, test: bool = False, submit: bool = False, live: bool = False) -> bool:
         formatter = helpers.setup_logging(self.day, self.verbose)
         helpers.setup_resources()
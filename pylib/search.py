@@ -0,0 +1,323 @@
+"""Graph search.
+
+Searches are driven by a `neighbors(state)` callback, so the graph is never
+built up front. Weighted searches expect `(next_state, edge_cost)` pairs and
+unweighted ones expect the next states.
+
+States are any hashable value. Where a state carries data which should not
+tell states apart, `key(state)` returns the value used to track the visited
+states and costs. Searches take several start states for multi-source search.
+
+With `goal` unset, a search explores everything reachable and the costs hold
+the distance to every state.
+"""
+
+import collections
+import collections.abc
+import dataclasses
+import heapq
+import itertools
+import typing
+
+S = typing.TypeVar("S")
+Key = collections.abc.Callable[[S], collections.abc.Hashable]
+Goal = collections.abc.Callable[[S], bool]
+
+
+@dataclasses.dataclass
+class Result(typing.Generic[S]):
+    """The outcome of a search.
+
+    cost: the cost to the nearest goal, or None if no goal was reached.
+    goals: the goal states reached at that cost. All of them if all_paths was set.
+    costs: the best known cost to each state, by key.
+    parents: the states preceding each state on its shortest paths, by key. Only tracked on request.
+    starts: the keys of the start states, where paths begin.
+    """
+
+    cost: int | None
+    goals: list[S]
+    costs: dict[collections.abc.Hashable, int]
+    parents: dict[collections.abc.Hashable, list[S]]
+    key: Key | None = None
+    starts: set[collections.abc.Hashable] = dataclasses.field(default_factory=set)
+
+    @property
+    def found(self) -> bool:
+        return self.cost is not None
+
+    def _key(self, state: S) -> collections.abc.Hashable:
+        return state if self.key is None else self.key(state)
+
+    def path(self, goal: S | None = None) -> list[S]:
+        """Return one shortest path from a start to the goal, both included. Requires paths=True."""
+        if goal is None:
+            if not self.goals:
+                raise ValueError("No goal was reached.")
+            goal = self.goals[0]
+        path = [goal]
+        # A start can have parents over zero cost edges; stop there rather than loop.
+        while self._key(path[-1]) not in self.starts and (parents := self.parents.get(self._key(path[-1]))):
+            path.append(parents[0])
+        path.reverse()
+        return path
+
+    def on_shortest_paths(self) -> set[S]:
+        """Return every state on any shortest path to any of the goals. Requires all_paths=True."""
+        todo = list(self.goals)
+        seen = set(todo)
+        while todo:
+            for parent in self.parents.get(self._key(todo.pop()), ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    todo.append(parent)
+        return seen
+
+
+def dijkstra(
+    starts: collections.abc.Iterable[S],
+    neighbors: collections.abc.Callable[[S], collections.abc.Iterable[tuple[S, int]]],
+    goal: Goal | None = None,
+    heuristic: collections.abc.Callable[[S], int] | None = None,
+    key: Key | None = None,
+    paths: bool = False,
+    all_paths: bool = False,
+) -> Result[S]:
+    """Lowest cost search. With a heuristic, this is A*.
+
+    The heap uses lazy decrease-key: a cheaper route to a state pushes a new
+    entry and stale entries are skipped when popped. The heuristic must never
+    overestimate the remaining cost, and with all_paths it must be consistent.
+
+    paths: track one parent per state for Result.path().
+    all_paths: track every parent on a shortest path and keep going until
+        every goal at the lowest cost is found, for Result.on_shortest_paths().
+    """
+    paths = paths or all_paths
+    costs: dict[collections.abc.Hashable, int] = {}
+    parents: dict[collections.abc.Hashable, list[S]] = {}
+    # The counter breaks ties so states never need to be comparable.
+    counter = itertools.count()
+    todo: list[tuple[int, int, int, S]] = []
+    start_keys: set[collections.abc.Hashable] = set()
+    for start in starts:
+        k = start if key is None else key(start)
+        costs[k] = 0
+        start_keys.add(k)
+        if paths:
+            # Zero cost edges can lead back into a start, which then gets parents too.
+            parents[k] = []
+        todo.append((heuristic(start) if heuristic else 0, next(counter), 0, start))
+    heapq.heapify(todo)
+
+    best: int | None = None
+    goals: list[S] = []
+    while todo:
+        priority, _, cost, state = heapq.heappop(todo)
+        if best is not None and priority > best:
+            break
+        k = state if key is None else key(state)
+        if cost > costs[k]:
+            continue
+        if goal is not None and goal(state):
+            best = cost
+            goals.append(state)
+            if not all_paths:
+                break
+            # Keep expanding; zero cost edges can lead on to more goals at the same cost.
+        for next_state, step in neighbors(state):
+            next_cost = cost + step
+            next_k = next_state if key is None else key(next_state)
+            known = costs.get(next_k)
+            if known is None or next_cost < known:
+                costs[next_k] = next_cost
+                if paths:
+                    parents[next_k] = [state]
+                priority = next_cost + heuristic(next_state) if heuristic else next_cost
+                heapq.heappush(todo, (priority, next(counter), next_cost, next_state))
+            elif all_paths and next_cost == known:
+                parents[next_k].append(state)
+    return Result(best, goals, costs, parents, key, start_keys)
+
+
+def astar(
+    starts: collections.abc.Iterable[S],
+    neighbors: collections.abc.Callable[[S], collections.abc.Iterable[tuple[S, int]]],
+    goal: Goal,
+    heuristic: collections.abc.Callable[[S], int],
+    key: Key | None = None,
+    paths: bool = False,
+    all_paths: bool = False,
+) -> Result[S]:
+    """A* search. See dijkstra()."""
+    return dijkstra(starts, neighbors, goal, heuristic, key, paths, all_paths)
+
+
+def bfs(
+    starts: collections.abc.Iterable[S],
+    neighbors: collections.abc.Callable[[S], collections.abc.Iterable[S]],
+    goal: Goal | None = None,
+    key: Key | None = None,
+    paths: bool = False,
+) -> Result[S]:
+    """Breadth first search, where every step costs one."""
+    costs: dict[collections.abc.Hashable, int] = {}
+    parents: dict[collections.abc.Hashable, list[S]] = {}
+    todo: collections.deque[S] = collections.deque()
+    for start in starts:
+        costs[start if key is None else key(start)] = 0
+        todo.append(start)
+        if goal is not None and goal(start):
+            return Result(0, [start], costs, parents, key)
+
+    while todo:
+        state = todo.popleft()
+        next_cost = costs[state if key is None else key(state)] + 1
+        for next_state in neighbors(state):
+            next_k = next_state if key is None else key(next_state)
+            if next_k in costs:
+                continue
+            costs[next_k] = next_cost
+            if paths:
+                parents[next_k] = [state]
+            # Checking the goal on push rather than pop saves expanding a whole layer.
+            if goal is not None and goal(next_state):
+                return Result(next_cost, [next_state], costs, parents, key)
+            todo.append(next_state)
+    return Result(None, [], costs, parents, key)
+
+
+def zero_one_bfs(
+    starts: collections.abc.Iterable[S],
+    neighbors: collections.abc.Callable[[S], collections.abc.Iterable[tuple[S, int]]],
+    goal: Goal | None = None,
+    key: Key | None = None,
+    paths: bool = False,
+) -> Result[S]:
+    """Lowest cost search where every step costs zero or one, using a deque instead of a heap."""
+    costs: dict[collections.abc.Hashable, int] = {}
+    parents: dict[collections.abc.Hashable, list[S]] = {}
+    todo: collections.deque[tuple[int, S]] = collections.deque()
+    for start in starts:
+        costs[start if key is None else key(start)] = 0
+        todo.append((0, start))
+
+    while todo:
+        cost, state = todo.popleft()
+        if cost > costs[state if key is None else key(state)]:
+            continue
+        if goal is not None and goal(state):
+            return Result(cost, [state], costs, parents, key)
+        for next_state, step in neighbors(state):
+            next_cost = cost + step
+            next_k = next_state if key is None else key(next_state)
+            known = costs.get(next_k)
+            if known is None or next_cost < known:
+                costs[next_k] = next_cost
+                if paths:
+                    parents[next_k] = [state]
+                if step:
+                    todo.append((next_cost, next_state))
+                else:
+                    todo.appendleft((next_cost, next_state))
+    return Result(None, [], costs, parents, key)
+
+
+def bidirectional_bfs(
+    start: S,
+    end: S,
+    neighbors: collections.abc.Callable[[S], collections.abc.Iterable[S]],
+    reverse_neighbors: collections.abc.Callable[[S], collections.abc.Iterable[S]] | None = None,
+    key: Key | None = None,
+) -> int | None:
+    """Return the number of steps from start to end, or None if there is no path.
+
+    Searches from both ends, a layer at a time, always growing the smaller
+    frontier. This visits far fewer states than bfs() when the graph fans out.
+    `reverse_neighbors` returns the states which lead to a state. It defaults
+    to `neighbors`, for undirected graphs.
+    """
+    if key is None:
+        key = lambda state: state  # noqa: E731
+    reverse_neighbors = reverse_neighbors or neighbors
+    if key(start) == key(end):
+        return 0
+    # Distances from each end, and the frontiers of unexpanded states.
+    forward, backward = {key(start): 0}, {key(end): 0}
+    forward_frontier, backward_frontier = [start], [end]
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            seen, other, frontier, expand = forward, backward, forward_frontier, neighbors
+        else:
+            seen, other, frontier, expand = backward, forward, backward_frontier, reverse_neighbors
+        next_frontier = []
+        best = None
+        for state in frontier:
+            cost = seen[key(state)] + 1
+            for next_state in expand(state):
+                next_k = key(next_state)
+                if next_k in seen:
+                    continue
+                seen[next_k] = cost
+                if next_k in other:
+                    total = cost + other[next_k]
+                    best = total if best is None else min(best, total)
+                next_frontier.append(next_state)
+        # Finish the layer before returning. The first meeting found is not always the shortest.
+        if best is not None:
+            return best
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None
+
+
+def branch_and_bound(
+    starts: collections.abc.Iterable[S],
+    children: collections.abc.Callable[[S], collections.abc.Iterable[S]],
+    value: collections.abc.Callable[[S], int],
+    bound: collections.abc.Callable[[S], int],
+    key: Key | None = None,
+) -> tuple[int | None, S | None]:
+    """Return the highest value of any state reachable from the starts, along with that state.
+
+    value(state): what a state is worth if nothing more is done from it.
+    bound(state): an upper bound on the value of the state or anything it leads to.
+        It must never underestimate; the tighter it is, the less gets searched.
+
+    Best first: the state with the highest bound is expanded next. Once the
+    highest bound left is no better than the best value found, nothing left
+    can beat it and the search stops. Children which cannot beat the best value
+    are never queued. States whose key was queued before are skipped.
+
+    There is no dominance check. Merging states on their key, with the key
+    normalized by the caller, plus a tight bound already prunes what dominance
+    would; scanning Pareto fronts in Python costs more than it saves.
+    """
+    best: int | None = None
+    best_state: S | None = None
+    seen: set[collections.abc.Hashable] = set()
+    # The counter breaks ties so states never need to be comparable.
+    counter = itertools.count()
+    todo: list[tuple[int, int, S]] = []
+    for start in starts:
+        seen.add(start if key is None else key(start))
+        todo.append((-bound(start), next(counter), start))
+    heapq.heapify(todo)
+
+    while todo:
+        negative_bound, _, state = heapq.heappop(todo)
+        if best is not None and -negative_bound <= best:
+            break
+        state_value = value(state)
+        if best is None or state_value > best:
+            best, best_state = state_value, state
+        for child in children(state):
+            child_k = child if key is None else key(child)
+            if child_k in seen:
+                continue
+            seen.add(child_k)
+            if (child_bound := bound(child)) > best:
+                heapq.heappush(todo, (-child_bound, next(counter), child))
+    return best, best_state
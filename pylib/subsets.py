@@ -0,0 +1,93 @@
+"""Dynamic programming over subsets, stored as integer bitmasks.
+
+Route puzzles ask for the best order to visit a handful of places. Trying
+every order costs n! while the best route to a place through a set of
+places only depends on the place and the set, which is 2^n * n states.
+Sets are bitmasks over node indexes, so a table over all subsets is a plain
+list indexed by mask.
+
+best_route is Held-Karp over a weight matrix. subset_max and
+best_disjoint_pair combine per-set results, eg two workers splitting the
+places between them.
+"""
+
+import collections.abc
+import math
+import operator
+
+Weights = collections.abc.Sequence[collections.abc.Sequence[int]]
+
+
+def best_route(
+    weights: Weights,
+    start: int | None = None,
+    closed: bool = False,
+    pick: collections.abc.Callable[[collections.abc.Iterable[float]], float] = min,
+) -> int:
+    """Return the cost of the best route which visits every node once.
+
+    weights[a][b] is the cost of going from node a to node b.
+    start: the node the route starts at, or None to start anywhere.
+    closed: return to the start at the end, making a cycle. Any start will do for a cycle.
+    pick: min for the cheapest route or max for the most valuable one.
+
+    table[mask][j] holds the best cost of a route through the nodes in mask
+    which ends at j. Each entry is picked from the entries one node smaller,
+    done as element-wise list operations over every previous end node at once.
+    """
+    size = len(weights)
+    if closed and start is None:
+        start = 0
+    # Entries which are not a valid route must never be picked.
+    impossible = math.inf if pick is min else -math.inf
+    # columns[k][j] is the cost of j to k.
+    columns = [[weights[j][k] for j in range(size)] for k in range(size)]
+
+    table = [[impossible] * size for _ in range(1 << size)]
+    for node in range(size) if start is None else (start,):
+        table[1 << node][node] = 0
+    for mask in range(1, 1 << size):
+        if start is not None and not mask & (1 << start):
+            continue
+        row = table[mask]
+        for k in range(size):
+            bit = 1 << k
+            if not mask & bit or mask == bit:
+                continue
+            row[k] = pick(map(operator.add, table[mask ^ bit], columns[k]))
+
+    last = table[-1]
+    if closed:
+        assert start is not None
+        return int(pick(map(operator.add, last, columns[start])))
+    return int(pick(last))
+
+
+def subset_max(values: collections.abc.Sequence[int]) -> list[int]:
+    """Return, for each mask, the largest value of any subset of it. The values are indexed by mask.
+
+    This is the sum over subsets (SOS) DP with max in place of sum: fold in one
+    bit at a time, pulling from the mask without that bit. For each bit, the
+    masks with it set come in blocks right after the matching masks without
+    it, so each block is a single element-wise max.
+    """
+    out = list(values)
+    size = len(out)
+    bit = 1
+    while bit < size:
+        for base in range(0, size, bit * 2):
+            high = base + bit
+            out[high:high + bit] = map(max, out[high:high + bit], out[base:high])
+        bit *= 2
+    return out
+
+
+def best_disjoint_pair(values: collections.abc.Sequence[int]) -> int:
+    """Return the best total of two disjoint sets' values, indexed by mask, with either set possibly empty.
+
+    The best for a mask pairs the best subset of it with the best subset of
+    its complement. Reversing a table over all masks lines each mask up with
+    its complement.
+    """
+    best = subset_max(values)
+    return max(map(operator.add, best, reversed(best)))
@@ -0,0 +1,160 @@
+"""Persistent timing history for solution runs.
+
+Every timed part is appended as one JSON line to a local store. The store is
+used to report the slowest parts and to flag parts which got slower compared
+to the rolling median of prior runs.
+"""
+
+import collections
+import dataclasses
+import functools
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from .helpers import format_bytes, format_ns
+
+
+@functools.cache
+def git_revision() -> str:
+    """Return the short git revision of the working tree, marking uncommitted changes."""
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], capture_output=True).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return rev + ("+" if dirty else "")
+
+
+@functools.cache
+def interpreter() -> str:
+    """Return the interpreter name and version, eg cpython-3.12.1."""
+    return f"{sys.implementation.name}-{platform.python_version()}"
+
+
+@dataclasses.dataclass(frozen=True)
+class TimingRecord:
+    """One timed run of one part."""
+
+    site: str
+    year: int | str
+    day: int
+    part: int
+    revision: str
+    interpreter: str
+    ns: int
+    timestamp: float
+    # Older records predate separate parse timing and memory tracking.
+    parse_ns: int = 0
+    # Peak RSS above the RSS at the start of the part, in bytes.
+    rss: int = 0
+
+    @property
+    def key(self) -> tuple[str, str, int, int, str]:
+        """Return the key used to compare runs over time. The revision is what varies."""
+        return self.site, str(self.year), self.day, self.part, self.interpreter
+
+    @property
+    def name(self) -> str:
+        return f"{self.site} {self.year}.{self.day:02}.{self.part}"
+
+
+@dataclasses.dataclass
+class TimingStore:
+    """Append-only JSONL store of TimingRecords."""
+
+    path: pathlib.Path
+
+    def record(self, site: str, year: int | str, day: int, part: int, ns: int, parse_ns: int = 0, rss: int = 0) -> None:
+        """Append a timing to the store. The solve and parse times are kept apart."""
+        record = TimingRecord(
+            site=site, year=year, day=day, part=part,
+            revision=git_revision(), interpreter=interpreter(),
+            ns=ns, timestamp=time.time(), parse_ns=parse_ns, rss=rss,
+        )
+        # One write per line so concurrent batch workers do not interleave records.
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(dataclasses.asdict(record)) + "\n")
+
+    def load(self) -> list[TimingRecord]:
+        """Return all the records in the store, oldest first."""
+        if not self.path.exists():
+            return []
+        records = [
+            TimingRecord(**json.loads(line))
+            for line in self.path.read_text(encoding="utf-8").splitlines()
+            if line
+        ]
+        return sorted(records, key=lambda r: r.timestamp)
+
+    def history(self) -> dict[tuple[str, str, int, int, str], list[TimingRecord]]:
+        """Return records grouped by key, oldest first."""
+        grouped = collections.defaultdict(list)
+        for record in self.load():
+            grouped[record.key].append(record)
+        return grouped
+
+    def day_medians(self, site: str, year: int | str) -> dict[int, int]:
+        """Return the summed median runtime of all the parts of each day in a year."""
+        medians: dict[int, int] = collections.defaultdict(int)
+        for (r_site, r_year, r_day, _, _), records in self.history().items():
+            if (r_site, r_year) == (site, str(year)):
+                medians[r_day] += int(statistics.median(r.ns for r in records))
+        return dict(medians)
+
+    def memory_report(self, top: int = 10, site: str | None = None, year: int | str | None = None) -> str:
+        """Return a table of the days with the largest peak RSS growth in any part, from the latest runs."""
+        days: dict[tuple[str, str, int], TimingRecord] = {}
+        for (r_site, r_year, r_day, _, _), records in self.history().items():
+            if site is not None and r_site != site or year is not None and r_year != str(year):
+                continue
+            latest = records[-1]
+            key = (r_site, r_year, r_day)
+            if latest.rss and (key not in days or latest.rss > days[key].rss):
+                days[key] = latest
+        hungry = sorted(days.values(), key=lambda r: r.rss, reverse=True)[:top]
+        lines = [f"Most memory hungry {len(hungry)} days:"]
+        for record in hungry:
+            lines.append(f"  {record.name:30} {format_bytes(record.rss)}  {format_ns(record.ns)}")
+        return "\n".join(lines)
+
+    def report(self, top: int = 20, threshold: float = 1.5, window: int = 10) -> str:
+        """Return a report of the slowest parts and parts which regressed.
+
+        A part has regressed when its latest run is more than `threshold` times
+        the median of the prior `window` runs.
+        """
+        history = self.history()
+        if not history:
+            return f"No timings recorded in {self.path}"
+        latest = sorted((records[-1] for records in history.values()), key=lambda r: r.ns, reverse=True)
+        lines = [f"Slowest {min(top, len(latest))} parts:"]
+        for record in latest[:top]:
+            lines.append(
+                f"  {record.name:30} {format_ns(record.ns)} (parse {format_ns(record.parse_ns)})  "
+                f"{record.revision:10} {record.interpreter}"
+            )
+
+        regressions = []
+        for records in history.values():
+            *prior, last = records
+            if not prior:
+                continue
+            median = statistics.median(r.ns for r in prior[-window:])
+            if last.ns > median * threshold:
+                regressions.append((last.ns / median, last, median))
+        regressions.sort(key=lambda x: x[0], reverse=True)
+        lines.append(f"Regressions (> {threshold:.2f}x the median of the last {window} runs): {len(regressions)}")
+        for ratio, record, median in regressions:
+            lines.append(
+                f"  {record.name:30} {format_ns(record.ns)} vs {format_ns(median)}  "
+                f"{ratio:5.2f}x  {record.revision:10} {record.interpreter}"
+            )
+        lines.append(self.memory_report(top))
+        return "\n".join(lines)
@@ -0,0 +1,293 @@
+"""Register machine toolkit.
+
+Several puzzles define a small assembly dialect and ask to run a program.
+A Dialect declares its registers and opcode table once. Programs are decoded
+up front into (handler, a, b, c) tuples of ints so running a step is a list
+index and a function call rather than re-matching strings.
+
+Operands are decoded according to the per-opcode argument kinds:
+
+    "r": a register which is read.
+    "w": a register which is written (and may also be read).
+    "v": a register (if a known register name) or an immediate value.
+    "c": an immediate value, even if it looks like a register (eg elfcode "addi").
+    "n": a raw int passed through as-is, eg a jump offset.
+    "_": ignored.
+
+Immediate values are placed in constant slots after the registers so handlers
+read every value operand the same way, as `r[x]`. That way "addr" and "addi"
+share a handler.
+
+A handler is called as `handler(machine, r, ptr, a, b, c)` and returns None to
+advance to the next instruction or the ptr to jump to. Jumping outside the
+program halts it. A handler waiting on input raises Blocked; the machine stops
+and resumes at the same instruction on the next run.
+"""
+
+import collections
+import collections.abc
+import dataclasses
+import enum
+
+Arg = str | int
+Line = collections.abc.Sequence[Arg]
+Handler = collections.abc.Callable[["Machine", list[int], int, int, int, int], int | None]
+LoopKey = collections.abc.Callable[[int, list[int]], collections.abc.Hashable]
+
+# A jump target which halts the machine.
+HALT = -1
+
+
+class Blocked(Exception):
+    """Raised by a handler which cannot proceed until more input is available."""
+
+
+class Status(enum.Enum):
+    """Why the machine stopped running."""
+
+    READY = enum.auto()
+    HALTED = enum.auto()
+    WAITING = enum.auto()
+    LOOPED = enum.auto()
+    STEP_LIMIT = enum.auto()
+    BREAK = enum.auto()
+
+
+@dataclasses.dataclass(frozen=True)
+class Op:
+    """One opcode: the operand kinds and the handler."""
+
+    args: str
+    handler: Handler
+
+
+@dataclasses.dataclass
+class Program:
+    """A decoded program."""
+
+    dialect: "Dialect"
+    source: list[Line]
+    code: list[tuple[Handler, int, int, int]]
+    constants: list[int]
+    ip: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+
+@dataclasses.dataclass
+class Dialect:
+    """An assembly dialect: register names and an opcode table."""
+
+    registers: collections.abc.Sequence[Arg]
+    ops: dict[str, Op]
+
+    def __post_init__(self) -> None:
+        self.index = {name: i for i, name in enumerate(self.registers)}
+
+    def register(self, name: Arg) -> int:
+        """Return the index of a register."""
+        try:
+            return self.index[name]
+        except KeyError:
+            raise ValueError(f"Unknown register {name!r}") from None
+
+    def decode(self, lines: collections.abc.Iterable[Line], ip: int | None = None) -> Program:
+        """Decode a program.
+
+        If `ip` is set, that register is bound to the instruction pointer (elfcode `#ip`).
+        Reads of it are decoded to the instruction's own address and writes to it become jumps.
+        """
+        source = [list(line) for line in lines]
+        slots: dict[int, int] = {}
+
+        def const(value: Arg) -> int:
+            return slots.setdefault(int(value), len(self.registers) + len(slots))
+
+        def read(value: Arg, ptr: int) -> int:
+            return const(ptr) if (i := self.register(value)) == ip else i
+
+        code = []
+        for ptr, (name, *args) in enumerate(source):
+            if (op := self.ops.get(str(name))) is None:
+                raise ValueError(f"Unknown opcode {name!r} at {ptr}")
+            if len(args) != len(op.args):
+                raise ValueError(f"{name} takes {len(op.args)} operands, got {args} at {ptr}")
+            operands = []
+            handler = op.handler
+            for kind, arg in zip(op.args, args):
+                match kind:
+                    case "r":
+                        operands.append(read(arg, ptr))
+                    case "w":
+                        operands.append(self.register(arg))
+                        if operands[-1] == ip:
+                            handler = jump_via(handler, ip)
+                    case "v":
+                        is_reg = isinstance(arg, str) and arg in self.index
+                        operands.append(read(arg, ptr) if is_reg else const(arg))
+                    case "c":
+                        operands.append(const(arg))
+                    case "n":
+                        operands.append(int(arg))
+                    case "_":
+                        operands.append(0)
+                    case _:
+                        raise ValueError(f"Unknown operand kind {kind!r}")
+            operands.extend([0] * (3 - len(operands)))
+            code.append((handler, operands[0], operands[1], operands[2]))
+        constants = sorted(slots, key=slots.__getitem__)
+        return Program(self, source, code, constants, ip)
+
+
+def jump_via(handler: Handler, ip: int) -> Handler:
+    """Wrap a handler which writes to the bound ip register so the write acts as a jump."""
+    def jump(m: "Machine", r: list[int], ptr: int, a: int, b: int, c: int) -> int:
+        handler(m, r, ptr, a, b, c)
+        return r[ip] + 1
+    return jump
+
+
+class Machine:
+    """Run a decoded program.
+
+    With `profile` set, every instruction's execution count is kept in `counts`.
+    """
+
+    def __init__(
+        self,
+        program: Program,
+        registers: dict[Arg, int] | None = None,
+        profile: bool = False,
+    ) -> None:
+        self.program = program
+        self.regs = [0] * len(program.dialect.registers) + program.constants
+        for name, value in (registers or {}).items():
+            self[name] = value
+        self.ptr = 0
+        self.steps = 0
+        self.status = Status.READY
+        self.inputs: collections.deque[int] = collections.deque()
+        self.outputs: list[int] = []
+        self.counts = [0] * len(program) if profile else None
+
+    def __getitem__(self, name: Arg) -> int:
+        return self.regs[self.program.dialect.register(name)]
+
+    def __setitem__(self, name: Arg, value: int) -> None:
+        self.regs[self.program.dialect.register(name)] = value
+
+    def registers(self) -> dict[Arg, int]:
+        """Return the register values by name."""
+        return dict(zip(self.program.dialect.registers, self.regs))
+
+    def run(
+        self,
+        max_steps: int | None = None,
+        breakpoints: collections.abc.Container[int] = (),
+        detect_loops: bool = False,
+        loop_key: LoopKey | None = None,
+    ) -> Status:
+        """Run until the program halts, blocks on input, or one of the limits is hit.
+
+        max_steps: stop after this many steps.
+        breakpoints: stop before executing any of these instructions (other than the first one).
+        detect_loops: stop when a state is seen twice, before executing it again.
+        loop_key: the state for loop detection, from (ptr, registers). Defaults to all registers.
+        """
+        if self.status == Status.HALTED:
+            return self.status
+        if max_steps is None and not breakpoints and not detect_loops and self.counts is None:
+            self._run_fast()
+        else:
+            self._run_checked(max_steps, breakpoints, detect_loops, loop_key)
+        if self.program.ip is not None:
+            # Sync the bound register. It holds the last executed ptr once halted or the next one when paused.
+            self.regs[self.program.ip] = self.ptr - 1 if self.status == Status.HALTED else self.ptr
+        return self.status
+
+    def _run_fast(self) -> None:
+        code, r = self.program.code, self.regs
+        end = len(code)
+        ptr = self.ptr
+        steps = 0
+        self.status = Status.HALTED
+        try:
+            while 0 <= ptr < end:
+                op, a, b, c = code[ptr]
+                nxt = op(self, r, ptr, a, b, c)
+                ptr = ptr + 1 if nxt is None else nxt
+                steps += 1
+        except Blocked:
+            self.status = Status.WAITING
+        finally:
+            self.ptr = ptr
+            self.steps += steps
+
+    def _run_checked(
+        self,
+        max_steps: int | None,
+        breakpoints: collections.abc.Container[int],
+        detect_loops: bool,
+        loop_key: LoopKey | None,
+    ) -> None:
+        code, r, counts = self.program.code, self.regs, self.counts
+        end = len(code)
+        size = len(self.program.dialect.registers)
+        key = loop_key or (lambda ptr, regs: (ptr, *regs[:size]))
+        seen: set[collections.abc.Hashable] = set()
+        ptr = self.ptr
+        steps = 0
+        self.status = Status.HALTED
+        try:
+            while 0 <= ptr < end:
+                if detect_loops:
+                    state = key(ptr, r)
+                    if state in seen:
+                        self.status = Status.LOOPED
+                        break
+                    seen.add(state)
+                if max_steps is not None and steps >= max_steps:
+                    self.status = Status.STEP_LIMIT
+                    break
+                op, a, b, c = code[ptr]
+                nxt = op(self, r, ptr, a, b, c)
+                if counts is not None:
+                    counts[ptr] += 1
+                ptr = ptr + 1 if nxt is None else nxt
+                steps += 1
+                if ptr in breakpoints:
+                    self.status = Status.BREAK
+                    break
+        except Blocked:
+            self.status = Status.WAITING
+        finally:
+            self.ptr = ptr
+            self.steps += steps
+
+    def op_counts(self) -> collections.Counter[str]:
+        """Return how many times each opcode ran. Requires profiling."""
+        if self.counts is None:
+            raise RuntimeError("Profiling is not enabled.")
+        totals: collections.Counter[str] = collections.Counter()
+        for line, count in zip(self.program.source, self.counts):
+            totals[str(line[0])] += count
+        return totals
+
+    def hot_spots(self, top: int = 10) -> list[tuple[int, int, str]]:
+        """Return the most executed instructions as (ptr, count, source). Requires profiling."""
+        if self.counts is None:
+            raise RuntimeError("Profiling is not enabled.")
+        ranked = sorted(range(len(self.counts)), key=lambda ptr: self.counts[ptr], reverse=True)  # type: ignore
+        return [
+            (ptr, self.counts[ptr], " ".join(str(i) for i in self.program.source[ptr]))
+            for ptr in ranked[:top]
+        ]
+
+    def profile(self, top: int = 10) -> str:
+        """Return a printable table of the hot spots."""
+        return "\n".join(f"{ptr:4} {count:12,} {line}" for ptr, count, line in self.hot_spots(top))
+
+
+def nop(m: Machine, r: list[int], ptr: int, a: int, b: int, c: int) -> None:
+    """Handler which does nothing."""